@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+from collections import namedtuple
+
+from process_manager import ProcessManager, ProcessPriority, TraceKind
+
+# Một lần chuyển trạng thái của tiến trình, phát ra qua AsyncProcessManager.events()
+StateChange = namedtuple("StateChange", "time pid name old_state new_state")
+
+
+# Phiên bản asyncio của ProcessManager: bộ lập lịch chạy như một task trên event loop
+# thay vì một luồng riêng, nên nhiều bộ quản lý có thể dùng chung một loop.
+# Mọi phương thức phải được gọi từ luồng của event loop.
+class AsyncProcessManager:
+    _own_attributes = ("manager", "_task", "_subscribers")
+
+    def __init__(self, *args, manager=None, **kwargs):
+        self.manager = manager if manager is not None else ProcessManager(*args, **kwargs)
+        self.manager.listeners.append(self._on_transition)
+        self._task = None
+        self._subscribers = []  # Hàng đợi asyncio của các vòng lặp events() đang mở
+
+    def __getattr__(self, name):
+        # Các phương thức đọc (get_process_counts, get_metrics, ...) dùng trực tiếp của ProcessManager
+        if name == "manager":
+            raise AttributeError(name)
+        return getattr(self.manager, name)
+
+    def __setattr__(self, name, value):
+        # Cấu hình (tick_interval, time_slice, io_probability, ...) được đặt trên ProcessManager
+        if name in self._own_attributes:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.manager, name, value)
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Bắt đầu task lập lịch trên event loop đang chạy"""
+        if self.running:
+            return False
+        self._task = asyncio.get_running_loop().create_task(self._scheduler())
+        return True
+
+    async def stop(self):
+        """Dừng task lập lịch và đưa các tiến trình đang chạy về hàng đợi ready"""
+        if not self.running:
+            return False
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        manager = self.manager
+        with manager.scheduler_lock:
+            manager._trace_input(TraceKind.STOP)
+            manager._preempt_all()
+        if manager.update_callback:
+            manager.update_callback()
+        return True
+
+    async def _scheduler(self):
+        """Mỗi nhịp tiến đồng hồ ảo một tick_length rồi chờ bằng timer của event loop"""
+        manager = self.manager
+        while True:
+            until = manager.engine.now + manager.tick_length
+            # Xử lý sự kiện theo từng phần, nhường loop cho các bộ quản lý khác giữa các phần
+            while manager.run(until=until, max_events=manager.events_per_lock) >= manager.events_per_lock:
+                await asyncio.sleep(0)
+            if manager.update_callback:
+                manager.update_callback()
+            await asyncio.sleep(manager.tick_interval)
+
+    async def run(self, until=None, batch_events=None):
+        """Chạy mô phỏng không giao diện tới thời điểm until, nhường loop sau mỗi lô sự kiện"""
+        manager = self.manager
+        batch_events = batch_events or manager.events_per_lock
+        processed = 0
+        while True:
+            count = manager.run(until=until, max_events=batch_events)
+            processed += count
+            if count < batch_events:
+                return processed
+            await asyncio.sleep(0)
+
+    async def create_process(self, name, priority=ProcessPriority.MEDIUM, burst_time=None):
+        return self.manager.create_process(name, priority, burst_time)
+
+    async def create_processes(self, specs, batch_size=10000):
+        """Tạo hàng loạt tiến trình, nhường loop giữa các lô"""
+        specs = iter(specs)
+        created = 0
+        while True:
+            count = self.manager.create_processes(itertools.islice(specs, batch_size), batch_size)
+            created += count
+            if count < batch_size:
+                return created
+            await asyncio.sleep(0)
+
+    async def set_process_state(self, pid, new_state):
+        return self.manager.set_process_state(pid, new_state)
+
+    async def set_time_slice(self, time_slice):
+        return self.manager.set_time_slice(time_slice)
+
+    async def set_policy(self, policy_factory):
+        return self.manager.set_policy(policy_factory)
+
+    async def set_cpu_count(self, num_cpus):
+        return self.manager.set_cpu_count(num_cpus)
+
+    def _on_transition(self, process, old_state, new_state, now):
+        if not self._subscribers:
+            return
+        event = StateChange(now, process.pid, process.name, old_state, new_state)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def events(self):
+        """Vòng lặp bất đồng bộ qua các lần chuyển trạng thái từ lúc bắt đầu lặp"""
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
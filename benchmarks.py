@@ -0,0 +1,289 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from process_manager import PRIORITY_MIXES, ProcessManager, ProcessPriority, ProcessState
+
+# Bộ đo hiệu năng chạy ProcessManager không giao diện trên lưới số tiến trình,
+# tỉ lệ độ ưu tiên và time slice; kết quả ghi ra JSON và so sánh với baseline.
+# Baseline trong repo (benchmark_baseline.json) được tạo bằng: python benchmarks.py --save-baseline
+
+PROCESS_COUNTS = [100, 1000, 10000, 100000, 1000000]
+QUICK_COUNTS = [100, 1000, 10000]
+TIME_SLICES = [1, 4]
+PRIORITIES = [ProcessPriority.HIGH, ProcessPriority.MEDIUM, ProcessPriority.LOW]
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+# Chỉ số được so sánh với baseline: True nếu giá trị lớn hơn là tốt hơn
+METRICS = {
+    "create_per_s": True,
+    "ticks_per_s": True,
+    "set_state_p50_us": False,
+    "set_state_p99_us": False,
+    "refresh_full_ms": False,
+    "refresh_incremental_ms": False,
+}
+
+
+def percentile(values, q):
+    """Phân vị q (0-100) của danh sách đã sắp xếp"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def build_workload(count, mix, seed):
+    """Danh sách (tên, độ ưu tiên, thời gian chạy) theo tỉ lệ độ ưu tiên"""
+    rng = random.Random(seed)
+    priorities = rng.choices(PRIORITIES, weights=PRIORITY_MIXES[mix], k=count)
+    return [(f"bench_{i}", priority, rng.randint(1, 10)) for i, priority in enumerate(priorities)]
+
+
+def bench_create(manager, workload):
+    """Số lần create_process mỗi giây"""
+    start = time.perf_counter()
+    for name, priority, burst_time in workload:
+        manager.create_process(name, priority, burst_time)
+    elapsed = time.perf_counter() - start
+    return len(workload) / elapsed if elapsed > 0 else float("inf")
+
+
+def bench_ticks(manager, ticks):
+    """Số nhịp scheduler mỗi giây (phần việc của scheduler_loop, bỏ qua thời gian ngủ)"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        # run() giữ khóa như scheduler_loop và gồm cả tiến trình đến hạn lẫn chính sách lưu giữ
+        manager.run(until=manager.engine.now + manager.tick_length)
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed if elapsed > 0 else float("inf")
+
+
+def bench_set_state(manager, calls, seed):
+    """Độ trễ (micro giây) của set_process_state với pid và trạng thái ngẫu nhiên"""
+    rng = random.Random(seed)
+    pids = list(manager.processes)
+    states = [ProcessState.READY, ProcessState.RUNNING, ProcessState.WAITING]
+    samples = []
+    for _ in range(calls):
+        pid = rng.choice(pids)
+        state = rng.choice(states)
+        start = time.perf_counter()
+        manager.set_process_state(pid, state)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def bench_refresh(workload, ticks):
+    """Thời gian (ms) vẽ lại bảng tiến trình với cửa sổ Tk ẩn, None nếu không có Tk"""
+    try:
+        import tkinter as tk
+        from process_manager import ProcessManagerApp
+        root = tk.Tk()
+    except Exception:
+        return None, None
+    try:
+        root.withdraw()
+        app = ProcessManagerApp(root)
+        app.ui_pipeline.stop()
+        manager = app.process_manager
+        for name, priority, burst_time in workload:
+            manager.create_process(name, priority, burst_time)
+        # Lần đầu: mọi tiến trình đều mới nên cả bảng được dựng lại
+        start = time.perf_counter()
+        app.update_ui()
+        root.update_idletasks()
+        full = (time.perf_counter() - start) * 1000
+        # Sau vài nhịp: chỉ các tiến trình thay đổi được cập nhật
+        bench_ticks(manager, ticks)
+        start = time.perf_counter()
+        app.update_ui()
+        root.update_idletasks()
+        incremental = (time.perf_counter() - start) * 1000
+        return full, incremental
+    finally:
+        root.destroy()
+
+
+def bench_trial(workload, time_slice, options):
+    """Một lần đo trên manager mới: tạo tiến trình, chạy các nhịp rồi đổi trạng thái"""
+    manager = ProcessManager(seed=options.seed)
+    manager.set_time_slice(time_slice)
+    # Tắt bộ gom rác trong lúc đo như timeit: một lần gom rác rơi vào lần đo nào là tùy may rủi
+    gc.collect()
+    gc.disable()
+    try:
+        create_per_s = bench_create(manager, workload)
+        ticks_per_s = bench_ticks(manager, options.ticks)
+        return (create_per_s, ticks_per_s) + bench_set_state(manager, options.calls, options.seed)
+    finally:
+        gc.enable()
+
+
+def summarize(count, mix, time_slice, trials):
+    """Kết quả của một ô: giá trị tốt nhất của mỗi chỉ số qua các lượt và độ nhiễu giữa các lượt"""
+    result = {"processes": count, "mix": mix, "time_slice": time_slice}
+    noise = {}
+    for (metric, higher_is_better), values in zip(METRICS.items(), zip(*trials)):
+        values = [value for value in values if value is not None]
+        if not values:
+            result[metric] = None
+            continue
+        result[metric] = max(values) if higher_is_better else min(values)
+        # Lần tệ nhất so với lần tốt nhất: 1 là không nhiễu
+        noise[metric] = min(values) / max(values) if max(values) > 0 else 1.0
+    result["noise"] = noise
+    return result
+
+
+def run_round(cases, options):
+    """Một lượt đo mọi ô trong tiến trình hiện tại: options.warmup lần khởi động rồi một lần đo mỗi ô"""
+    trials = []
+    for count, mix, time_slice in cases:
+        workload = build_workload(count, mix, options.seed)
+        # Chỉ giữ lần chạy cuối; các giá trị theo thứ tự của METRICS
+        for _ in range(options.warmup + 1):
+            trial = bench_trial(workload, time_slice, options)
+            trial += bench_refresh(workload, options.ticks) if count <= options.gui_max else (None, None)
+        trials.append(trial)
+    return trials
+
+
+def run_grid(cases, options):
+    """Đo mọi ô (số tiến trình, tỉ lệ, time slice) của lưới qua options.repeats lượt"""
+    # Mỗi lượt chạy trong một tiến trình con mới: tốc độ của một tiến trình Python lệch tới vài chục
+    # phần trăm theo bố cục bộ nhớ của nó, lặp lại trong cùng tiến trình không loại được độ lệch này
+    rounds = []
+    for _ in range(options.repeats):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            rounds.append(pool.submit(run_round, cases, options).result())
+    results = []
+    for case, trials in zip(cases, zip(*rounds)):
+        result = summarize(*case, trials)
+        results.append(result)
+        print(f"{case_key(result)}: {result['create_per_s']:,.0f} tạo/s, "
+              f"{result['ticks_per_s']:,.0f} nhịp/s", file=sys.stderr)
+    return results
+
+
+def case_key(result):
+    return f"{result['processes']}/{result['mix']}/{result['time_slice']}"
+
+
+def compare(results, baseline, tolerance):
+    """Các chỉ số chậm hơn baseline quá tolerance (tỉ lệ) hoặc độ nhiễu đo được, và các chỉ số không so sánh được"""
+    previous = {case_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    missing = []  # (ô, chỉ số, lý do)
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            missing.append((case_key(result), None, "không có trong baseline"))
+            continue
+        for metric, higher_is_better in METRICS.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if old_value is None:
+                missing.append((case_key(result), metric, "baseline không có giá trị"))
+                continue
+            if new_value is None:
+                missing.append((case_key(result), metric, "không đo được ở lần chạy này"))
+                continue
+            if new_value <= 0 or old_value <= 0:
+                continue
+            ratio = new_value / old_value if higher_is_better else old_value / new_value
+            # Ngưỡng nới ra theo độ nhiễu đo được giữa các lượt của lần chạy này và của baseline
+            limit = min(1 - tolerance, result.get("noise", {}).get(metric, 1.0), old.get("noise", {}).get(metric, 1.0))
+            if ratio < limit:
+                regressions.append((case_key(result), metric, old_value, new_value))
+    return regressions, missing
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    return f"{value:,.0f}" if value >= 100 else f"{value:.3g}"
+
+
+def print_table(results):
+    columns = ["processes", "mix", "time_slice"] + list(METRICS)
+    print("  ".join(f"{c:>22}" for c in columns))
+    for result in results:
+        cells = [str(result["processes"]), result["mix"], str(result["time_slice"])]
+        cells += [format_value(result.get(metric)) for metric in METRICS]
+        print("  ".join(f"{c:>22}" for c in cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo hiệu năng bộ lập lịch tiến trình")
+    parser.add_argument("--counts", type=int, nargs="+", help="Số tiến trình của lưới")
+    parser.add_argument("--quick", action="store_true", help="Chỉ đo tới 10000 tiến trình")
+    parser.add_argument("--mixes", nargs="+", choices=sorted(PRIORITY_MIXES), default=list(PRIORITY_MIXES))
+    parser.add_argument("--time-slices", type=int, nargs="+", default=TIME_SLICES)
+    parser.add_argument("--ticks", type=int, default=200, help="Số nhịp scheduler mỗi lần đo")
+    parser.add_argument("--repeats", type=int, default=5, help="Số lượt đo, mỗi lượt trong một tiến trình mới")
+    parser.add_argument("--warmup", type=int, default=1, help="Số lần chạy khởi động bị bỏ qua của mỗi ô mỗi lượt")
+    parser.add_argument("--calls", type=int, default=2000, help="Số lần gọi set_process_state")
+    parser.add_argument("--gui-max", type=int, default=100000, help="Số tiến trình tối đa khi đo giao diện")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Ghi kết quả làm baseline mới")
+    # Trên máy ảo dùng chung, cùng một mã giữa hai lần chạy lệch tới 35-40% kể cả khi lấy lần tốt nhất
+    parser.add_argument("--tolerance", type=float, default=0.4, help="Tỉ lệ chậm đi tối đa cho phép")
+    options = parser.parse_args(argv)
+
+    counts = options.counts or (QUICK_COUNTS if options.quick else PROCESS_COUNTS)
+    cases = [(count, mix, time_slice) for count in counts for mix in options.mixes
+             for time_slice in options.time_slices]
+    results = run_grid(cases, options)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "command": " ".join(["python", "benchmarks.py", *(sys.argv[1:] if argv is None else argv)]),
+            "ticks": options.ticks,
+            "calls": options.calls,
+            "repeats": options.repeats,
+            "warmup": options.warmup,
+        },
+        "results": results,
+    }
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_table(results)
+
+    if options.save_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Đã lưu baseline vào {options.baseline}")
+        return 0
+    if not os.path.exists(options.baseline):
+        print(f"Chưa có baseline {options.baseline}, chạy với --save-baseline để tạo")
+        return 0
+    with open(options.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions, missing = compare(results, baseline, options.tolerance)
+    # Gộp theo chỉ số để cả lưới thiếu một chỉ số (ví dụ không có Tk) chỉ chiếm một dòng
+    grouped = {}
+    for key, metric, reason in missing:
+        grouped.setdefault((metric or "mọi chỉ số", reason), []).append(key)
+    for (metric, reason), keys in grouped.items():
+        print(f"KHÔNG SO SÁNH {metric} ({reason}) ở {len(keys)} ô: {', '.join(keys[:3])}{', ...' if len(keys) > 3 else ''}")
+    for key, metric, old_value, new_value in regressions:
+        print(f"CHẬM HƠN {key} {metric}: {format_value(old_value)} -> {format_value(new_value)}")
+    if not regressions:
+        print("Không có chỉ số nào chậm hơn baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import os
+import resource
+import select
+import signal
+import sys
+import threading
+import time
+
+from process_manager import SCHEDULING_POLICIES, ProcessManager, ProcessPriority, ProcessState
+
+# Backend tiến trình thật trên Linux: mỗi Process của ProcessManager gắn với một tiến trình con.
+# Bộ lập lịch giữ nguyên, backend chỉ nghe các lần chuyển trạng thái: được cấp CPU thì SIGCONT,
+# rời CPU (hết quantum, bị chiếm quyền, chờ I/O) thì SIGSTOP, kết thúc thì SIGKILL.
+# Tiến trình con kết thúc được phát hiện qua pidfd + epoll trên một luồng riêng,
+# thời gian CPU đọc theo lô từ /proc/<pid>/stat qua các fd mở sẵn.
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+# Tiến trình con tự dừng trước khi exec, chỉ chạy khi bộ lập lịch gửi SIGCONT
+_STOPPED_EXEC = 'kill -STOP $$; exec "$@"'
+
+
+# Một tiến trình con: pid của hệ điều hành, pidfd và fd của /proc/<pid>/stat
+class Child:
+    def __init__(self, os_pid, pidfd, stat_fd):
+        self.os_pid = os_pid
+        self.pidfd = pidfd
+        self.stat_fd = stat_fd
+        self.running = False  # Đang được SIGCONT
+        self.exited = False
+        self.released = False  # pidfd và stat_fd đã đóng
+        self.returncode = None
+        self.cpu_time = 0.0  # Giây CPU (user + system) ở lần đọc gần nhất
+
+
+class LinuxProcessBackend:
+    def __init__(self, manager=None, tick_interval=0.01, sample_interval=0.5, quiet=True, raise_fd_limit=False):
+        if not hasattr(os, "pidfd_open"):
+            raise RuntimeError("Backend tiến trình thật cần Linux 5.3+ (os.pidfd_open)")
+        self.manager = manager if manager is not None else ProcessManager()
+        # Mỗi nhịp của bộ lập lịch là một quantum thật; I/O do chính tiến trình con thực hiện
+        self.manager.tick_interval = tick_interval
+        self.manager.io_probability = 0
+        self.manager.listeners.append(self._on_transition)
+        self.sample_interval = sample_interval  # Số giây giữa hai lần đọc thời gian CPU
+        self.quiet = quiet  # Chuyển stdout/stderr của tiến trình con vào /dev/null
+        self.children = {}  # {pid của manager: Child}
+        self._by_fd = {}  # {pidfd: pid của manager}
+        self._children_lock = threading.Lock()
+        self._epoll = select.epoll()
+        self._wake_r, self._wake_w = os.pipe()
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+        self._closed = False
+        self.signals_sent = 0
+        if raise_fd_limit:
+            # Mỗi tiến trình con giữ hai fd (pidfd, /proc/<pid>/stat): nâng giới hạn mềm lên giới hạn cứng
+            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft != hard:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def spawn(self, argv, name=None, priority=ProcessPriority.MEDIUM):
+        """Chạy argv ở trạng thái dừng và thêm vào bộ lập lịch, trả về Process của manager"""
+        file_actions = []
+        if self.quiet:
+            file_actions = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)]
+        os_pid = os.posix_spawn("/bin/sh", ["sh", "-c", _STOPPED_EXEC, "sh", *argv], os.environ,
+                                file_actions=file_actions)
+        # Chờ tiến trình con tự dừng để SIGCONT đầu tiên không bị mất
+        os.waitid(os.P_PID, os_pid, os.WSTOPPED)
+        child = Child(os_pid, os.pidfd_open(os_pid), os.open(f"/proc/{os_pid}/stat", os.O_RDONLY))
+
+        manager = self.manager
+        # Gắn Child trong cùng lần giữ khóa với lúc tạo, trước khi tiến trình được cấp CPU
+        with manager.scheduler_lock:
+            process = manager._new_process(name or os.path.basename(argv[0]), priority, float("inf"))
+            with self._children_lock:
+                self.children[process.pid] = child
+                self._by_fd[child.pidfd] = process.pid
+        self._epoll.register(child.pidfd, select.EPOLLIN)
+        if manager.update_callback:
+            manager.update_callback()
+        return process
+
+    def _on_transition(self, process, old_state, new_state, now):
+        """Listener của ProcessManager (đã giữ khóa scheduler): đổi trạng thái thật của tiến trình con"""
+        child = self.children.get(process.pid)
+        if child is None or child.exited:
+            return
+        if new_state is ProcessState.RUNNING:
+            self._signal(child, signal.SIGCONT)
+            child.running = True
+        elif new_state is ProcessState.TERMINATED:
+            self._signal(child, signal.SIGKILL)
+        elif child.running:
+            self._signal(child, signal.SIGSTOP)
+            child.running = False
+
+    def _signal(self, child, signum):
+        # Gửi qua pidfd nên không nhầm sang tiến trình khác nếu pid đã được dùng lại
+        try:
+            signal.pidfd_send_signal(child.pidfd, signum)
+            self.signals_sent += 1
+        except OSError:
+            pass  # Tiến trình con đã kết thúc
+
+    def _watch(self):
+        """Luồng theo dõi: chờ pidfd báo tiến trình con kết thúc, định kỳ đọc thời gian CPU"""
+        next_sample = time.monotonic() + self.sample_interval
+        while not self._closed:
+            timeout = max(0.0, next_sample - time.monotonic())
+            exited = []
+            for fd, _ in self._epoll.poll(timeout):
+                if fd == self._wake_r:
+                    os.read(self._wake_r, 64)
+                    continue
+                pid = self._by_fd.get(fd)
+                if pid is not None:
+                    self._reap(pid)
+                    exited.append(pid)
+            if exited:
+                # Đánh dấu kết thúc trên luồng scheduler, cả lô trong một lệnh
+                self.manager.submit(self._terminate, exited)
+            if time.monotonic() >= next_sample:
+                self.sample_cpu_times()
+                next_sample = time.monotonic() + self.sample_interval
+
+    def _reap(self, pid):
+        """Thu hồi tiến trình con đã kết thúc, lấy thời gian CPU cuối cùng từ rusage"""
+        child = self.children[pid]
+        self._epoll.unregister(child.pidfd)
+        _, status, usage = os.wait4(child.os_pid, 0)
+        child.exited = True
+        child.running = False
+        child.returncode = os.waitstatus_to_exitcode(status)
+        child.cpu_time = usage.ru_utime + usage.ru_stime
+        with self._children_lock:
+            del self._by_fd[child.pidfd]
+        # Các fd chỉ được đóng trong _release: luồng scheduler có thể đang gửi tín hiệu qua pidfd
+
+    def _release(self, child):
+        """Đóng pidfd và stat_fd của tiến trình con đã thu hồi (giữ khóa scheduler như _on_transition)"""
+        with self.manager.scheduler_lock:
+            if child.released:
+                return
+            child.released = True
+            os.close(child.stat_fd)
+            os.close(child.pidfd)
+
+    def _terminate(self, pids):
+        for pid in pids:
+            self.manager.set_process_state(pid, ProcessState.TERMINATED)
+            self._release(self.children[pid])
+
+    def sample_cpu_times(self):
+        """Đọc utime + stime của mọi tiến trình con còn sống trong một lượt, trả về số tiến trình đã đọc"""
+        with self._children_lock:
+            live = [self.children[pid] for pid in self._by_fd.values()]
+        count = 0
+        for child in live:
+            try:
+                data = os.pread(child.stat_fd, 1024, 0)
+            except OSError:
+                continue
+            # Tên lệnh (trường 2) có thể chứa khoảng trắng nên tách sau dấu ")" cuối cùng
+            fields = data[data.rindex(b")") + 2:].split()
+            child.cpu_time = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+            count += 1
+        return count
+
+    def get_cpu_time(self, pid):
+        """Giây CPU thật của tiến trình theo pid của manager, None nếu không phải tiến trình thật"""
+        child = self.children.get(pid)
+        return child.cpu_time if child is not None else None
+
+    def live_count(self):
+        """Số tiến trình con chưa kết thúc"""
+        return len(self._by_fd)
+
+    def close(self):
+        """Dừng luồng theo dõi, kết thúc và thu hồi mọi tiến trình con còn sống"""
+        if self._closed:
+            return
+        self.manager.stop_scheduler()
+        self._closed = True
+        os.write(self._wake_w, b"x")
+        self._watcher.join()
+        for pid in list(self._by_fd.values()):
+            child = self.children[pid]
+            self._signal(child, signal.SIGKILL)
+            self._reap(pid)
+        # Kể cả các tiến trình đã thu hồi mà lệnh _terminate chưa kịp chạy
+        for child in self.children.values():
+            self._release(child)
+        self._epoll.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+def cpu_burner(seconds):
+    """Lệnh của một tiến trình thử nghiệm dùng đúng seconds giây CPU rồi thoát"""
+    script = f"import time\nend = time.process_time() + {seconds}\nwhile time.process_time() < end:\n    pass\n"
+    return [sys.executable, "-S", "-c", script]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lập lịch các tiến trình thật bằng SIGSTOP/SIGCONT")
+    parser.add_argument("--children", type=int, default=20, help="Số tiến trình con tiêu tốn CPU")
+    parser.add_argument("--work", type=float, default=0.2, help="Số giây CPU của mỗi tiến trình con")
+    parser.add_argument("--policy", choices=list(SCHEDULING_POLICIES), default="RR")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count())
+    parser.add_argument("--time-slice", type=float, default=1)
+    parser.add_argument("--tick", type=float, default=10, help="Độ dài một nhịp (ms)")
+    parser.add_argument("--timeout", type=float, default=300, help="Số giây chờ tối đa")
+    parser.add_argument("--raise-fd-limit", action="store_true",
+                        help="Nâng giới hạn mềm RLIMIT_NOFILE lên giới hạn cứng (mỗi tiến trình con giữ hai fd)")
+    options = parser.parse_args(argv)
+
+    manager = ProcessManager(policy=SCHEDULING_POLICIES[options.policy], num_cpus=options.cpus)
+    manager.set_time_slice(options.time_slice)
+    backend = LinuxProcessBackend(manager, tick_interval=options.tick / 1000, raise_fd_limit=options.raise_fd_limit)
+    priorities = list(ProcessPriority)
+    try:
+        start = time.perf_counter()
+        for i in range(options.children):
+            backend.spawn(cpu_burner(options.work), f"burn-{i}", priorities[i % len(priorities)])
+        spawned = time.perf_counter() - start
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        manager.start_scheduler()
+        deadline = time.monotonic() + options.timeout
+        while backend.live_count() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+        overhead = time.process_time() - cpu_start
+    finally:
+        backend.close()
+
+    metrics = manager.get_metrics()
+    print(f"Tạo {options.children} tiến trình con: {spawned:.2f}s")
+    print(f"Hoàn thành {metrics['completed']}/{options.children} trong {elapsed:.2f}s, "
+          f"{backend.signals_sent} tín hiệu, CPU của bộ lập lịch {overhead:.2f}s")
+    print(f"Turnaround (nhịp): TB {metrics['turnaround']['mean']:.1f} | p95 {metrics['turnaround']['p95']:.1f}")
+    cpu_times = [child.cpu_time for child in backend.children.values()]
+    print(f"CPU thật mỗi tiến trình: {min(cpu_times):.2f}-{max(cpu_times):.2f}s")
+    return 0 if metrics["completed"] == options.children else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import numpy as np
+
+from process_manager import ProcessPriority
+
+# Mô phỏng Monte Carlo theo lô: nhiều bản sao độc lập của cùng một tải công việc
+# được tiến đồng thời từng đơn vị thời gian bằng các phép toán mảng NumPy.
+# Mô hình khớp với SimulationEngine khi chạy một CPU, tick_length = 1 và
+# thời gian chạy là số nguyên: cùng thứ tự hàng đợi, cùng cách tính quantum,
+# cùng xác suất I/O mỗi đoạn chạy và thời gian chờ I/O theo phân phối hình học.
+
+READY, RUNNING, WAITING, TERMINATED, NEW = 0, 1, 2, 3, 4
+
+PRIORITY_VALUES = {ProcessPriority.HIGH: 1, ProcessPriority.MEDIUM: 2, ProcessPriority.LOW: 3}
+
+# Các chính sách không chiếm quyền được hỗ trợ: (dùng độ ưu tiên, sắp theo thời gian còn lại, có quantum).
+# SRTF, MLFQ, Fair-share và nhiều CPU cần trạng thái riêng theo từng tiến trình hoặc từng lõi, chỉ chạy
+# được trên SimulationEngine (ProcessManager)
+BATCH_POLICIES = {
+    "Priority RR": (True, False, True),
+    "RR": (False, False, True),
+    "FCFS": (False, False, False),
+    "SJF": (False, True, False),
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+# Kết quả của một lần chạy theo lô, mỗi mảng có một phần tử cho mỗi bản sao
+class BatchResult:
+    def __init__(self, arrival, end_time, busy_time, makespan, start_time=None):
+        self.arrival = arrival
+        self.end_time = end_time  # (bản sao, tiến trình), NaN nếu chưa kết thúc
+        self.start_time = start_time if start_time is not None else np.full_like(end_time, np.nan)  # Lần đầu chạy
+        self.busy_time = busy_time
+        self.makespan = makespan
+        self.turnaround = end_time - arrival[None, :]
+        self.response = self.start_time - arrival[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.throughput = np.isfinite(end_time).sum(axis=1) / makespan
+            self.utilization = busy_time / makespan
+
+    @property
+    def replicas(self):
+        return len(self.makespan)
+
+    def mean_turnaround(self):
+        """Thời gian hoàn thành trung bình của từng bản sao"""
+        return np.nanmean(self.turnaround, axis=1)
+
+    def mean_response(self):
+        """Thời gian đáp ứng (từ lúc đến tới lần chạy đầu) trung bình của từng bản sao"""
+        return np.nanmean(self.response, axis=1)
+
+    def percentile_turnaround(self, q):
+        """Phân vị thời gian hoàn thành của từng bản sao"""
+        return np.nanpercentile(self.turnaround, q, axis=1)
+
+    def per_replica(self):
+        """Danh sách chỉ số của từng bản sao"""
+        mean = self.mean_turnaround()
+        response = self.mean_response()
+        percentiles = {q: self.percentile_turnaround(q) for q in PERCENTILES}
+        return [
+            {
+                "replica": r,
+                "makespan": float(self.makespan[r]),
+                "throughput": float(self.throughput[r]),
+                "mean_turnaround": float(mean[r]),
+                "mean_response": float(response[r]),
+                **{f"p{q}_turnaround": float(percentiles[q][r]) for q in PERCENTILES},
+                "utilization": float(self.utilization[r]),
+            }
+            for r in range(self.replicas)
+        ]
+
+    def summary(self):
+        """Chỉ số tổng hợp trên tất cả bản sao"""
+        turnaround = self.turnaround[np.isfinite(self.turnaround)]
+        response = self.response[np.isfinite(self.response)]
+        result = {
+            "replicas": self.replicas,
+            "throughput": float(np.mean(self.throughput)),
+            "throughput_std": float(np.std(self.throughput)),
+            "mean_turnaround": float(np.mean(turnaround)) if turnaround.size else float("nan"),
+            "mean_response": float(np.mean(response)) if response.size else float("nan"),
+            "utilization": float(np.mean(self.utilization)),
+            "makespan": float(np.mean(self.makespan)),
+            "unfinished": int(np.isnan(self.end_time).sum()),
+        }
+        for q in PERCENTILES:
+            result[f"p{q}_turnaround"] = float(np.percentile(turnaround, q)) if turnaround.size else float("nan")
+        return result
+
+
+# Bộ mô phỏng theo lô: mỗi hàng của các mảng trạng thái là một bản sao
+class BatchSimulator:
+    def __init__(self, workload, replicas=1000, policy="Priority RR", time_slice=1,
+                 io_probability=0.2, wakeup_probability=0.3, seed=None):
+        if policy not in BATCH_POLICIES:
+            raise ValueError(f"Chính sách {policy} không hỗ trợ mô phỏng theo lô "
+                             f"(hỗ trợ {', '.join(BATCH_POLICIES)}, một CPU)")
+        if int(time_slice) != time_slice or time_slice <= 0:
+            raise ValueError("time_slice phải là số nguyên dương")
+        priorities, bursts, arrivals = [], [], []
+        for item in workload:
+            # Mỗi phần tử là (độ ưu tiên, thời gian chạy) hoặc (độ ưu tiên, thời gian chạy, thời điểm đến)
+            priority, burst_time = item[0], item[1]
+            priorities.append(PRIORITY_VALUES.get(priority, priority))
+            bursts.append(burst_time)
+            arrivals.append(item[2] if len(item) > 2 else 0)
+        self.priority = np.array(priorities, dtype=np.int64)
+        # Thời gian được chia theo đơn vị nên thời gian chạy lẻ được làm tròn lên
+        self.burst = np.ceil(np.array(bursts, dtype=np.float64)).astype(np.int64)
+        self.arrival = np.ceil(np.array(arrivals, dtype=np.float64)).astype(np.int64)
+        self.replicas = replicas
+        self.policy = policy
+        self.time_slice = int(time_slice)
+        self.io_probability = io_probability
+        self.wakeup_probability = wakeup_probability
+        self.rng = np.random.default_rng(seed)
+
+    def _enqueue(self, state, stamp, seq, mask):
+        """Đưa các tiến trình trong mask vào hàng đợi ready, giữ thứ tự FIFO theo pid"""
+        order = np.cumsum(mask, axis=1) - 1
+        state[mask] = READY
+        stamp[mask] = (seq[:, None] + order)[mask]
+        seq += mask.sum(axis=1)
+
+    def _arrive(self, state, stamp, seq, new):
+        """Đưa các tiến trình new vừa đến (giống nhau ở mọi bản sao) vào cuối hàng đợi ready theo thứ tự"""
+        state[:, new] = READY
+        stamp[:, new] = seq[:, None] + np.arange(len(new))
+        seq += len(new)
+
+    def _requeue(self, state, stamp, seq, r, p):
+        """Đưa tiến trình p hết quantum của các bản sao r (mỗi bản sao nhiều nhất một) về cuối hàng đợi ready"""
+        state[r, p] = READY
+        stamp[r, p] = seq[r]
+        seq[r] += 1
+
+    def run(self, max_time=None):
+        """Chạy mọi bản sao tới khi tất cả tiến trình kết thúc hoặc tới max_time"""
+        R, N = self.replicas, len(self.burst)
+        use_priority, shortest_first, has_quantum = BATCH_POLICIES[self.policy]
+        rows = np.arange(R)
+        state = np.full((R, N), NEW, dtype=np.int8)
+        remaining = np.tile(self.burst, (R, 1))
+        stamp = np.zeros((R, N), dtype=np.int64)  # Thứ tự vào hàng đợi ready
+        wake_at = np.zeros((R, N), dtype=np.int64)
+        end_time = np.full((R, N), np.nan)
+        start_time = np.full((R, N), np.nan)
+        seq = np.zeros(R, dtype=np.int64)
+        running = np.full(R, -1, dtype=np.int64)
+        slice_used = np.zeros(R, dtype=np.int64)
+        busy = np.zeros(R, dtype=np.int64)
+        makespan = np.zeros(R, dtype=np.float64)
+        # Khóa sắp xếp cố định của từng tiến trình, cộng thêm thứ tự vào hàng đợi khi chọn
+        base_key = self.priority if use_priority else np.zeros(N, dtype=np.int64)
+        limit = max_time if max_time is not None else np.inf
+        # Thời điểm đến giống nhau ở mọi bản sao: duyệt tiến trình theo thứ tự đến thay vì dò cả mảng trạng thái
+        arrival_order = np.argsort(self.arrival, kind="stable")
+        arrival_sorted = self.arrival[arrival_order]
+        arrived = 0
+
+        def dispatch():
+            """Cấp CPU cho các bản sao đang rảnh: chọn khóa nhỏ nhất, FIFO nếu bằng nhau"""
+            idle = running < 0
+            if not idle.any():
+                return
+            key = (remaining if shortest_first else base_key[None, :]) * (N * (now + 2) + 1) + stamp
+            key = np.where(state == READY, key, np.iinfo(np.int64).max)
+            candidates = key[idle].argmin(axis=1)
+            r = rows[idle]
+            found = state[r, candidates] == READY
+            r, candidates = r[found], candidates[found]
+            state[r, candidates] = RUNNING
+            running[r] = candidates
+            slice_used[r] = 0
+            first = np.isnan(start_time[r, candidates])
+            start_time[r[first], candidates[first]] = now
+
+        now = 0
+        while now <= limit:
+            # Tiến trình hoàn tất I/O vào hàng đợi trước tiến trình hết quantum, như ngắt I/O của SimulationEngine
+            self._enqueue(state, stamp, seq, (state == WAITING) & (wake_at <= now))
+
+            # Kết thúc đơn vị thời gian vừa chạy của tiến trình đang chạy
+            active = running >= 0
+            if active.any():
+                r = rows[active]
+                p = running[active]
+                remaining[r, p] -= 1
+                slice_used[r] += 1
+                busy[r] += 1
+                done = remaining[r, p] <= 0
+                segment_end = slice_used[r] % self.time_slice == 0
+                io = ~done & segment_end & (self.rng.random(len(r)) < self.io_probability)
+                expired = ~done & ~io & segment_end & has_quantum & (slice_used[r] >= self.time_slice)
+
+                state[r[done], p[done]] = TERMINATED
+                end_time[r[done], p[done]] = now
+                makespan[r[done]] = now
+
+                ticks = self.rng.geometric(self.wakeup_probability, io.sum()) \
+                    if self.wakeup_probability < 1 else 1
+                state[r[io], p[io]] = WAITING
+                wake_at[r[io], p[io]] = now + ticks
+
+                self._requeue(state, stamp, seq, r[expired], p[expired])
+
+                released = done | io | expired
+                running[r[released]] = -1
+
+            if not (state != TERMINATED).any():
+                break
+
+            dispatch()
+            # Tiến trình đến được tạo sau mọi sự kiện cùng thời điểm (kể cả lần cấp CPU ở trên),
+            # như ProcessManager._advance; bản sao vẫn rảnh thì cấp CPU cho chúng ngay
+            count = np.searchsorted(arrival_sorted, now, side="right")
+            if count > arrived:
+                self._arrive(state, stamp, seq, arrival_order[arrived:count])
+                arrived = count
+                dispatch()
+            now += 1
+
+        return BatchResult(self.arrival.astype(np.float64), end_time, busy.astype(np.float64),
+                           np.where(makespan > 0, makespan, np.nan), start_time)
+
+
+def simulate(workload, replicas=1000, **options):
+    """Chạy mô phỏng theo lô và trả về BatchResult"""
+    max_time = options.pop("max_time", None)
+    return BatchSimulator(workload, replicas, **options).run(max_time)
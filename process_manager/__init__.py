@@ -0,0 +1,27 @@
+"""Bộ quản lý tiến trình mô phỏng: lõi lập lịch dùng được không cần Tk, giao diện nạp khi cần"""
+
+from .core import (
+    CPU, DISTRIBUTIONS, PRIORITY_CODES, PRIORITY_MIXES, SCHEDULING_POLICIES, STATE_CODES, Checkpointer, EventType,
+    ExponentialDistribution, ExponentialIODuration, FairSharePolicy, FCFSPolicy, FixedDistribution,
+    FixedIODuration, GanttHistory, GeometricDistribution, GeometricIODuration, HostProcess,
+    LogNormalDistribution, MLFQPolicy, PriorityRoundRobinPolicy, Process, ProcessArchive, ProcessManager,
+    ProcessPriority, ProcessState, ProcessTable, ProcessView, QuantileSketch, RoundRobinPolicy, RunningStats,
+    RunQueue, SchedulerMetrics, SchedulingPolicy, SimulationEngine, SJFPolicy, SRTFPolicy, StreamingMetric,
+    SystemMonitor, TimerWheel, TraceKind, TraceRecord, TraceWriter, UniformDistribution, UniformIntDistribution,
+    UniformIODuration, VariateStream, WorkloadModel, load_workload, load_workload_csv, load_workload_jsonl,
+    format_metric, parse_distribution, parse_priority, read_checkpoint, read_trace, replay_trace,
+)
+
+# Các tên của giao diện: chỉ import gui (và tkinter) khi được dùng tới lần đầu
+_GUI_NAMES = {
+    "ProcessManagerApp", "VirtualTable", "SortedIndex", "GanttView", "UIUpdatePipeline", "main",
+    "PROCESS_COLUMNS", "PROCESS_HEADINGS", "PROCESS_SORT_KEYS", "STATE_TAG_COLORS",
+    "HOST_COLUMNS", "HOST_HEADINGS", "HOST_SORT_KEYS", "HOST_STATES",
+}
+
+
+def __getattr__(name):
+    if name in _GUI_NAMES:
+        from . import gui
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,83 @@
+import argparse
+import json
+import sys
+import time
+
+from .core import (
+    SCHEDULING_POLICIES, ProcessManager, WorkloadModel, format_metric, load_workload, parse_distribution,
+)
+
+# Điểm vào dòng lệnh: python -m process_manager [gui | run ...]
+# Lệnh run chạy workload không giao diện và in chỉ số lập lịch, không import tkinter.
+
+
+def run(options):
+    """Chạy một workload tới khi mọi tiến trình kết thúc (hoặc tới --until), in chỉ số"""
+    model = WorkloadModel(burst=parse_distribution(options.burst), io_duration=parse_distribution(options.io_duration),
+                          arrival=parse_distribution(options.arrival))
+    manager = ProcessManager(seed=options.seed, policy=SCHEDULING_POLICIES[options.policy],
+                             num_cpus=options.cpus, compact=options.compact, model=model)
+    manager.set_time_slice(options.time_slice)
+    manager.io_probability = options.io
+    if options.trace:
+        manager.start_trace(options.trace)
+
+    start = time.perf_counter()
+    if options.workload:
+        created = manager.schedule_arrivals(load_workload(options.workload))
+    else:
+        created = manager.create_random_processes(options.random)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    events = manager.run(until=options.until)
+    elapsed = time.perf_counter() - start
+    if options.trace:
+        manager.stop_trace()
+
+    metrics = manager.get_metrics()
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+    print(f"{created} tiến trình ({loaded:.2f}s), {events} sự kiện trong {elapsed:.2f}s, "
+          f"thời gian ảo {manager.engine.now:g}")
+    print(f"Hoàn thành: {metrics['completed']} | Thông lượng: {metrics['throughput']:.3f}/đv | "
+          f"CPU: {metrics['utilization']:.0%} | Chuyển ngữ cảnh: {metrics['context_switches']} | "
+          f"Chiếm quyền: {metrics['preemptions']} | Chặn I/O: {metrics['io_blocks']}")
+    print(format_metric("Turnaround", metrics["turnaround"]))
+    print(format_metric("Phản hồi", metrics["response"]))
+    print(format_metric("Chờ ready", metrics["ready_wait"]))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m process_manager", description="Bộ quản lý tiến trình mô phỏng")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("gui", help="Mở giao diện Tk (mặc định)")
+    run_parser = commands.add_parser("run", help="Chạy workload không giao diện và in chỉ số")
+    run_parser.add_argument("workload", nargs="?", help="Tệp workload CSV/JSONL (bỏ trống: sinh ngẫu nhiên)")
+    run_parser.add_argument("--random", type=int, default=1000, help="Số tiến trình khi sinh ngẫu nhiên")
+    run_parser.add_argument("--policy", choices=list(SCHEDULING_POLICIES), default="Priority RR")
+    run_parser.add_argument("--cpus", type=int, default=1)
+    run_parser.add_argument("--time-slice", type=float, default=1)
+    run_parser.add_argument("--io", type=float, default=0.2, help="Xác suất I/O sau mỗi đoạn chạy")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--burst", default="randint:1,10",
+                            help="Phân phối thời gian chạy khi không cho trước, ví dụ exp:5, lognormal:5,0.5")
+    run_parser.add_argument("--io-duration", help="Phân phối thời gian chờ I/O (bỏ trống: hình học)")
+    run_parser.add_argument("--arrival", help="Phân phối khoảng cách giữa hai lần đến (bỏ trống: đến cùng lúc)")
+    run_parser.add_argument("--until", type=float, help="Dừng tại thời điểm ảo này")
+    run_parser.add_argument("--compact", action="store_true", help="Dùng bảng tiến trình dạng cột")
+    run_parser.add_argument("--trace", help="Ghi trace nhị phân ra tệp")
+    run_parser.add_argument("--json", help="Ghi chỉ số ra tệp JSON")
+    options = parser.parse_args(argv)
+
+    if options.command == "run":
+        return run(options)
+    # Chỉ nạp tkinter khi mở giao diện
+    from .gui import main as gui_main
+    gui_main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
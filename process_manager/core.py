@@ -0,0 +1,3539 @@
+import time
+import random
+import threading
+import math
+import heapq
+import itertools
+import struct
+import json
+import os
+from array import array
+from collections import deque, namedtuple
+from enum import Enum, IntEnum
+from operator import attrgetter, itemgetter
+# csv, sqlite3 và concurrent.futures chỉ được import trong hàm dùng tới để import lõi nhanh
+
+# Định nghĩa các trạng thái tiến trình
+class ProcessState(Enum):
+    READY = "Sẵn sàng"
+    RUNNING = "Đang chạy"
+    WAITING = "Đang đợi"
+    TERMINATED = "Đã kết thúc"
+
+# Định nghĩa các mức độ ưu tiên
+class ProcessPriority(Enum):
+    HIGH = "Cao"
+    MEDIUM = "Trung bình"
+    LOW = "Thấp"
+
+# Lớp đại diện cho một tiến trình
+class Process:
+    _pids = itertools.count(1)  # Bộ đếm pid của tiến trình tạo ngoài ProcessManager (mỗi manager có bộ đếm riêng)
+
+    def __init__(self, name, priority=ProcessPriority.MEDIUM, burst_time=None, creation_time=None, pid=None):
+        self.pid = pid if pid is not None else next(Process._pids)
+        self.name = name
+        self.state = ProcessState.READY
+        self.priority = priority
+        self.creation_time = creation_time if creation_time is not None else time.time()
+        self.start_time = None
+        self.end_time = None
+        self.burst_time = burst_time if burst_time else random.randint(1, 10)
+        self.remaining_time = self.burst_time
+        self.waiting_reason = None
+        self.io_deadline = None  # Thời điểm ảo I/O hoàn tất khi đang đợi
+        self.ready_since = None  # Thời điểm vào hàng đợi ready gần nhất
+        self.ready_wait = 0.0  # Tổng thời gian đã nằm trong hàng đợi ready
+        self.cpu_id = None  # Lõi CPU đang chứa hoặc vừa chạy tiến trình
+        
+    def start(self, now=None):
+        if self.state == ProcessState.READY:
+            self.state = ProcessState.RUNNING
+            if not self.start_time:
+                self.start_time = now if now is not None else time.time()
+            return True
+        return False
+        
+    def wait(self, reason="I/O", deadline=None):
+        if self.state == ProcessState.RUNNING:
+            self.state = ProcessState.WAITING
+            self.waiting_reason = reason
+            self.io_deadline = deadline
+            return True
+        return False
+        
+    def resume(self):
+        if self.state == ProcessState.WAITING:
+            self.state = ProcessState.READY
+            self.waiting_reason = None
+            self.io_deadline = None
+            return True
+        return False
+        
+    def terminate(self, now=None):
+        if self.state != ProcessState.TERMINATED:
+            self.state = ProcessState.TERMINATED
+            self.end_time = now if now is not None else time.time()
+            return True
+        return False
+        
+    def execute(self, time_slice=1, now=None):
+        """Thực thi tiến trình trong time_slice đơn vị thời gian"""
+        if self.state == ProcessState.RUNNING:
+            executed = min(time_slice, self.remaining_time)
+            self.remaining_time -= executed
+            if self.remaining_time <= 1e-9:  # Bỏ qua sai số làm tròn của thời gian ảo
+                self.remaining_time = 0
+                self.terminate(now)
+            return executed
+        return 0
+        
+    def get_priority_value(self):
+        """Trả về giá trị số của độ ưu tiên để so sánh"""
+        if self.priority == ProcessPriority.HIGH:
+            return 1
+        elif self.priority == ProcessPriority.MEDIUM:
+            return 2
+        else:
+            return 3
+
+# Mã số của trạng thái và độ ưu tiên khi lưu trong mảng
+STATE_CODES = list(ProcessState)
+PRIORITY_CODES = list(ProcessPriority)
+_STATE_CODE = {state: code for code, state in enumerate(STATE_CODES)}
+_PRIORITY_CODE = {priority: code for code, priority in enumerate(PRIORITY_CODES)}
+_NO_TIME = float("nan")  # Giá trị thay cho None ở các cột thời gian
+
+# Bảng tiến trình dạng cột (struct-of-arrays) cho hàng triệu tiến trình:
+# mỗi thuộc tính là một mảng, tiến trình thứ i nằm ở hàng i và có pid = i + 1
+class ProcessTable:
+    def __init__(self):
+        self.state = array("b")
+        self.priority = array("b")
+        self.burst_time = array("d")
+        self.remaining_time = array("d")
+        self.creation_time = array("d")
+        self.start_time = array("d")
+        self.end_time = array("d")
+        self.io_deadline = array("d")
+        self.ready_since = array("d")
+        self.ready_wait = array("d")
+        self.cpu_id = array("h")  # -1 khi chưa gắn lõi
+        self.waiting_reason = array("b")  # Mã trong self.reasons, 0 là không đợi
+        self.names = []
+        self.reasons = [None]
+        self._reason_codes = {None: 0}
+        self._views = []  # View của từng hàng, giữ để so sánh bằng "is" vẫn đúng
+
+    def add(self, name, priority=ProcessPriority.MEDIUM, burst_time=None, creation_time=None):
+        """Thêm một hàng mới và trả về view của nó"""
+        burst_time = burst_time if burst_time else random.randint(1, 10)
+        self.state.append(_STATE_CODE[ProcessState.READY])
+        self.priority.append(_PRIORITY_CODE[priority])
+        self.burst_time.append(burst_time)
+        self.remaining_time.append(burst_time)
+        self.creation_time.append(creation_time if creation_time is not None else time.time())
+        self.start_time.append(_NO_TIME)
+        self.end_time.append(_NO_TIME)
+        self.io_deadline.append(_NO_TIME)
+        self.ready_since.append(_NO_TIME)
+        self.ready_wait.append(0.0)
+        self.cpu_id.append(-1)
+        self.waiting_reason.append(0)
+        self.names.append(name)
+        view = ProcessView(self, len(self._views))
+        self._views.append(view)
+        return view
+
+    def reason_code(self, reason):
+        """Mã số của lý do đợi, thêm mới nếu chưa có"""
+        code = self._reason_codes.get(reason)
+        if code is None:
+            code = len(self.reasons)
+            self.reasons.append(reason)
+            self._reason_codes[reason] = code
+        return code
+
+    # Giao diện giống dict {pid: Process} để ProcessManager dùng chung
+    def get(self, pid, default=None):
+        if isinstance(pid, int) and 0 < pid <= len(self._views):
+            return self._views[pid - 1]
+        return default
+
+    def __getitem__(self, pid):
+        process = self.get(pid)
+        if process is None:
+            raise KeyError(pid)
+        return process
+
+    def __contains__(self, pid):
+        return self.get(pid) is not None
+
+    def __len__(self):
+        return len(self._views)
+
+    def __iter__(self):
+        return iter(range(1, len(self._views) + 1))
+
+    def values(self):
+        return iter(self._views)
+
+# View của một hàng trong ProcessTable, dùng chung các phương thức của Process
+class ProcessView:
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def pid(self):
+        return self.row + 1
+
+    @property
+    def name(self):
+        return self.table.names[self.row]
+
+    @property
+    def state(self):
+        return STATE_CODES[self.table.state[self.row]]
+
+    @state.setter
+    def state(self, value):
+        self.table.state[self.row] = _STATE_CODE[value]
+
+    @property
+    def priority(self):
+        return PRIORITY_CODES[self.table.priority[self.row]]
+
+    @priority.setter
+    def priority(self, value):
+        self.table.priority[self.row] = _PRIORITY_CODE[value]
+
+    @property
+    def burst_time(self):
+        return self.table.burst_time[self.row]
+
+    @property
+    def remaining_time(self):
+        return self.table.remaining_time[self.row]
+
+    @remaining_time.setter
+    def remaining_time(self, value):
+        self.table.remaining_time[self.row] = value
+
+    @property
+    def creation_time(self):
+        return self.table.creation_time[self.row]
+
+    @property
+    def start_time(self):
+        value = self.table.start_time[self.row]
+        return None if value != value else value  # NaN nghĩa là chưa có
+
+    @start_time.setter
+    def start_time(self, value):
+        self.table.start_time[self.row] = _NO_TIME if value is None else value
+
+    @property
+    def end_time(self):
+        value = self.table.end_time[self.row]
+        return None if value != value else value
+
+    @end_time.setter
+    def end_time(self, value):
+        self.table.end_time[self.row] = _NO_TIME if value is None else value
+
+    @property
+    def io_deadline(self):
+        value = self.table.io_deadline[self.row]
+        return None if value != value else value
+
+    @io_deadline.setter
+    def io_deadline(self, value):
+        self.table.io_deadline[self.row] = _NO_TIME if value is None else value
+
+    @property
+    def ready_since(self):
+        value = self.table.ready_since[self.row]
+        return None if value != value else value
+
+    @ready_since.setter
+    def ready_since(self, value):
+        self.table.ready_since[self.row] = _NO_TIME if value is None else value
+
+    @property
+    def ready_wait(self):
+        return self.table.ready_wait[self.row]
+
+    @ready_wait.setter
+    def ready_wait(self, value):
+        self.table.ready_wait[self.row] = value
+
+    @property
+    def cpu_id(self):
+        value = self.table.cpu_id[self.row]
+        return None if value < 0 else value
+
+    @cpu_id.setter
+    def cpu_id(self, value):
+        self.table.cpu_id[self.row] = -1 if value is None else value
+
+    @property
+    def waiting_reason(self):
+        return self.table.reasons[self.table.waiting_reason[self.row]]
+
+    @waiting_reason.setter
+    def waiting_reason(self, value):
+        self.table.waiting_reason[self.row] = self.table.reason_code(value)
+
+    start = Process.start
+    wait = Process.wait
+    resume = Process.resume
+    terminate = Process.terminate
+    execute = Process.execute
+    get_priority_value = Process.get_priority_value
+
+# Kho lưu trữ chỉ ghi thêm cho tiến trình đã kết thúc bị loại khỏi bộ nhớ:
+# ghi theo lô vào SQLite, tra cứu theo pid qua khóa chính
+class ProcessArchive:
+    COLUMNS = ("pid", "name", "priority", "burst_time", "remaining_time", "creation_time",
+               "start_time", "end_time", "ready_wait", "cpu_id")
+
+    def __init__(self, path=":memory:", batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size  # Số tiến trình gom lại trước mỗi lần ghi
+        self._lock = threading.Lock()  # Luồng scheduler ghi, luồng giao diện đọc
+        import sqlite3
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS processes (pid INTEGER PRIMARY KEY, name TEXT, priority INTEGER, "
+            "burst_time NUMERIC, remaining_time NUMERIC, creation_time REAL, start_time REAL, "
+            "end_time REAL, ready_wait REAL, cpu_id INTEGER)")
+        self._pending = {}  # {pid: hàng chưa ghi xuống đĩa}
+
+    def __len__(self):
+        # INSERT OR REPLACE ghi đè pid đã có: đếm trên bảng sau khi ghi thay vì cộng dồn số hàng đã ghi
+        with self._lock:
+            self._flush()
+            return self._connection.execute("SELECT COUNT(*) FROM processes").fetchone()[0]
+
+    def __contains__(self, pid):
+        return self.get(pid) is not None
+
+    def add_many(self, processes):
+        """Thêm các tiến trình đã kết thúc, ghi xuống đĩa khi đủ một lô"""
+        with self._lock:
+            for process in processes:
+                self._pending[process.pid] = (
+                    process.pid, process.name, _PRIORITY_CODE[process.priority], process.burst_time,
+                    process.remaining_time, process.creation_time, process.start_time, process.end_time,
+                    process.ready_wait, process.cpu_id)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Ghi các tiến trình còn trong bộ đệm xuống đĩa"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO processes VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                self._pending.values())
+        self._pending.clear()
+
+    def get(self, pid):
+        """Tiến trình đã lưu trữ theo pid (dựng lại thành Process), None nếu không có"""
+        with self._lock:
+            row = self._pending.get(pid)
+            if row is None:
+                row = self._connection.execute("SELECT * FROM processes WHERE pid = ?", (pid,)).fetchone()
+        return self._restore(row) if row is not None else None
+
+    def rows(self, pids=None):
+        """Các hàng đã lưu trữ của pids (None: tất cả), dùng để chép kho vào checkpoint"""
+        with self._lock:
+            self._flush()
+            if pids is None:
+                return self._connection.execute("SELECT * FROM processes").fetchall()
+            rows = []
+            for start in range(0, len(pids), 500):  # Giữ số tham số mỗi câu lệnh dưới giới hạn của SQLite
+                chunk = pids[start:start + 500]
+                rows += self._connection.execute(
+                    f"SELECT * FROM processes WHERE pid IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+            return rows
+
+    def add_rows(self, rows):
+        """Nạp lại các hàng đã lưu trữ (ví dụ khi khôi phục checkpoint)"""
+        with self._lock:
+            self._pending.update((row[0], tuple(row)) for row in rows)
+            self._flush()
+
+    def _restore(self, row):
+        pid, name, priority, burst_time, remaining_time, creation_time, start_time, end_time, ready_wait, cpu_id = row
+        process = Process.__new__(Process)  # Không lấy pid mới từ bộ đếm
+        process.pid = pid
+        process.name = name
+        process.state = ProcessState.TERMINATED
+        process.priority = PRIORITY_CODES[priority]
+        process.creation_time = creation_time
+        process.start_time = start_time
+        process.end_time = end_time
+        process.burst_time = burst_time
+        process.remaining_time = remaining_time
+        process.waiting_reason = None
+        process.io_deadline = None
+        process.ready_since = None
+        process.ready_wait = ready_wait
+        process.cpu_id = cpu_id
+        return process
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+# Hàng đợi ready dùng heap: chèn, lấy phần tử nhỏ nhất và xóa theo pid đều O(log n)
+class RunQueue:
+    def __init__(self, key=None):
+        self.key = key if key else Process.get_priority_value  # Khóa sắp xếp của tiến trình
+        self._heap = []  # [khóa, số thứ tự, tiến trình]
+        self._entries = {}  # {pid: entry}
+        self._counter = itertools.count()  # Giữ thứ tự FIFO trong cùng mức ưu tiên
+
+    def push(self, process):
+        """Thêm tiến trình vào cuối nhóm cùng mức ưu tiên"""
+        if process.pid in self._entries:
+            self.remove(process.pid)
+        entry = [self.key(process), next(self._counter), process]
+        self._entries[process.pid] = entry
+        heapq.heappush(self._heap, entry)
+
+    def extend(self, processes):
+        """Thêm nhiều tiến trình theo thứ tự, lô lớn được gộp vào heap bằng một lần heapify"""
+        entries = self._entries
+        for process in processes:
+            if process.pid in entries:
+                self.remove(process.pid)
+        key = self.key
+        counter = self._counter
+        batch = [[key(process), next(counter), process] for process in processes]
+        entries.update((entry[2].pid, entry) for entry in batch)
+        heap = self._heap
+        if len(batch) > len(heap) // 8:
+            heap.extend(batch)
+            heapq.heapify(heap)  # O(n) thay vì O(k log n) của k lần heappush
+        else:
+            for entry in batch:
+                heapq.heappush(heap, entry)
+
+    def pop(self):
+        """Lấy tiến trình có độ ưu tiên cao nhất (FIFO nếu cùng mức)"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            process = entry[2]
+            if process is not None:
+                del self._entries[process.pid]
+                return process
+        raise IndexError("pop from empty RunQueue")
+
+    def peek(self):
+        """Xem tiến trình sẽ được lấy tiếp theo mà không xóa khỏi hàng đợi"""
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][2] if self._heap else None
+
+    def remove(self, pid):
+        """Xóa tiến trình theo pid (đánh dấu xóa, dọn dẹp khi pop)"""
+        entry = self._entries.pop(pid, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        # Dọn heap khi số phần tử đã xóa chiếm quá nửa để tránh phình bộ nhớ
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+        return True
+
+    def peek_key(self):
+        """Khóa của tiến trình sẽ được lấy tiếp theo"""
+        self.peek()
+        return self._heap[0][0]
+
+    def key_of(self, process):
+        """Khóa hiện tại của tiến trình trong hàng đợi"""
+        return self._entries[process.pid][0]
+
+    def __contains__(self, process):
+        return process.pid in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        """Duyệt các tiến trình theo thứ tự sẽ được lập lịch"""
+        return (entry[2] for entry in sorted(self._entries.values()))
+
+    def snapshot(self):
+        """Số thứ tự kế tiếp và các mảng (khóa, số thứ tự, pid) của những mục còn trong hàng đợi"""
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        # Khóa và số thứ tự của một mục không đổi sau khi thêm: chỉ chép bảng mục,
+        # các mảng là hàm dựng được gọi sau khi nhả khóa
+        entries = self._entries.copy()
+        return next_seq, {
+            "key": lambda: array("d", map(itemgetter(0), entries.values())),
+            "seq": lambda: array("q", map(itemgetter(1), entries.values())),
+            "pid": lambda: array("q", entries),
+        }
+
+    def restore(self, next_seq, arrays, lookup):
+        """Dựng lại heap từ kết quả của snapshot() bằng một lần heapify"""
+        pids = arrays["pid"]
+        self._heap = list(map(list, zip(arrays["key"], arrays["seq"], map(lookup, pids))))
+        self._entries = dict(zip(pids, self._heap))
+        heapq.heapify(self._heap)
+        self._counter = itertools.count(next_seq)
+
+# Giao diện chính sách lập lịch: ProcessManager ủy quyền việc chọn tiến trình,
+# quyết định chiếm quyền (preemption) và đưa tiến trình trở lại hàng đợi
+class SchedulingPolicy:
+    name = "Base"
+    preemptive = False  # True nếu tiến trình mới sẵn sàng có thể chiếm CPU
+
+    def __init__(self):
+        self.queue = RunQueue(self.key)
+
+    def key(self, process):
+        """Khóa sắp xếp trong hàng đợi, giá trị nhỏ được chọn trước"""
+        return 0
+
+    def add(self, process):
+        """Thêm tiến trình mới tạo hoặc vừa hoàn tất I/O"""
+        self.queue.push(process)
+
+    def add_many(self, processes):
+        """Thêm một lô tiến trình mới tạo theo thứ tự (chính sách ghi đè add() phải ghi đè cả hàm này)"""
+        self.queue.extend(processes)
+
+    def requeue(self, process, expired):
+        """Đưa tiến trình đang chạy trở lại hàng đợi (expired: đã dùng hết quantum)"""
+        self.queue.push(process)
+
+    def remove(self, process):
+        """Xóa tiến trình khỏi hàng đợi"""
+        return self.queue.remove(process.pid)
+
+    def pop(self):
+        """Lấy tiến trình được chọn chạy tiếp theo"""
+        return self.queue.pop()
+
+    def peek(self):
+        """Xem tiến trình sẽ được chọn tiếp theo"""
+        return self.queue.peek()
+
+    def quantum(self, process, time_slice):
+        """Thời gian tối đa tiến trình giữ CPU trước khi bị đưa về hàng đợi (None: không giới hạn)"""
+        return time_slice
+
+    def account(self, process, ran):
+        """Ghi nhận thời gian CPU tiến trình vừa sử dụng"""
+
+    def should_preempt(self, running, candidate):
+        """True nếu candidate nên chiếm CPU của running"""
+        return False
+
+    def forget(self, process):
+        """Xóa dữ liệu riêng của tiến trình khi nó kết thúc"""
+
+    def export_state(self, process):
+        """Lấy và xóa dữ liệu riêng của tiến trình khi nó chuyển sang lõi khác"""
+        return None
+
+    def import_state(self, process, state):
+        """Nhận dữ liệu riêng từ export_state() của lõi cũ, gọi trước add()"""
+
+    def __contains__(self, process):
+        return process in self.queue
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __bool__(self):
+        return bool(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+    def snapshot(self):
+        """Trạng thái của chính sách cho checkpoint: (dict nhỏ, {tên: mảng hoặc hàm dựng mảng})"""
+        next_seq, arrays = self.queue.snapshot()
+        return {"next_seq": next_seq}, {f"queue_{name}": values for name, values in arrays.items()}
+
+    def restore(self, state, arrays, lookup):
+        """Khôi phục trạng thái từ snapshot(), lookup: hàm lấy tiến trình theo pid"""
+        self.queue.restore(state["next_seq"], _prefixed(arrays, "queue_"), lookup)
+
+# Round Robin theo độ ưu tiên (chính sách mặc định)
+class PriorityRoundRobinPolicy(SchedulingPolicy):
+    name = "Priority RR"
+
+    def key(self, process):
+        return process.get_priority_value()
+
+# Round Robin thuần, bỏ qua độ ưu tiên
+class RoundRobinPolicy(SchedulingPolicy):
+    name = "RR"
+
+# Đến trước phục vụ trước, không chiếm quyền
+class FCFSPolicy(SchedulingPolicy):
+    name = "FCFS"
+
+    def quantum(self, process, time_slice):
+        return None
+
+# Công việc ngắn nhất trước, không chiếm quyền
+class SJFPolicy(SchedulingPolicy):
+    name = "SJF"
+
+    def key(self, process):
+        return process.remaining_time
+
+    def quantum(self, process, time_slice):
+        return None
+
+# Thời gian còn lại ngắn nhất trước, có chiếm quyền
+class SRTFPolicy(SJFPolicy):
+    name = "SRTF"
+    preemptive = True
+
+    def should_preempt(self, running, candidate):
+        return candidate.remaining_time < running.remaining_time
+
+# Hàng đợi phản hồi đa mức: mỗi mức một hàng đợi FIFO, hạ mức khi dùng hết quantum.
+# Việc nâng tất cả lên mức cao định kỳ là O(1): tiến trình vào hàng đợi trước lần nâng
+# mức gần nhất được coi như đang ở mức cao nhất
+class MLFQPolicy(SchedulingPolicy):
+    name = "MLFQ"
+    preemptive = True
+
+    def __init__(self, quanta=(1, 2, 4), boost_interval=50):
+        self.quanta = quanta  # Hệ số quantum của từng mức so với time slice
+        self.boost_interval = boost_interval  # Số đơn vị CPU giữa hai lần nâng mức
+        self.levels = {}  # {pid: (mức, lần nâng mức khi gán)}
+        self.epoch = 0  # Số lần đã nâng mức
+        self._counter = itertools.count()
+        self._boost_seq = 0  # Các mục có số thứ tự nhỏ hơn được coi ở mức cao nhất
+        self._since_boost = 0
+        self._where = {}  # {pid: chỉ số hàng đợi đang chứa tiến trình}
+        self.queues = [RunQueue(self._sequence) for _ in quanta]
+
+    def _sequence(self, process):
+        return next(self._counter)
+
+    def level(self, process):
+        """Mức hiện tại của tiến trình"""
+        level, epoch = self.levels.get(process.pid, (0, self.epoch))
+        return level if epoch == self.epoch else 0
+
+    def _push(self, process, level):
+        self.levels[process.pid] = (level, self.epoch)
+        self._where[process.pid] = level
+        self.queues[level].push(process)
+
+    def add(self, process):
+        self._push(process, self.level(process))
+
+    def add_many(self, processes):
+        batches = [[] for _ in self.queues]
+        for process in processes:
+            level = self.level(process)
+            self.levels[process.pid] = (level, self.epoch)
+            self._where[process.pid] = level
+            batches[level].append(process)
+        for queue, batch in zip(self.queues, batches):
+            if batch:
+                queue.extend(batch)
+
+    def requeue(self, process, expired):
+        level = self.level(process)
+        if expired:
+            level = min(level + 1, len(self.quanta) - 1)
+        self._push(process, level)
+
+    def remove(self, process):
+        level = self._where.pop(process.pid, None)
+        return level is not None and self.queues[level].remove(process.pid)
+
+    def _head(self):
+        """Chỉ số hàng đợi chứa tiến trình được chọn tiếp theo"""
+        best = None
+        for index, queue in enumerate(self.queues):
+            if queue:
+                seq = queue.peek_key()
+                candidate = (0 if seq < self._boost_seq else index, seq, index)
+                if best is None or candidate < best:
+                    best = candidate
+        if best is None:
+            raise IndexError("pop from empty MLFQPolicy")
+        return best[2]
+
+    def pop(self):
+        process = self.queues[self._head()].pop()
+        del self._where[process.pid]
+        return process
+
+    def peek(self):
+        return self.queues[self._head()].peek() if self else None
+
+    def quantum(self, process, time_slice):
+        return time_slice * self.quanta[self.level(process)]
+
+    def account(self, process, ran):
+        self._since_boost += ran
+        if self.boost_interval and self._since_boost >= self.boost_interval:
+            self._since_boost = 0
+            self.epoch += 1
+            self._boost_seq = next(self._counter)
+
+    def should_preempt(self, running, candidate):
+        return self.level(candidate) < self.level(running)
+
+    def forget(self, process):
+        self.levels.pop(process.pid, None)
+
+    def export_state(self, process):
+        # Mức hiệu lực, vì mỗi lõi đếm số lần nâng mức riêng
+        level = self.level(process)
+        self.levels.pop(process.pid, None)
+        return level
+
+    def import_state(self, process, state):
+        if state is not None:
+            self.levels[process.pid] = (state, self.epoch)
+
+    def __contains__(self, process):
+        return process.pid in self._where
+
+    def __len__(self):
+        return len(self._where)
+
+    def __bool__(self):
+        return bool(self._where)
+
+    def __iter__(self):
+        processes = [p for queue in self.queues for p in queue]
+        return iter(sorted(processes, key=lambda p: (self.level(p), self.queues[self._where[p.pid]].key_of(p))))
+
+    def snapshot(self):
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        state = {
+            "quanta": list(self.quanta),
+            "boost_interval": self.boost_interval,
+            "epoch": self.epoch,
+            "next_seq": next_seq,
+            "boost_seq": self._boost_seq,
+            "since_boost": self._since_boost,
+            "queues": [],
+        }
+        levels = self.levels.copy()
+        arrays = {
+            "level_pid": lambda: array("q", levels),
+            "level": lambda: array("q", [level for level, _ in levels.values()]),
+            "level_epoch": lambda: array("q", [epoch for _, epoch in levels.values()]),
+        }
+        for index, queue in enumerate(self.queues):
+            queue_seq, queue_arrays = queue.snapshot()
+            state["queues"].append(queue_seq)
+            arrays.update({f"queue{index}_{name}": values for name, values in queue_arrays.items()})
+        return state, arrays
+
+    def restore(self, state, arrays, lookup):
+        self.quanta = tuple(state["quanta"])
+        self.boost_interval = state["boost_interval"]
+        self.queues = [RunQueue(self._sequence) for _ in self.quanta]
+        self._where = {}
+        self.epoch = state["epoch"]
+        self._counter = itertools.count(state["next_seq"])
+        self._boost_seq = state["boost_seq"]
+        self._since_boost = state["since_boost"]
+        self.levels = {pid: (level, epoch) for pid, level, epoch
+                       in zip(arrays["level_pid"], arrays["level"], arrays["level_epoch"])}
+        for index, (queue, queue_seq) in enumerate(zip(self.queues, state["queues"])):
+            queue.restore(queue_seq, _prefixed(arrays, f"queue{index}_"), lookup)
+            self._where.update(dict.fromkeys(queue._entries, index))
+
+# Chia sẻ công bằng kiểu CFS: chọn tiến trình có vruntime nhỏ nhất,
+# vruntime tăng chậm hơn với tiến trình có độ ưu tiên cao
+class FairSharePolicy(SchedulingPolicy):
+    name = "Fair-share"
+    preemptive = True
+    weights = {1: 4.0, 2: 2.0, 3: 1.0}  # {giá trị ưu tiên: trọng số}
+
+    def __init__(self, granularity=1):
+        self.granularity = granularity  # Chênh lệch vruntime tối thiểu để chiếm quyền
+        self.vruntime = {}  # {pid: vruntime}
+        self.min_vruntime = 0.0
+        super().__init__()
+
+    def key(self, process):
+        return self.vruntime.setdefault(process.pid, self.min_vruntime)
+
+    def pop(self):
+        process = self.queue.pop()
+        self.min_vruntime = max(self.min_vruntime, self.vruntime.get(process.pid, 0.0))
+        return process
+
+    def add(self, process):
+        # Tiến trình mới hoặc vừa thức dậy không được giữ vruntime quá thấp
+        self.vruntime[process.pid] = max(self.vruntime.get(process.pid, 0.0), self.min_vruntime)
+        self.queue.push(process)
+
+    def add_many(self, processes):
+        vruntime = self.vruntime
+        for process in processes:
+            vruntime[process.pid] = max(vruntime.get(process.pid, 0.0), self.min_vruntime)
+        self.queue.extend(processes)
+
+    def account(self, process, ran):
+        weight = self.weights[process.get_priority_value()]
+        self.vruntime[process.pid] = self.vruntime.get(process.pid, self.min_vruntime) + ran / weight
+
+    def should_preempt(self, running, candidate):
+        return self.vruntime[candidate.pid] + self.granularity < self.vruntime.get(running.pid, 0.0)
+
+    def forget(self, process):
+        self.vruntime.pop(process.pid, None)
+
+    def export_state(self, process):
+        # Độ lệch so với min_vruntime của lõi cũ, mỗi lõi có mốc vruntime riêng
+        vruntime = self.vruntime.pop(process.pid, None)
+        return None if vruntime is None else vruntime - self.min_vruntime
+
+    def import_state(self, process, state):
+        if state is not None:
+            self.vruntime[process.pid] = self.min_vruntime + state
+
+    def snapshot(self):
+        state, arrays = super().snapshot()
+        state.update(granularity=self.granularity, min_vruntime=self.min_vruntime)
+        vruntime = self.vruntime.copy()
+        arrays["vruntime_pid"] = lambda: array("q", vruntime)
+        arrays["vruntime"] = lambda: array("d", vruntime.values())
+        return state, arrays
+
+    def restore(self, state, arrays, lookup):
+        self.granularity = state["granularity"]
+        self.min_vruntime = state["min_vruntime"]
+        self.vruntime = dict(zip(arrays["vruntime_pid"], arrays["vruntime"]))
+        super().restore(state, arrays, lookup)
+
+# Các chính sách có sẵn theo tên
+SCHEDULING_POLICIES = {
+    policy.name: policy for policy in (
+        PriorityRoundRobinPolicy, RoundRobinPolicy, FCFSPolicy,
+        SJFPolicy, SRTFPolicy, MLFQPolicy, FairSharePolicy,
+    )
+}
+
+# Phân phối xác suất của thời gian chạy, thời gian chờ I/O và khoảng cách giữa hai lần đến.
+# Gọi với bộ sinh số ngẫu nhiên để lấy một giá trị, sample(rng, n) để rút cả lô.
+def geometric_ticks(rng, probability):
+    """Số tick tới khi hoàn tất khi mỗi tick hoàn tất với xác suất probability"""
+    return geometric_from_uniform(rng.random(), probability)
+
+def geometric_from_uniform(u, probability):
+    """Biến đổi một số đều trong [0, 1) thành số tick theo phân phối hình học"""
+    if probability >= 1:
+        return 1
+    return 1 + int(math.log(1.0 - u) / math.log(1.0 - probability))
+
+class GeometricDistribution:
+    def __init__(self, probability=0.3, tick_length=1):
+        self.probability = probability
+        self.tick_length = tick_length
+
+    def __call__(self, rng):
+        return geometric_ticks(rng, self.probability) * self.tick_length
+
+    def sample(self, rng, n):
+        random_, probability, tick_length = rng.random, self.probability, self.tick_length
+        return [geometric_from_uniform(random_(), probability) * tick_length for _ in range(n)]
+
+class ExponentialDistribution:
+    def __init__(self, mean=3.0):
+        self.mean = mean
+
+    def __call__(self, rng):
+        return rng.expovariate(1.0 / self.mean)
+
+    def sample(self, rng, n):
+        expovariate, rate = rng.expovariate, 1.0 / self.mean
+        return [expovariate(rate) for _ in range(n)]
+
+class LogNormalDistribution:
+    def __init__(self, median=5.0, sigma=0.5):
+        self.median = median
+        self.sigma = sigma
+
+    def __call__(self, rng):
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+    def sample(self, rng, n):
+        lognormvariate, mu, sigma = rng.lognormvariate, math.log(self.median), self.sigma
+        return [lognormvariate(mu, sigma) for _ in range(n)]
+
+class UniformDistribution:
+    def __init__(self, low=1.0, high=5.0):
+        self.low = low
+        self.high = high
+
+    def __call__(self, rng):
+        return rng.uniform(self.low, self.high)
+
+    def sample(self, rng, n):
+        random_, low, width = rng.random, self.low, self.high - self.low
+        return [low + width * random_() for _ in range(n)]
+
+class UniformIntDistribution:
+    def __init__(self, low=1, high=10):
+        self.low = low
+        self.high = high
+
+    def __call__(self, rng):
+        return rng.randint(self.low, self.high)
+
+    def sample(self, rng, n):
+        random_, low, count = rng.random, self.low, self.high - self.low + 1
+        return [low + int(random_() * count) for _ in range(n)]
+
+class FixedDistribution:
+    def __init__(self, duration=3.0):
+        self.duration = duration
+
+    def __call__(self, rng):
+        return self.duration
+
+    def sample(self, rng, n):
+        return [self.duration] * n
+
+# Tên cũ của các phân phối thời gian chờ I/O
+GeometricIODuration = GeometricDistribution
+ExponentialIODuration = ExponentialDistribution
+UniformIODuration = UniformDistribution
+FixedIODuration = FixedDistribution
+
+DISTRIBUTIONS = {cls.__name__: cls for cls in (
+    GeometricDistribution, ExponentialDistribution, LogNormalDistribution,
+    UniformDistribution, UniformIntDistribution, FixedDistribution,
+)}
+DISTRIBUTIONS.update({
+    "GeometricIODuration": GeometricDistribution, "ExponentialIODuration": ExponentialDistribution,
+    "UniformIODuration": UniformDistribution, "FixedIODuration": FixedDistribution,
+})
+_DISTRIBUTION_ALIASES = {
+    "geometric": GeometricDistribution, "exp": ExponentialDistribution, "lognormal": LogNormalDistribution,
+    "uniform": UniformDistribution, "randint": UniformIntDistribution, "fixed": FixedDistribution,
+}
+
+def parse_distribution(text):
+    """Phân phối từ chuỗi dạng "exp:5", "lognormal:5,0.5", "randint:1,10"; chuỗi rỗng hoặc "none" là None"""
+    if not text or text.lower() == "none":
+        return None
+    name, _, arguments = text.partition(":")
+    cls = _DISTRIBUTION_ALIASES.get(name.lower())
+    if cls is None:
+        raise ValueError(f"Phân phối không hợp lệ: {name} (hỗ trợ {', '.join(_DISTRIBUTION_ALIASES)})")
+    return cls(*(_trace_number(float(value)) for value in arguments.split(",") if value))
+
+def _distribution_state(distribution):
+    return [type(distribution).__name__, vars(distribution)] if distribution is not None else None
+
+def _distribution_from_state(state):
+    if state is None:
+        return None
+    name, values = state
+    distribution = DISTRIBUTIONS[name].__new__(DISTRIBUTIONS[name])
+    vars(distribution).update(values)
+    return distribution
+
+# Phân phối đều trên [0, 1): quyết định I/O, chờ I/O hình học, chọn độ ưu tiên
+UNIT_DISTRIBUTION = UniformDistribution(0.0, 1.0)
+
+# Một dòng biến ngẫu nhiên có bộ sinh riêng, rút trước từng lô để vòng lặp nóng chỉ đọc danh sách
+class VariateStream:
+    def __init__(self, seed, distribution, batch_size=1024):
+        self.rng = random.Random(seed)
+        self.distribution = distribution
+        self.batch_size = batch_size
+        self.values = []
+        self.index = 0
+        self._state = self.rng.getstate()  # Trạng thái bộ sinh trước lô hiện tại
+
+    def __call__(self):
+        index = self.index
+        if index >= len(self.values):
+            self._state = self.rng.getstate()
+            self.values = self.distribution.sample(self.rng, self.batch_size)
+            index = 0
+        self.index = index + 1
+        return self.values[index]
+
+    def take(self, n):
+        """n giá trị kế tiếp"""
+        return [self() for _ in range(n)]
+
+    def snapshot(self):
+        """Trạng thái bộ sinh trước lô hiện tại và vị trí đã đọc trong lô"""
+        version, internal, gauss = self._state
+        return [version, list(internal), gauss, self.index, len(self.values)]
+
+    def restore(self, state):
+        """Rút lại đúng lô hiện tại từ trạng thái đã lưu rồi đặt lại vị trí đọc"""
+        version, internal, gauss, index, length = state
+        self.rng.setstate((version, tuple(internal), gauss))
+        self._state = self.rng.getstate()
+        self.values = self.distribution.sample(self.rng, length) if length else []
+        self.index = index
+
+# Các tỉ lệ độ ưu tiên (cao, trung bình, thấp) dùng chung cho benchmark và quét tham số
+PRIORITY_MIXES = {
+    "uniform": (1 / 3, 1 / 3, 1 / 3),
+    "high-heavy": (0.6, 0.3, 0.1),
+    "low-heavy": (0.1, 0.3, 0.6),
+}
+
+# Mô hình workload ngẫu nhiên của một lần chạy: phân phối thời gian chạy, thời gian chờ I/O,
+# khoảng cách giữa hai lần đến và tỉ lệ độ ưu tiên. Mỗi loại biến có một dòng riêng sinh
+# từ seed của lần chạy, nên đổi một tham số không làm lệch các biến còn lại.
+class WorkloadModel:
+    STREAMS = ("burst", "io", "wakeup", "io_duration", "arrival", "priority", "name")
+
+    def __init__(self, burst=None, io_duration=None, arrival=None, priority_weights=None, batch_size=1024):
+        self.burst = burst if burst is not None else UniformIntDistribution(1, 10)
+        self.io_duration = io_duration  # None: hình học theo wakeup_probability của bộ quản lý
+        self.arrival = arrival  # Khoảng cách giữa hai lần đến, None: mọi tiến trình đến ngay
+        self.priority_weights = list(priority_weights) if priority_weights else [1.0] * len(PRIORITY_CODES)
+        self.batch_size = batch_size
+        self.seed = None
+        self.streams = {}
+
+    def bind(self, seed):
+        """Tạo các dòng biến ngẫu nhiên từ seed của lần chạy"""
+        self.seed = seed
+        distributions = {
+            "burst": self.burst,
+            "io": UNIT_DISTRIBUTION,
+            "wakeup": UNIT_DISTRIBUTION,
+            "io_duration": self.io_duration,
+            "arrival": self.arrival,
+            "priority": UNIT_DISTRIBUTION,
+            "name": UNIT_DISTRIBUTION,
+        }
+        self.streams = {
+            name: VariateStream(f"{seed}/{name}", distribution, self.batch_size)
+            for name, distribution in distributions.items() if distribution is not None
+        }
+        self.burst_time = self.streams["burst"]
+        self.uniform = self.streams["io"]
+        self.wakeup = self.streams["wakeup"]
+        self.interarrival = self.streams.get("arrival")
+        total = sum(self.priority_weights)
+        self._priority_bounds = list(itertools.accumulate(weight / total for weight in self.priority_weights))
+        return self
+
+    def set_io_duration(self, distribution):
+        """Đổi phân phối thời gian chờ I/O, chỉ dòng của nó được sinh lại"""
+        self.io_duration = distribution
+        self.streams.pop("io_duration", None)
+        if distribution is not None:
+            self.streams["io_duration"] = VariateStream(f"{self.seed}/io_duration", distribution, self.batch_size)
+
+    def io_time(self, wakeup_probability, tick_length):
+        """Thời lượng chờ I/O của một lần chặn"""
+        stream = self.streams.get("io_duration")
+        if stream is not None:
+            return stream()
+        return geometric_from_uniform(self.wakeup(), wakeup_probability) * tick_length
+
+    def priority(self):
+        """Độ ưu tiên rút theo priority_weights"""
+        u = self.streams["priority"]()
+        for priority, bound in zip(PRIORITY_CODES, self._priority_bounds):
+            if u < bound:
+                return priority
+        return PRIORITY_CODES[-1]
+
+    def random_specs(self, count, names=None):
+        """count bộ (tên, độ ưu tiên, thời gian chạy) ngẫu nhiên; tên chọn từ names kèm số ngẫu nhiên"""
+        name_stream = self.streams["name"]
+        specs = []
+        for i in range(count):
+            if names:
+                name = f"{names[int(name_stream() * len(names))]}-{100 + int(name_stream() * 900)}"
+            else:
+                name = f"p{i}"
+            specs.append((name, self.priority(), self.burst_time()))
+        return specs
+
+    def snapshot(self):
+        return {
+            "burst": _distribution_state(self.burst),
+            "io_duration": _distribution_state(self.io_duration),
+            "arrival": _distribution_state(self.arrival),
+            "priority_weights": self.priority_weights,
+            "batch_size": self.batch_size,
+            "seed": self.seed,
+            "streams": {name: stream.snapshot() for name, stream in self.streams.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, state):
+        model = cls(_distribution_from_state(state["burst"]), _distribution_from_state(state["io_duration"]),
+                    _distribution_from_state(state["arrival"]), state["priority_weights"], state["batch_size"])
+        model.bind(state["seed"])
+        for name, stream_state in state["streams"].items():
+            model.streams[name].restore(stream_state)
+        return model
+
+# Bánh xe hẹn giờ phân cấp: thêm, hủy và lấy các mục tới hạn chỉ tốn O(1) cho mỗi mục,
+# mỗi tầng có 64 ô, ô ở tầng L ứng với 64**L tick
+class TimerWheel:
+    SLOTS = 64
+
+    def __init__(self, resolution=1):
+        self.resolution = resolution  # Độ dài một tick theo thời gian ảo
+        self.current = 0  # Tick đã xử lý gần nhất
+        self._levels = []  # [[{khóa: (tick, mục)} cho từng ô] cho từng tầng]
+        self._where = {}  # {khóa: (tầng, ô)}
+        self._overdue = {}  # Các mục có hạn không sau tick hiện tại, trả về ở lần tiến kế tiếp
+
+    def tick_of(self, deadline):
+        """Tick đầu tiên không sớm hơn thời điểm deadline"""
+        return math.ceil(deadline / self.resolution - 1e-9)
+
+    def add(self, key, deadline, item):
+        """Hẹn giờ cho mục item tại thời điểm ảo deadline (thay thế hẹn giờ cũ cùng khóa)"""
+        self.discard(key)
+        self._insert(key, self.tick_of(deadline), item)
+
+    def _insert(self, key, tick, item):
+        delta = tick - self.current
+        if delta <= 0:
+            self._overdue[key] = (tick, item)
+            self._where[key] = None
+            return
+        level = 0
+        while delta >= self.SLOTS ** (level + 1):
+            level += 1
+        while len(self._levels) <= level:
+            self._levels.append([{} for _ in range(self.SLOTS)])
+        slot = (tick // self.SLOTS ** level) % self.SLOTS
+        self._levels[level][slot][key] = (tick, item)
+        self._where[key] = (level, slot)
+
+    def discard(self, key):
+        """Hủy hẹn giờ của khóa, trả về True nếu có"""
+        if key not in self._where:
+            return False
+        where = self._where.pop(key)
+        if where is None:
+            del self._overdue[key]
+        else:
+            level, slot = where
+            del self._levels[level][slot][key]
+        return True
+
+    def next_tick(self):
+        """Tick sớm nhất cần xử lý (có mục tới hạn hoặc cần hạ tầng), None nếu rỗng"""
+        if self._overdue:
+            return self.current
+        if not self._where:
+            return None
+        # Ô khác rỗng gần nhất của mỗi tầng; tầng cao có thể cần hạ xuống trước ô của tầng thấp
+        earliest = None
+        for level, slots in enumerate(self._levels):
+            span = self.SLOTS ** level
+            base = self.current // span
+            for distance in range(1, self.SLOTS + 1):
+                if slots[(base + distance) % self.SLOTS]:
+                    tick = (base + distance) * span
+                    if earliest is None or tick < earliest:
+                        earliest = tick
+                    break
+        return earliest
+
+    def next_time(self):
+        """Thời điểm ảo của tick sớm nhất cần xử lý, None nếu rỗng"""
+        tick = self.next_tick()
+        return None if tick is None else tick * self.resolution
+
+    def advance(self, now):
+        """Tiến tới thời điểm now, trả về danh sách mục đã tới hạn"""
+        target = math.floor(now / self.resolution + 1e-9)
+        due = [item for _, item in self._overdue.values()]
+        for key in self._overdue:
+            del self._where[key]
+        self._overdue.clear()
+        while True:
+            tick = self.next_tick()
+            if tick is None or tick > target:
+                break
+            self.current = tick
+            # Hạ các mục của tầng cao xuống khi bắt đầu ô mới của tầng đó
+            for level in range(len(self._levels) - 1, 0, -1):
+                span = self.SLOTS ** level
+                if tick % span == 0:
+                    slot = self._levels[level][(tick // span) % self.SLOTS]
+                    entries = list(slot.items())
+                    slot.clear()
+                    for key, (entry_tick, item) in entries:
+                        self._insert(key, entry_tick, item)
+            slot = self._levels[0][tick % self.SLOTS] if self._levels else {}
+            for key, (_, item) in slot.items():
+                del self._where[key]
+                due.append(item)
+            slot.clear()
+            for key, (_, item) in self._overdue.items():
+                del self._where[key]
+                due.append(item)
+            self._overdue.clear()
+        self.current = max(self.current, target)
+        return due
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def __len__(self):
+        return len(self._where)
+
+    def snapshot(self):
+        """Vị trí (tầng, ô, khóa, tick) của mọi mục theo đúng thứ tự lưu, tầng -1 là mục quá hạn"""
+        entries = [(level, slot, key, tick)
+                   for level, slots in enumerate(self._levels)
+                   for slot, items in enumerate(slots)
+                   for key, (tick, _) in items.items()]
+        entries += [(-1, 0, key, tick) for key, (tick, _) in self._overdue.items()]
+        return {"resolution": self.resolution, "current": self.current}, {
+            "level": array("b", [entry[0] for entry in entries]),
+            "slot": array("B", [entry[1] for entry in entries]),
+            "key": array("q", [entry[2] for entry in entries]),
+            "tick": array("q", [entry[3] for entry in entries]),
+        }
+
+    def restore(self, state, arrays, lookup):
+        """Đặt lại các mục vào đúng ô cũ để thứ tự tới hạn không đổi (lookup: khóa -> mục)"""
+        self.resolution = state["resolution"]
+        self.current = state["current"]
+        self._levels, self._where, self._overdue = [], {}, {}
+        for level, slot, key, tick in zip(arrays["level"], arrays["slot"], arrays["key"], arrays["tick"]):
+            if level < 0:
+                self._overdue[key] = (tick, lookup(key))
+                self._where[key] = None
+                continue
+            while len(self._levels) <= level:
+                self._levels.append([{} for _ in range(self.SLOTS)])
+            self._levels[level][slot][key] = (tick, lookup(key))
+            self._where[key] = (level, slot)
+
+# Các loại sự kiện của bộ mô phỏng rời rạc
+class EventType(Enum):
+    DISPATCH = "Cấp CPU"
+    SLICE_END = "Hết time slice"
+    IO_BLOCK = "Chờ I/O"
+    IO_COMPLETE = "Hoàn tất I/O"  # Tiến bánh xe hẹn giờ I/O tới thời điểm hiện tại
+    BALANCE = "Cân bằng tải"
+
+# Bộ mô phỏng sự kiện rời rạc với đồng hồ ảo
+class SimulationEngine:
+    def __init__(self, handler, start_time=None):
+        self.handler = handler  # Hàm xử lý sự kiện: handler(event_type, payload)
+        self.epoch = time.time()  # Thời điểm thực ứng với thời điểm ảo 0
+        self.now = start_time if start_time is not None else 0.0
+        self._events = []  # Heap [thời điểm, số thứ tự, loại sự kiện, dữ liệu kèm theo]
+        self._counter = itertools.count()
+        self.processed = 0  # Số sự kiện đã xử lý, dùng làm vị trí khi ghi và phát lại trace
+
+    def schedule(self, delay, event_type, payload=None, urgent=False):
+        """Lên lịch một sự kiện sau delay đơn vị thời gian ảo (urgent: xử lý trước các sự kiện cùng thời điểm)"""
+        seq = next(self._counter)
+        event = [self.now + delay, -seq if urgent else seq, event_type, payload]
+        heapq.heappush(self._events, event)
+        return event
+
+    def cancel(self, event):
+        """Hủy một sự kiện đã lên lịch"""
+        if event is not None:
+            event[2] = None
+
+    def next_time(self):
+        """Thời điểm của sự kiện kế tiếp, None nếu không còn sự kiện"""
+        events = self._events
+        while events and events[0][2] is None:
+            heapq.heappop(events)
+        return events[0][0] if events else None
+
+    def step(self):
+        """Xử lý một sự kiện và tiến đồng hồ tới thời điểm của nó"""
+        events = self._events
+        while events:
+            event_time, _, event_type, payload = heapq.heappop(events)
+            if event_type is None:
+                continue
+            self.now = event_time
+            self.processed += 1
+            self.handler(event_type, payload)
+            return True
+        return False
+
+    def run(self, until=None, max_events=None):
+        """Xử lý các sự kiện cho tới thời điểm until (None: tới khi hết sự kiện)"""
+        processed = 0
+        while max_events is None or processed < max_events:
+            next_time = self.next_time()
+            if next_time is None or (until is not None and next_time > until):
+                break
+            self.step()
+            processed += 1
+        if until is not None and until > self.now and (max_events is None or processed < max_events):
+            self.now = until
+        return processed
+
+    def pending(self):
+        """Số sự kiện còn trong hàng đợi (kể cả sự kiện đã hủy chưa dọn)"""
+        return len(self._events)
+
+    def snapshot(self, payload_id):
+        """Đồng hồ và các sự kiện chưa hủy; payload_id đổi dữ liệu kèm theo thành số (-1 nếu không có)"""
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        events = [event for event in self._events if event[2] is not None]
+        types = list(EventType)
+        return {"now": self.now, "epoch": self.epoch, "processed": self.processed, "next_seq": next_seq}, {
+            "time": array("d", [event[0] for event in events]),
+            "seq": array("q", [event[1] for event in events]),
+            "type": array("b", [types.index(event[2]) for event in events]),
+            "payload": array("q", [payload_id(event[3]) for event in events]),
+        }
+
+    def restore(self, state, arrays, payload_of):
+        """Dựng lại heap sự kiện, trả về {số thứ tự: sự kiện} để nối lại các tham chiếu"""
+        self.now = state["now"]
+        self.epoch = state["epoch"]
+        self.processed = state["processed"]
+        self._counter = itertools.count(state["next_seq"])
+        types = list(EventType)
+        self._events = [[event_time, seq, types[code], payload_of(payload)] for event_time, seq, code, payload
+                        in zip(arrays["time"], arrays["seq"], arrays["type"], arrays["payload"])]
+        heapq.heapify(self._events)
+        return {event[1]: event for event in self._events}
+
+# Trung bình, phương sai, nhỏ nhất và lớn nhất theo dòng (thuật toán Welford), gộp được
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def merge(self, other):
+        """Gộp thống kê của một luồng khác vào luồng này"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def stdev(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+# Phác thảo phân vị kiểu DDSketch: sai số tương đối cố định, số bucket giới hạn, gộp được
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048, min_value=1e-9):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.min_value = min_value  # Giá trị nhỏ hơn được tính là 0
+        self.buckets = {}  # {chỉ số bucket: số giá trị}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        self.count += count
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        """Gộp các bucket nhỏ nhất để giữ bộ nhớ cố định (chỉ làm mất độ chính xác ở đuôi thấp)"""
+        indexes = sorted(self.buckets)
+        excess = len(indexes) - self.max_buckets
+        merged = sum(self.buckets.pop(i) for i in indexes[:excess])
+        target = indexes[excess]
+        self.buckets[target] += merged
+
+    def merge(self, other):
+        """Gộp một phác thảo khác có cùng độ chính xác"""
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q):
+        """Giá trị ước lượng tại phân vị q (0..1), None nếu rỗng"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+# Một chỉ số theo dòng: trung bình chạy và phân vị p50/p95/p99 với bộ nhớ cố định
+class StreamingMetric:
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.stats.add(value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+
+    def summary(self):
+        result = {
+            "count": self.stats.count,
+            "mean": self.stats.mean if self.stats.count else None,
+            "stdev": self.stats.stdev,
+            "min": self.stats.min,
+            "max": self.stats.max,
+        }
+        for q in self.QUANTILES:
+            result[f"p{int(q * 100)}"] = self.sketch.quantile(q)
+        return result
+
+# Chỉ số lập lịch toàn hệ thống, cập nhật khi tiến trình chuyển trạng thái
+class SchedulerMetrics:
+    def __init__(self):
+        self.turnaround = StreamingMetric()  # Kết thúc - tạo
+        self.response = StreamingMetric()  # Lần đầu được cấp CPU - tạo
+        self.ready_wait = StreamingMetric()  # Tổng thời gian nằm trong hàng đợi ready
+        self.completed = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.io_blocks = 0
+        self.busy_time = 0.0  # Tổng thời gian CPU đã dùng trên mọi lõi
+
+    def process_finished(self, process):
+        """Ghi nhận các chỉ số của một tiến trình vừa kết thúc"""
+        self.completed += 1
+        self.turnaround.add(process.end_time - process.creation_time)
+        if process.start_time is not None:
+            self.response.add(process.start_time - process.creation_time)
+        self.ready_wait.add(process.ready_wait)
+
+    def merge(self, other):
+        """Gộp chỉ số của một lần mô phỏng khác"""
+        for name in ("turnaround", "response", "ready_wait"):
+            getattr(self, name).merge(getattr(other, name))
+        for name in ("completed", "context_switches", "preemptions", "io_blocks", "busy_time"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def snapshot(self):
+        """Toàn bộ trạng thái dạng dict (ghi được bằng JSON) cho checkpoint"""
+        state = {name: getattr(self, name) for name in ("completed", "context_switches", "preemptions", "io_blocks", "busy_time")}
+        for name in ("turnaround", "response", "ready_wait"):
+            metric = getattr(self, name)
+            sketch = dict(vars(metric.sketch), buckets=list(metric.sketch.buckets.items()))
+            state[name] = {"stats": vars(metric.stats), "sketch": sketch}
+        return state
+
+    def restore(self, state):
+        """Khôi phục trạng thái từ snapshot()"""
+        for name in ("completed", "context_switches", "preemptions", "io_blocks", "busy_time"):
+            setattr(self, name, state[name])
+        for name in ("turnaround", "response", "ready_wait"):
+            metric = getattr(self, name)
+            vars(metric.stats).update(state[name]["stats"])
+            vars(metric.sketch).update(state[name]["sketch"])
+            metric.sketch.buckets = {index: count for index, count in state[name]["sketch"]["buckets"]}
+
+    def summary(self, elapsed, num_cpus):
+        """Tóm tắt chỉ số sau elapsed đơn vị thời gian ảo trên num_cpus lõi"""
+        return {
+            "completed": self.completed,
+            "elapsed": elapsed,
+            "throughput": self.completed / elapsed if elapsed > 0 else 0.0,
+            "utilization": self.busy_time / (elapsed * num_cpus) if elapsed > 0 and num_cpus else 0.0,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "io_blocks": self.io_blocks,
+            "turnaround": self.turnaround.summary(),
+            "response": self.response.summary(),
+            "ready_wait": self.ready_wait.summary(),
+        }
+
+def format_metric(label, summary):
+    """Dòng hiển thị trung bình và phân vị của một chỉ số (một mục của SchedulerMetrics.summary)"""
+    if not summary["count"]:
+        return f"{label}: -"
+    return (f"{label}: TB {summary['mean']:.2f} | p50 {summary['p50']:.2f} | "
+            f"p95 {summary['p95']:.2f} | p99 {summary['p99']:.2f}")
+
+# Lịch sử các đoạn chạy trên CPU cho biểu đồ Gantt, bộ nhớ cố định:
+# các đoạn gần nhất nằm trong vòng đệm, đoạn cũ bị đẩy ra được gộp vào các ô thời gian thô
+class GanttHistory:
+    def __init__(self, capacity=100000, coarse_capacity=20000, coarse_width=1.0):
+        self.capacity = capacity
+        self.start = array("d", bytes(8 * capacity))
+        self.end = array("d", bytes(8 * capacity))
+        self.pid = array("q", bytes(8 * capacity))
+        self.cpu = array("h", bytes(2 * capacity))
+        self.total = 0  # Số đoạn đã ghi, cũng là số thứ tự của đoạn kế tiếp
+        self.longest = 0.0  # Độ dài đoạn dài nhất đã ghi
+        self._open = {}  # {pid: (lõi, thời điểm bắt đầu chạy)}
+        # Ô thô: (lõi, ô thời gian) -> thời gian bận, tiến trình chạy lâu nhất trong ô
+        self.coarse_capacity = coarse_capacity
+        self.coarse_width = coarse_width  # Độ rộng một ô, nhân đôi mỗi khi hết chỗ
+        self._coarse = {}  # {(ô thời gian, lõi): [bận, pid, thời gian của pid]}
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def record(self, process, old_state, new_state, now):
+        """Listener của ProcessManager: mở đoạn khi tiến trình được cấp CPU, đóng khi rời CPU"""
+        if new_state is ProcessState.RUNNING:
+            self._open[process.pid] = (process.cpu_id, now)
+        elif old_state is ProcessState.RUNNING:
+            opened = self._open.pop(process.pid, None)
+            if opened is not None and now > opened[1]:
+                self.add(opened[0], process.pid, opened[1], now)
+
+    def add(self, cpu, pid, start, end):
+        """Ghi một đoạn chạy, đẩy đoạn cũ nhất sang ô thô khi vòng đệm đầy"""
+        slot = self.total % self.capacity
+        if self.total >= self.capacity:
+            self._downsample(self.cpu[slot], self.pid[slot], self.start[slot], self.end[slot])
+        self.start[slot] = start
+        self.end[slot] = end
+        self.pid[slot] = pid
+        self.cpu[slot] = cpu
+        self.total += 1
+        if end - start > self.longest:
+            self.longest = end - start
+
+    def _downsample(self, cpu, pid, start, end):
+        """Cộng một đoạn vào các ô thô mà nó trải qua"""
+        width = self.coarse_width
+        bucket = int(start // width)
+        while start < end:
+            stop = min(end, (bucket + 1) * width)
+            cell = self._coarse.get((bucket, cpu))
+            if cell is None:
+                self._coarse[(bucket, cpu)] = [stop - start, pid, stop - start]
+            else:
+                cell[0] += stop - start
+                if stop - start > cell[2]:
+                    cell[1], cell[2] = pid, stop - start
+            start = stop
+            bucket += 1
+        if len(self._coarse) > self.coarse_capacity:
+            self._compact()
+
+    def _compact(self):
+        """Giảm độ phân giải các ô thô một nửa bằng cách gộp từng cặp ô liền nhau"""
+        self.coarse_width *= 2
+        merged = {}
+        for (bucket, cpu), (busy, pid, pid_time) in self._coarse.items():
+            cell = merged.get((bucket // 2, cpu))
+            if cell is None:
+                merged[(bucket // 2, cpu)] = [busy, pid, pid_time]
+            else:
+                cell[0] += busy
+                if pid_time > cell[2]:
+                    cell[1], cell[2] = pid, pid_time
+        self._coarse = merged
+
+    def _first(self):
+        """Số thứ tự của đoạn cũ nhất còn trong vòng đệm"""
+        return max(0, self.total - self.capacity)
+
+    def _segment(self, seq):
+        slot = seq % self.capacity
+        return self.cpu[slot], self.pid[slot], self.start[slot], self.end[slot]
+
+    def _bisect(self, time):
+        """Số thứ tự của đoạn đầu tiên kết thúc không sớm hơn time"""
+        # Các đoạn được ghi theo thời điểm kết thúc tăng dần nên tìm nhị phân được
+        low, high = self._first(), self.total
+        while low < high:
+            middle = (low + high) // 2
+            if self.end[middle % self.capacity] < time:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def segments(self, start, end):
+        """Các đoạn (lõi, pid, bắt đầu, kết thúc) trong vòng đệm giao với [start, end]"""
+        # Đoạn bắt đầu trước end thì kết thúc không muộn hơn end + độ dài đoạn dài nhất
+        for seq in range(self._bisect(start), self._bisect(end + self.longest)):
+            segment = self._segment(seq)
+            if segment[2] <= end:
+                yield segment
+
+    def since(self, seq):
+        """(số thứ tự mới, các đoạn ghi sau seq), None nếu một phần đã bị đẩy khỏi vòng đệm"""
+        if seq < self._first():
+            return None
+        return self.total, [self._segment(s) for s in range(seq, self.total)]
+
+    def coarse(self, start, end):
+        """Các ô thô (lõi, pid chạy lâu nhất, bắt đầu, kết thúc, thời gian bận) giao với [start, end]"""
+        width = self.coarse_width
+        first, last = int(start // width), int(end // width)
+        for (bucket, cpu), (busy, pid, _) in self._coarse.items():
+            if first <= bucket <= last:
+                yield cpu, pid, bucket * width, (bucket + 1) * width, busy
+
+    def running(self):
+        """Các đoạn đang chạy chưa kết thúc: (lõi, pid, bắt đầu)"""
+        return [(cpu, pid, start) for pid, (cpu, start) in self._open.items()]
+
+    def clear(self):
+        self.total = 0
+        self.longest = 0.0
+        self._open.clear()
+        self._coarse.clear()
+
+# Các loại bản ghi trong trace nhị phân
+class TraceKind(IntEnum):
+    HEADER = 0  # pid: seed, value: số tiến trình đã có, code: chế độ bảng gọn, cpu: số lõi, kèm tên chính sách
+    CREATE = 1  # value: thời gian chạy, code: độ ưu tiên, kèm tên tiến trình
+    STATE = 2  # code: trạng thái mới, aux: trạng thái cũ
+    EXPIRE = 3  # Hết quantum, tiến trình về hàng đợi
+    PREEMPT = 4  # Bị tiến trình khác chiếm quyền
+    SET_STATE = 5  # set_process_state từ người dùng, code: trạng thái yêu cầu
+    CONFIG = 6  # code: chỉ số trong TRACE_CONFIG, value: giá trị mới
+    POLICY = 7  # Đổi chính sách, kèm tên chính sách
+    CPUS = 8  # Đổi số lõi, aux: số lõi mới
+    STOP = 9  # Dừng scheduler: các tiến trình đang chạy về hàng đợi
+    END = 10  # Kết thúc trace
+    MODEL = 11  # Mô hình workload (phân phối và vị trí các dòng ngẫu nhiên), kèm JSON của WorkloadModel.snapshot()
+
+# Mỗi bản ghi dài cố định 40 byte: thời điểm, pid, số sự kiện đã xử lý, giá trị, loại, mã, lõi, phụ
+TRACE_RECORD = struct.Struct("<dqqdBBhI")
+TRACE_MAGIC = b"PMTRACE2"
+TRACE_CONFIG = ["time_slice", "io_probability", "wakeup_probability", "tick_length", "balance_interval"]
+# Các loại bản ghi có chuỗi UTF-8 theo sau (aux là số byte, đệm tới bội số độ dài bản ghi)
+TRACE_TEXT_KINDS = {TraceKind.HEADER, TraceKind.CREATE, TraceKind.POLICY, TraceKind.MODEL}
+# Các bản ghi đầu vào cần áp dụng lại khi phát lại
+TRACE_INPUT_KINDS = {TraceKind.CREATE, TraceKind.SET_STATE, TraceKind.CONFIG,
+                     TraceKind.POLICY, TraceKind.CPUS, TraceKind.STOP, TraceKind.MODEL}
+
+TraceRecord = namedtuple("TraceRecord", "time pid seq value kind code cpu aux text")
+
+def _text_blocks(length):
+    """Số bản ghi cần để chứa chuỗi length byte"""
+    return -(-length // TRACE_RECORD.size)
+
+# Ghi trace vào bộ đệm cố định và chỉ ghi ra tệp khi đầy
+class TraceWriter:
+    def __init__(self, path, buffer_records=65536):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(TRACE_MAGIC)
+        self._buffer = bytearray(buffer_records * TRACE_RECORD.size)
+        self._offset = 0
+        self.records = 0
+
+    def record(self, kind, now, pid=0, seq=0, value=0.0, code=0, cpu=-1, aux=0):
+        """Thêm một bản ghi (đường nóng: chỉ pack vào bộ đệm)"""
+        if self._offset == len(self._buffer):
+            self.flush()
+        TRACE_RECORD.pack_into(self._buffer, self._offset, now, pid, seq, value, kind, code, cpu, aux)
+        self._offset += TRACE_RECORD.size
+        self.records += 1
+
+    def record_text(self, kind, now, text, pid=0, seq=0, value=0.0, code=0, cpu=-1):
+        """Thêm một bản ghi kèm chuỗi"""
+        data = text.encode("utf-8")
+        self.record(kind, now, pid, seq, value, code, cpu, len(data))
+        padded = data.ljust(_text_blocks(len(data)) * TRACE_RECORD.size, b"\0")
+        if self._offset + len(padded) > len(self._buffer):
+            self.flush()
+        if len(padded) > len(self._buffer):
+            self.file.write(padded)
+            return
+        self._buffer[self._offset:self._offset + len(padded)] = padded
+        self._offset += len(padded)
+
+    def flush(self):
+        self.file.write(memoryview(self._buffer)[:self._offset])
+        self._offset = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+def read_trace(path, chunk_records=65536):
+    """Đọc trace theo từng khối, trả về lần lượt các TraceRecord (dùng được với tệp rất lớn)"""
+    size = TRACE_RECORD.size
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} không phải tệp trace")
+        pending = b""
+        while True:
+            chunk = f.read(chunk_records * size)
+            if not chunk:
+                break
+            data = pending + chunk
+            usable = len(data) - len(data) % size
+            offset = 0
+            while offset < usable:
+                fields = TRACE_RECORD.unpack_from(data, offset)
+                kind, aux = fields[4], fields[7]
+                text = None
+                if aux and kind in TRACE_TEXT_KINDS:
+                    end = offset + size + _text_blocks(aux) * size
+                    if end > usable:
+                        break  # Chuỗi nằm ở khối kế tiếp
+                    text = data[offset + size:offset + size + aux].decode("utf-8")
+                    offset = end
+                else:
+                    offset += size
+                yield TraceRecord(*fields, text)
+            pending = data[offset:]
+
+# Checkpoint nhị phân của toàn bộ ProcessManager: khung BASE chứa mọi tiến trình, các khung DELTA
+# nối thêm phía sau chỉ chứa tiến trình đã thay đổi. Mỗi khung gồm tiêu đề, JSON trạng thái nhỏ
+# (cấu hình, đồng hồ, RNG, chỉ số) và các mảng nhị phân liền nhau (cột tiến trình, hàng đợi, sự kiện)
+CHECKPOINT_MAGIC = b"PMCKPT02"
+CHECKPOINT_FRAME = struct.Struct("<4sIQ")  # Loại khung, độ dài JSON, độ dài phần mảng
+CHECKPOINT_BASE = b"BASE"
+CHECKPOINT_DELTA = b"DLTA"
+# Các cột tiến trình: (thuộc tính, mã kiểu array), tên lưu riêng thành độ dài + byte UTF-8
+CHECKPOINT_COLUMNS = [
+    ("pid", "q"), ("state", "b"), ("priority", "b"), ("burst_time", "d"), ("remaining_time", "d"),
+    ("creation_time", "d"), ("start_time", "d"), ("end_time", "d"), ("io_deadline", "d"),
+    ("ready_since", "d"), ("ready_wait", "d"), ("cpu_id", "h"), ("waiting_reason", "b"),
+]
+# Cấu hình của ProcessManager được lưu trong checkpoint
+CHECKPOINT_CONFIG = ["time_slice", "io_probability", "wakeup_probability", "tick_interval", "tick_length",
+                     "balance_interval", "events_per_lock", "keep_last", "keep_for"]
+
+def _prefixed(arrays, prefix):
+    """Các mảng có tên bắt đầu bằng prefix, bỏ prefix khỏi tên"""
+    return {name[len(prefix):]: values for name, values in arrays.items() if name.startswith(prefix)}
+
+def _pack_checkpoint(kind, state, arrays):
+    """Các khối byte của một khung checkpoint"""
+    state = dict(state, arrays=[[name, values.typecode, len(values)] for name, values in arrays.items()])
+    text = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    blobs = [values.tobytes() for values in arrays.values()]
+    return [CHECKPOINT_FRAME.pack(kind, len(text), sum(map(len, blobs))), text] + blobs
+
+def read_checkpoint(path):
+    """Đọc lần lượt các khung (loại, trạng thái, {tên: mảng}) của tệp checkpoint"""
+    with open(path, "rb") as f:
+        if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+            raise ValueError(f"{path} không phải tệp checkpoint")
+        while True:
+            header = f.read(CHECKPOINT_FRAME.size)
+            if len(header) < CHECKPOINT_FRAME.size:
+                break  # Khung cuối ghi dở (ví dụ bị ngắt giữa chừng) được bỏ qua
+            kind, text_size, data_size = CHECKPOINT_FRAME.unpack(header)
+            text = f.read(text_size)
+            data = f.read(data_size)
+            if len(text) < text_size or len(data) < data_size:
+                break
+            state = json.loads(text)
+            arrays = {}
+            offset = 0
+            for name, typecode, count in state.pop("arrays"):
+                values = array(typecode)
+                values.frombytes(data[offset:offset + count * values.itemsize])
+                offset += count * values.itemsize
+                arrays[name] = values
+            yield kind, state, arrays
+
+def _merge_checkpoint(path):
+    """Gộp khung BASE cuối cùng với các DELTA sau nó: (trạng thái và mảng khung mới nhất, cột tiến trình, tên, lý do đợi, hàng kho)"""
+    state = last = columns = names = reasons = index = None
+    removed = set()
+    archive = {}
+    for kind, frame_state, arrays in read_checkpoint(path):
+        frame_names = _decode_names(arrays)
+        if kind == CHECKPOINT_BASE:
+            columns = {name: arrays[name] for name, _ in CHECKPOINT_COLUMNS}
+            names, reasons, index = frame_names, list(frame_state["reasons"]), None
+            removed = set()
+            archive = {}
+        elif columns is not None:
+            if index is None:
+                index = {pid: row for row, pid in enumerate(columns["pid"])}
+            # Mã lý do đợi của khung delta được đổi sang danh sách lý do chung
+            codes = []
+            for reason in frame_state["reasons"]:
+                if reason not in reasons:
+                    reasons.append(reason)
+                codes.append(reasons.index(reason))
+            arrays["waiting_reason"] = array("b", [codes[code] for code in arrays["waiting_reason"]])
+            for i, pid in enumerate(arrays["pid"]):
+                row = index.get(pid)
+                if row is None:
+                    index[pid] = len(names)
+                    names.append(frame_names[i])
+                    for name, _ in CHECKPOINT_COLUMNS:
+                        columns[name].append(arrays[name][i])
+                else:
+                    names[row] = frame_names[i]
+                    for name, _ in CHECKPOINT_COLUMNS:
+                        columns[name][row] = arrays[name][i]
+            removed.update(frame_state["removed"])
+        else:
+            continue
+        archive.update((row[0], row) for row in _archive_rows(arrays))
+        state, last = frame_state, arrays
+    if state is None:
+        raise ValueError(f"{path} không có khung BASE")
+    if removed:
+        keep = [row for row, pid in enumerate(columns["pid"]) if pid not in removed]
+        columns = {name: array(values.typecode, map(values.__getitem__, keep)) for name, values in columns.items()}
+        names = [names[row] for row in keep]
+    return state, last, columns, names, reasons, list(archive.values())
+
+def _encode_names(names):
+    """Độ dài (số ký tự) của từng tên và toàn bộ tên nối liền dạng UTF-8"""
+    names = list(names)
+    return {"name_length": array("I", map(len, names)), "name_bytes": array("B", "".join(names).encode("utf-8"))}
+
+def _build_arrays(arrays):
+    """Gọi các hàm dựng mảng đã được hoãn tới khi nhả khóa"""
+    for name, values in arrays.items():
+        if callable(values):
+            arrays[name] = values()
+
+def _merge_rows(rows, fixes, touched):
+    """Thay các hàng đọc ngoài khóa bằng các hàng đọc lại dưới khóa (touched: pid thay đổi trong lúc đọc)"""
+    reasons, columns, names = rows
+    fix_reasons, fix_columns, fix_names = fixes
+    codes = {reason: code for code, reason in enumerate(reasons)}
+    for reason in fix_reasons:
+        if reason not in codes:
+            codes[reason] = len(reasons)
+            reasons.append(reason)
+    remap = [codes[reason] for reason in fix_reasons]
+    fix_columns["waiting_reason"] = array("b", map(remap.__getitem__, fix_columns["waiting_reason"]))
+    
+    index = {pid: row for row, pid in enumerate(columns["pid"]) if pid in touched}
+    stale = set(index.values())  # Hàng của tiến trình đã bị loại trong lúc đọc
+    new = []
+    for fix_row, pid in enumerate(fix_columns["pid"]):
+        row = index.get(pid)
+        if row is None:
+            new.append(fix_row)
+            continue
+        stale.discard(row)
+        for name, values in columns.items():
+            values[row] = fix_columns[name][fix_row]
+    if stale:
+        keep = [row for row in range(len(names)) if row not in stale]
+        columns = {name: array(values.typecode, map(values.__getitem__, keep)) for name, values in columns.items()}
+        names = list(map(names.__getitem__, keep))
+    for name, values in columns.items():
+        values.extend(map(fix_columns[name].__getitem__, new))
+    names.extend(map(fix_names.__getitem__, new))
+    return reasons, columns, names
+
+def _archive_arrays(rows):
+    """Các mảng "archive_*" chứa các hàng của kho lưu trữ trong bộ nhớ"""
+    columns = list(zip(*rows)) or [()] * len(ProcessArchive.COLUMNS)
+    pid, name, priority, burst_time, remaining_time, creation_time, start_time, end_time, ready_wait, cpu_id = columns
+    
+    def times(values):
+        return array("d", [_NO_TIME if value is None else value for value in values])
+    
+    arrays = {
+        "pid": array("q", pid),
+        "priority": array("b", priority),
+        "burst_time": array("d", burst_time),
+        "remaining_time": array("d", remaining_time),
+        "creation_time": array("d", creation_time),
+        "start_time": times(start_time),
+        "end_time": times(end_time),
+        "ready_wait": array("d", ready_wait),
+        "cpu_id": array("h", [-1 if value is None else value for value in cpu_id]),
+    }
+    arrays.update(_encode_names(name))
+    return {f"archive_{key}": values for key, values in arrays.items()}
+
+def _archive_rows(arrays):
+    """Các hàng kho lưu trữ ghi trong một khung checkpoint (rỗng nếu khung không có)"""
+    arrays = _prefixed(arrays, "archive_")
+    if not arrays:
+        return []
+    
+    def optional(values):
+        return [None if value != value else value for value in values]
+    
+    return list(zip(
+        arrays["pid"], _decode_names(arrays), arrays["priority"], arrays["burst_time"], arrays["remaining_time"],
+        arrays["creation_time"], optional(arrays["start_time"]), optional(arrays["end_time"]), arrays["ready_wait"],
+        [None if cpu_id < 0 else cpu_id for cpu_id in arrays["cpu_id"]],
+    ))
+
+def _decode_names(arrays):
+    text = arrays["name_bytes"].tobytes().decode("utf-8")
+    offsets = list(itertools.accumulate(arrays["name_length"], initial=0))
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+# Ghi checkpoint tăng dần vào một tệp: lần đầu ghi khung BASE, các lần sau nối thêm khung DELTA.
+# Khóa của bộ lập lịch chỉ được giữ trong hai lần chụp ngắn: các hàng tiến trình được đọc ngoài khóa,
+# hàng nào thay đổi trong lúc đọc (theo _dirty) được đọc lại ở lần chụp thứ hai;
+# dựng mảng, mã hóa và ghi tệp diễn ra sau khi nhả khóa.
+# Khi các delta lớn hơn rebase_ratio lần khung BASE, tệp được thay bằng một BASE mới
+class Checkpointer:
+    def __init__(self, manager, path, rebase_ratio=1.0):
+        self.manager = manager
+        self.path = path
+        self.rebase_ratio = rebase_ratio
+        self.base_size = 0  # 0: lần ghi kế tiếp là BASE
+        self.delta_size = 0
+        self._lock = threading.Lock()  # Mỗi lúc chỉ ghi một khung
+
+    def checkpoint(self):
+        """Ghi một khung checkpoint, trả về số byte đã ghi"""
+        with self._lock:
+            return self._write_frame()
+
+    def _write_frame(self):
+        manager = self.manager
+        base = not self.base_size or self.delta_size > self.rebase_ratio * self.base_size
+        with manager.scheduler_lock:
+            pids, items = manager._begin_checkpoint(base)
+        try:
+            rows = manager._process_rows(items) if items else None
+            with manager.scheduler_lock:
+                state, arrays, finish = manager._capture_checkpoint(pids, rows)
+            finish()
+            blocks = _pack_checkpoint(CHECKPOINT_BASE if base else CHECKPOINT_DELTA, state, arrays)
+            size = sum(map(len, blocks))
+            if base:
+                # Ghi ra tệp tạm rồi thay thế để tệp cũ vẫn dùng được nếu bị ngắt giữa chừng
+                temp = self.path + ".tmp"
+                with open(temp, "wb") as f:
+                    f.write(CHECKPOINT_MAGIC)
+                    f.writelines(blocks)
+                os.replace(temp, self.path)
+                self.base_size, self.delta_size = size, 0
+            else:
+                with open(self.path, "ab") as f:
+                    f.writelines(blocks)
+                self.delta_size += size
+        except BaseException:
+            # Các thay đổi đã chụp không còn được theo dõi: lần sau phải ghi lại BASE
+            self.base_size = 0
+            raise
+        return size
+
+# Một lõi CPU với hàng đợi ready và vị trí chạy riêng
+class CPU:
+    def __init__(self, cpu_id, policy):
+        self.cpu_id = cpu_id
+        self.policy = policy  # Hàng đợi ready của lõi do chính sách lập lịch quản lý
+        self.running = None
+        self.dispatch_event = None
+        self.slice_event = None
+        self.slice_started = None  # Thời điểm bắt đầu đoạn chạy hiện tại
+        self.dispatched_at = None  # Thời điểm tiến trình hiện tại được cấp CPU
+        self.quantum = None
+        self.busy_time = 0  # Tổng thời gian lõi đã thực thi tiến trình
+        self.last_pid = None  # Tiến trình chạy gần nhất, để đếm số lần chuyển ngữ cảnh
+
+    def load(self):
+        """Số tiến trình đang chạy và đang đợi trên lõi"""
+        return len(self.policy) + (1 if self.running else 0)
+
+CHANGE_QUEUE_LIMIT = 1 << 16  # Số pid thay đổi tối đa chờ giao diện lấy, quá thì giao diện vẽ lại toàn bộ
+
+# Lớp quản lý tiến trình
+class ProcessManager:
+    def __init__(self, seed=None, policy=None, num_cpus=1, compact=False, model=None):
+        # {pid: Process}, hoặc bảng dạng cột khi mô phỏng rất nhiều tiến trình
+        self.processes = ProcessTable() if compact else {}
+        self._pids = itertools.count(1)  # pid của tiến trình mới ở chế độ dict, riêng cho từng manager
+        self.policy_factory = policy if policy is not None else PriorityRoundRobinPolicy
+        self.cpus = [CPU(i, self.policy_factory()) for i in range(num_cpus)]
+        # Chỉ mục theo trạng thái {trạng thái: {pid: Process}}, cập nhật ở mỗi lần chuyển trạng thái
+        self.state_index = {state: {} for state in ProcessState}
+        self._indexed_state = {}  # {pid: trạng thái đang được ghi trong state_index}
+        self.scheduler_running = False
+        self.scheduler_thread = None
+        self.scheduler_lock = threading.Lock()
+        self.update_callback = None
+        self.time_slice = 1  # Time slice mặc định
+        self.io_probability = 0.2  # Xác suất tiến trình cần I/O sau mỗi lượt chạy
+        self.wakeup_probability = 0.3  # Xác suất I/O hoàn tất sau mỗi đơn vị thời gian
+        self.tick_interval = 1.0  # Số giây thực cho mỗi nhịp ở chế độ thời gian thực
+        self.tick_length = 1  # Số đơn vị thời gian ảo cho mỗi nhịp
+        self.balance_interval = 4  # Số đơn vị thời gian ảo giữa hai lần cân bằng tải
+        self.migrations = 0  # Số lần tiến trình chuyển sang lõi khác
+        self.steals = 0  # Số lần lõi rảnh lấy tiến trình từ lõi khác
+        self.balance_runs = 0  # Số lần cân bằng tải định kỳ đã chạy
+        # Luôn có seed cụ thể để trace có thể phát lại đúng lần chạy
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 63)
+        # Mọi biến ngẫu nhiên của lần chạy (thời gian chạy, I/O, lần đến) lấy từ mô hình workload
+        self.model = (model if model is not None else WorkloadModel()).bind(self.seed)
+        self._arrivals = deque()  # (thời điểm đến, tên, độ ưu tiên, thời gian chạy) theo thứ tự thời gian
+        self.engine = SimulationEngine(self._handle_event)
+        self._idle_cpus = set(range(num_cpus))  # Các lõi không chạy và không có tiến trình đợi
+        self._next_cpu = 0  # Lõi tiếp theo nhận tiến trình mới khi không có lõi rảnh
+        self._balance_event = None
+        self.io_timers = TimerWheel(self.tick_length)  # Hạn hoàn tất I/O của các tiến trình đang đợi
+        self._timer_event = None  # Sự kiện tiến bánh xe hẹn giờ kế tiếp
+        # pid thay đổi chờ giao diện lấy, None khi không có giao diện theo dõi (xem watch_changes).
+        # Luồng scheduler chỉ append còn giao diện chỉ popleft, cả hai đều nguyên tử nên không cần khóa
+        self._changes = None
+        self._change_overflows = 0  # Số lần hàng đợi thay đổi đầy và mất pid cũ nhất
+        self._overflows_seen = 0  # _change_overflows ở lần drain_changes() trước
+        self.metrics = SchedulerMetrics()  # Chỉ số lập lịch theo dòng, bộ nhớ cố định
+        self.tracer = None  # TraceWriter khi đang ghi trace
+        self.listeners = []  # Các hàm listener(tiến trình, trạng thái cũ, trạng thái mới, thời điểm)
+        # Chính sách lưu giữ tiến trình đã kết thúc: giữ keep_last tiến trình gần nhất
+        # và/hoặc giữ keep_for đơn vị thời gian ảo; None là giữ mãi
+        self.keep_last = None
+        self.keep_for = None
+        self.archive = None  # ProcessArchive nhận các tiến trình bị loại, None thì bỏ hẳn
+        self.archived = 0  # Số tiến trình đã bị loại khỏi bộ nhớ
+        self._terminated_order = deque()  # pid theo thứ tự kết thúc, khi có chính sách lưu giữ
+        self._retention_due = False
+        self._evicted = None  # pid vừa bị loại chờ giao diện xóa khỏi bảng, None khi không có giao diện theo dõi
+        self.checkpointer = None  # Checkpointer của checkpoint() gần nhất
+        self._dirty = None  # pid thay đổi từ khung checkpoint trước, None khi không ghi checkpoint
+        self.events_per_lock = 1000  # Số sự kiện tối đa xử lý trong một lần giữ khóa
+        # Hàng đợi lệnh từ luồng khác, luồng scheduler áp dụng giữa các nhịp
+        self._commands = deque()
+        self._command_lock = threading.Lock()  # Giữ nhất quán giữa hàng đợi lệnh và cờ scheduler_running
+        self._wakeup = threading.Event()  # Đánh thức luồng scheduler khi có lệnh mới hoặc khi dừng
+        
+    def create_process(self, name, priority=ProcessPriority.MEDIUM, burst_time=None):
+        """Tạo tiến trình mới và thêm vào hàng đợi ready"""
+        with self.scheduler_lock:
+            process = self._new_process(name, priority, burst_time)
+        
+        if self.update_callback:
+            self.update_callback()
+        return process
+    
+    def create_processes(self, specs, batch_size=10000):
+        """Tạo hàng loạt tiến trình từ các bộ (tên, độ ưu tiên, thời gian chạy), trả về số tiến trình đã tạo"""
+        # Mỗi lô chỉ giữ khóa, đưa vào hàng đợi và báo giao diện một lần; specs có thể là generator đọc dần từ tệp
+        specs = iter(specs)
+        created = 0
+        while True:
+            batch = list(itertools.islice(specs, batch_size))
+            if not batch:
+                break
+            with self.scheduler_lock:
+                create = self._create_process
+                self._make_ready_many([create(*spec) for spec in batch])
+            created += len(batch)
+            if self.update_callback:
+                self.update_callback()
+        return created
+    
+    def _new_process(self, name, priority=ProcessPriority.MEDIUM, burst_time=None):
+        """Tạo một tiến trình và đưa vào hàng đợi ready (đã giữ khóa)"""
+        process = self._create_process(name, priority, burst_time)
+        self._make_ready(process)
+        return process
+    
+    def _create_process(self, name, priority=ProcessPriority.MEDIUM, burst_time=None):
+        """Tạo một tiến trình chưa vào hàng đợi (đã giữ khóa)"""
+        if not burst_time:
+            burst_time = self.model.burst_time()
+        if isinstance(self.processes, ProcessTable):
+            process = self.processes.add(name, priority, burst_time, creation_time=self.engine.now)
+        else:
+            process = Process(name, priority, burst_time, creation_time=self.engine.now, pid=next(self._pids))
+            self.processes[process.pid] = process
+        if self.tracer is not None:
+            self.tracer.record_text(TraceKind.CREATE, self.engine.now, process.name, process.pid,
+                                    self.engine.processed, process.burst_time, _PRIORITY_CODE[process.priority])
+        return process
+    
+    def schedule_arrivals(self, specs):
+        """Đưa các bộ (tên, độ ưu tiên, thời gian chạy) vào theo quá trình đến của mô hình workload"""
+        if self.model.interarrival is None:
+            return self.create_processes(specs)
+        count = 0
+        with self.scheduler_lock:
+            arrivals = self._arrivals
+            arrival_time = arrivals[-1][0] if arrivals else self.engine.now
+            interarrival = self.model.interarrival
+            for name, priority, burst_time in specs:
+                arrival_time += interarrival()
+                arrivals.append((arrival_time, name, priority, burst_time))
+                count += 1
+        if self.update_callback:
+            self.update_callback()
+        return count
+    
+    def create_random_processes(self, count, names=None):
+        """Tạo count tiến trình có độ ưu tiên và thời gian chạy rút từ mô hình workload"""
+        with self.scheduler_lock:
+            specs = self.model.random_specs(count, names)
+        return self.schedule_arrivals(specs)
+    
+    def set_model(self, model):
+        """Thay mô hình workload, các dòng ngẫu nhiên được sinh lại từ seed của lần chạy"""
+        with self.scheduler_lock:
+            self.model = model.bind(self.seed)
+            self._trace_model()
+        return True
+    
+    @property
+    def io_duration(self):
+        """Phân phối thời gian chờ I/O của mô hình workload, None: hình học theo wakeup_probability"""
+        return self.model.io_duration
+    
+    @io_duration.setter
+    def io_duration(self, distribution):
+        with self.scheduler_lock:
+            self.model.set_io_duration(distribution)
+            self._trace_model()
+    
+    def _advance(self, until=None, max_events=None):
+        """Chạy engine tới until, tạo các tiến trình đến hạn xen giữa các sự kiện (đã giữ khóa)"""
+        engine = self.engine
+        arrivals = self._arrivals
+        processed = 0
+        while arrivals and (until is None or arrivals[0][0] <= until):
+            arrival_time = arrivals[0][0]
+            processed += engine.run(until=arrival_time,
+                                    max_events=None if max_events is None else max_events - processed)
+            next_time = engine.next_time()
+            if next_time is not None and next_time <= arrival_time:
+                # Hết lượt sự kiện trước thời điểm đến
+                return processed
+            # Tiến trình đến được tạo sau mọi sự kiện cùng thời điểm, như một thao tác từ bên ngoài
+            engine.now = max(engine.now, arrival_time)
+            while arrivals and arrivals[0][0] <= engine.now:
+                _, name, priority, burst_time = arrivals.popleft()
+                self._new_process(name, priority, burst_time)
+        return processed + engine.run(until=until, max_events=None if max_events is None else max_events - processed)
+    
+    def start_scheduler(self):
+        """Bắt đầu luồng lập lịch"""
+        if not self.scheduler_running:
+            self._wakeup.clear()
+            self.scheduler_running = True
+            self.scheduler_thread = threading.Thread(target=self.scheduler_loop)
+            self.scheduler_thread.daemon = True
+            self.scheduler_thread.start()
+            return True
+        return False
+    
+    def stop_scheduler(self):
+        """Dừng luồng lập lịch"""
+        if self.scheduler_running:
+            with self._command_lock:
+                self.scheduler_running = False
+            # Đánh thức luồng scheduler đang chờ nhịp để nó thoát ngay
+            self._wakeup.set()
+            thread = self.scheduler_thread
+            if thread and thread is not threading.current_thread():
+                thread.join()
+            self.scheduler_thread = None
+            # Các lệnh còn trong hàng đợi được áp dụng ngay
+            self._apply_commands()
+            
+            # Đưa các tiến trình đang chạy về trạng thái Ready nếu có
+            with self.scheduler_lock:
+                self._trace_input(TraceKind.STOP)
+                self._preempt_all()
+            
+            if self.update_callback:
+                self.update_callback()
+                
+            return True
+        return False
+    
+    def scheduler_loop(self):
+        """Lớp điều nhịp thời gian thực: mỗi nhịp tiến đồng hồ ảo một tick_length"""
+        while self.scheduler_running:
+            self._apply_commands()
+            
+            # Xử lý sự kiện của nhịp theo từng phần nhỏ để không giữ khóa lâu
+            with self.scheduler_lock:
+                until = self.engine.now + self.tick_length
+            while self.scheduler_running:
+                with self.scheduler_lock:
+                    processed = self._advance(until=until, max_events=self.events_per_lock)
+                if processed < self.events_per_lock:
+                    break
+            with self.scheduler_lock:
+                self._apply_retention()
+            
+            # Cập nhật giao diện
+            if self.update_callback:
+                self.update_callback()
+                
+            # Chờ tới nhịp kế tiếp: lệnh mới được áp dụng ngay, stop_scheduler ngắt việc chờ
+            deadline = time.monotonic() + self.tick_interval
+            while self.scheduler_running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._wakeup.wait(remaining):
+                    self._wakeup.clear()
+                    self._apply_commands()
+    
+    def submit(self, func, *args, **kwargs):
+        """Gửi một lệnh (ví dụ manager.create_process) cho luồng scheduler, trả về Future của kết quả"""
+        from concurrent.futures import Future
+        future = Future()
+        with self._command_lock:
+            if self.scheduler_running:
+                self._commands.append((future, func, args, kwargs))
+                self._wakeup.set()
+                return future
+        # Scheduler không chạy: thực hiện ngay trên luồng gọi
+        self._run_command(future, func, args, kwargs)
+        return future
+    
+    def _apply_commands(self):
+        """Áp dụng lần lượt các lệnh đang chờ (ngoài khóa, mỗi lệnh tự giữ khóa khi cần)"""
+        while True:
+            try:
+                future, func, args, kwargs = self._commands.popleft()
+            except IndexError:
+                return
+            self._run_command(future, func, args, kwargs)
+    
+    def _run_command(self, future, func, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+    
+    def run(self, until=None, max_events=None):
+        """Chạy mô phỏng không giao diện nhanh nhất có thể, trả về số sự kiện đã xử lý"""
+        with self.scheduler_lock:
+            processed = self._advance(until=until, max_events=max_events)
+            self._apply_retention()
+            return processed
+    
+    @property
+    def running_process(self):
+        """Tiến trình đang chạy trên lõi đầu tiên đang bận (tương thích với mô hình một CPU)"""
+        return next((cpu.running for cpu in self.cpus if cpu.running), None)
+    
+    def get_running_processes(self):
+        """Trả về danh sách tiến trình đang chạy trên các lõi"""
+        return [cpu.running for cpu in self.cpus if cpu.running]
+    
+    def set_policy(self, policy_factory):
+        """Đổi chính sách lập lịch, chuyển các tiến trình đang đợi sang chính sách mới"""
+        with self.scheduler_lock:
+            self.policy_factory = policy_factory
+            for cpu in self.cpus:
+                old_policy = cpu.policy
+                cpu.policy = policy_factory()
+                while old_policy:
+                    cpu.policy.add(old_policy.pop())
+                if cpu.running:
+                    cpu.quantum = cpu.policy.quantum(cpu.running, self.time_slice)
+            if self.tracer is not None:
+                self.tracer.record_text(TraceKind.POLICY, self.engine.now, self.cpus[0].policy.name,
+                                        seq=self.engine.processed)
+        return True
+    
+    def set_cpu_count(self, num_cpus):
+        """Thay đổi số lõi CPU, chuyển tiến trình của các lõi bị bỏ sang lõi còn lại"""
+        if num_cpus <= 0:
+            return False
+        with self.scheduler_lock:
+            self._trace_input(TraceKind.CPUS, aux=num_cpus)
+            while len(self.cpus) < num_cpus:
+                cpu = CPU(len(self.cpus), self.policy_factory())
+                self.cpus.append(cpu)
+                self._idle_cpus.add(cpu.cpu_id)
+            removed = self.cpus[num_cpus:]
+            del self.cpus[num_cpus:]
+            self._next_cpu %= num_cpus
+            for cpu in removed:
+                if cpu.running:
+                    self._preempt_running(cpu)
+                self.engine.cancel(cpu.dispatch_event)
+            # Bỏ mọi lõi bị xóa khỏi tập lõi rảnh trước khi phân phối lại tiến trình
+            self._idle_cpus.difference_update(cpu.cpu_id for cpu in removed)
+            for cpu in removed:
+                while cpu.policy:
+                    self._make_ready(cpu.policy.pop(), source=cpu)
+            self._schedule_balance()
+        
+        if self.update_callback:
+            self.update_callback()
+        return True
+    
+    def _has_ready(self):
+        """True nếu có tiến trình trong hàng đợi của bất kỳ lõi nào"""
+        return any(cpu.policy for cpu in self.cpus)
+    
+    def _request_dispatch(self, cpu):
+        """Lên lịch cấp CPU nếu lõi rảnh và có tiến trình sẵn sàng"""
+        if cpu.running is None and cpu.dispatch_event is None and (cpu.policy or self._has_ready()):
+            cpu.dispatch_event = self.engine.schedule(0, EventType.DISPATCH, cpu)
+    
+    def _schedule_balance(self):
+        """Lên lịch cân bằng tải định kỳ khi có nhiều lõi và còn tiến trình"""
+        if len(self.cpus) > 1 and self._balance_event is None and self._has_ready():
+            self._balance_event = self.engine.schedule(self.balance_interval, EventType.BALANCE)
+    
+    def _select_cpu(self, process):
+        """Chọn lõi cho tiến trình sẵn sàng: ưu tiên lõi cũ nếu rảnh, sau đó lõi rảnh bất kỳ"""
+        cpu_id = process.cpu_id
+        if cpu_id is not None and cpu_id in self._idle_cpus:
+            return self.cpus[cpu_id]
+        if self._idle_cpus:
+            return self.cpus[min(self._idle_cpus)]
+        if cpu_id is not None and cpu_id < len(self.cpus):
+            return self.cpus[cpu_id]
+        cpu = self.cpus[self._next_cpu]
+        self._next_cpu = (self._next_cpu + 1) % len(self.cpus)
+        return cpu
+    
+    def _place(self, cpu, process):
+        """Ghi nhận lõi chứa tiến trình, đếm số lần di chuyển giữa các lõi"""
+        if process.cpu_id is not None and process.cpu_id != cpu.cpu_id:
+            self.migrations += 1
+        process.cpu_id = cpu.cpu_id
+        if self._dirty is not None:
+            self._dirty.add(process.pid)
+    
+    def _make_ready(self, process, source=None):
+        """Đưa tiến trình vào hàng đợi ready, chiếm quyền CPU nếu chính sách yêu cầu"""
+        cpu = self._select_cpu(process)
+        if source is None and process.cpu_id is not None and process.cpu_id < len(self.cpus):
+            source = self.cpus[process.cpu_id]
+        if source is not None:
+            self._carry_policy_state(source, cpu, process)
+        self._place(cpu, process)
+        cpu.policy.add(process)
+        self._idle_cpus.discard(cpu.cpu_id)
+        self._touch(process)
+        running = cpu.running
+        if running is not None and cpu.policy.preemptive:
+            self._account_running(cpu)
+            if running.state == ProcessState.TERMINATED:
+                self._finish_running(cpu)
+            elif cpu.policy.should_preempt(running, process):
+                self.metrics.preemptions += 1
+                if self.tracer is not None:
+                    self._trace_process(TraceKind.PREEMPT, running, aux=process.pid)
+                self._preempt_running(cpu)
+        self._request_dispatch(cpu)
+        self._schedule_balance()
+    
+    def _make_ready_many(self, processes):
+        """Đưa một lô tiến trình mới tạo vào hàng đợi ready: mỗi lõi nhận lô của nó một lần (đã giữ khóa)"""
+        batches = {}
+        for process in processes:
+            cpu = self._select_cpu(process)
+            self._place(cpu, process)
+            self._idle_cpus.discard(cpu.cpu_id)
+            batches.setdefault(cpu, []).append(process)
+        self._touch_many(processes)
+        for cpu, batch in batches.items():
+            policy = cpu.policy
+            policy.add_many(batch)
+            running = cpu.running
+            if running is not None and policy.preemptive:
+                self._account_running(cpu)
+                if running.state == ProcessState.TERMINATED:
+                    self._finish_running(cpu)
+                else:
+                    first = next((i for i, p in enumerate(batch) if policy.should_preempt(running, p)), None)
+                    if first is not None:
+                        # Như khi thêm từng tiến trình: tiến trình bị chiếm xếp sau tiến trình chiếm quyền
+                        # nhưng trước phần còn lại của lô
+                        rest = batch[first + 1:]
+                        for process in rest:
+                            policy.remove(process)
+                        self.metrics.preemptions += 1
+                        if self.tracer is not None:
+                            self._trace_process(TraceKind.PREEMPT, running, aux=batch[first].pid)
+                        self._preempt_running(cpu)
+                        if rest:
+                            policy.add_many(rest)
+            self._request_dispatch(cpu)
+        self._schedule_balance()
+    
+    def _dequeue(self, process):
+        """Xóa tiến trình khỏi hàng đợi ready của lõi đang chứa nó"""
+        if process.cpu_id is not None and process.cpu_id < len(self.cpus):
+            return self.cpus[process.cpu_id].policy.remove(process)
+        return False
+    
+    def _steal(self, cpu):
+        """Lõi rảnh lấy một tiến trình từ hàng đợi dài nhất của lõi khác"""
+        victim = max(self.cpus, key=lambda c: len(c.policy))
+        if victim is cpu or not victim.policy:
+            return None
+        self.steals += 1
+        process = victim.policy.pop()
+        self._carry_policy_state(victim, cpu, process)
+        return process
+    
+    def _carry_policy_state(self, source, target, process):
+        """Chuyển dữ liệu riêng của tiến trình (mức MLFQ, vruntime) sang chính sách của lõi mới"""
+        if source is not target:
+            target.policy.import_state(process, source.policy.export_state(process))
+    
+    def _run_process(self, cpu, process):
+        """Đưa tiến trình lên lõi và lên lịch đoạn chạy đầu tiên"""
+        now = self.engine.now
+        self._place(cpu, process)
+        process.start(now)
+        if cpu.last_pid != process.pid:
+            self.metrics.context_switches += 1
+            cpu.last_pid = process.pid
+        cpu.running = process
+        self._idle_cpus.discard(cpu.cpu_id)
+        self._touch(process)
+        cpu.dispatched_at = now
+        cpu.quantum = cpu.policy.quantum(process, self.time_slice)
+        self._schedule_segment(cpu)
+    
+    def _schedule_segment(self, cpu):
+        """Lên lịch sự kiện kết thúc đoạn chạy kế tiếp (tối đa một time slice)"""
+        now = self.engine.now
+        process = cpu.running
+        cpu.slice_started = now
+        run_time = min(self.time_slice, process.remaining_time)
+        if cpu.quantum is not None:
+            run_time = min(run_time, cpu.quantum - (now - cpu.dispatched_at))
+        if run_time < process.remaining_time and self.model.uniform() < self.io_probability:
+            # Tiến trình sẽ cần I/O sau đoạn chạy này
+            cpu.slice_event = self.engine.schedule(run_time, EventType.IO_BLOCK, cpu)
+        else:
+            cpu.slice_event = self.engine.schedule(run_time, EventType.SLICE_END, cpu)
+    
+    def _account_running(self, cpu):
+        """Ghi nhận phần thời gian tiến trình đang chạy đã thực thi tới thời điểm hiện tại"""
+        now = self.engine.now
+        ran = cpu.running.execute(now - cpu.slice_started, now)
+        cpu.slice_started = now
+        if ran:
+            self._touch(cpu.running)
+            cpu.busy_time += ran
+            self.metrics.busy_time += ran
+            cpu.policy.account(cpu.running, ran)
+    
+    def _release_cpu(self, cpu):
+        """Giải phóng lõi và lên lịch cấp CPU cho tiến trình kế tiếp"""
+        process = cpu.running
+        self._touch(process)
+        self.engine.cancel(cpu.slice_event)
+        cpu.slice_event = None
+        cpu.running = None
+        if not cpu.policy:
+            self._idle_cpus.add(cpu.cpu_id)
+        self._request_dispatch(cpu)
+        return process
+    
+    def _finish_running(self, cpu):
+        """Giải phóng lõi của tiến trình đang chạy vừa kết thúc"""
+        process = self._release_cpu(cpu)
+        cpu.policy.forget(process)
+    
+    def _preempt_running(self, cpu, requeue=True):
+        """Thu hồi lõi của tiến trình đang chạy, tính phần thời gian đã thực thi"""
+        process = cpu.running
+        self._account_running(cpu)
+        if process.state == ProcessState.TERMINATED:
+            self._finish_running(cpu)
+            return process
+        if requeue:
+            process.state = ProcessState.READY
+            cpu.policy.requeue(process, expired=False)
+        self._release_cpu(cpu)
+        return process
+    
+    def _io_deadline(self):
+        """Lấy mẫu thời điểm I/O hoàn tất cho tiến trình bắt đầu đợi từ bây giờ"""
+        return self.engine.now + self.model.io_time(self.wakeup_probability, self.tick_length)
+    
+    def _block_for_io(self, process):
+        """Đưa tiến trình vào danh sách đợi và hẹn giờ tại hạn hoàn tất I/O của nó"""
+        self._touch(process)
+        self.metrics.io_blocks += 1
+        if process.io_deadline is None:
+            process.io_deadline = self._io_deadline()
+        self.io_timers.add(process.pid, process.io_deadline, process)
+        self._schedule_timer()
+    
+    def _schedule_timer(self):
+        """Giữ đúng một sự kiện tiến bánh xe hẹn giờ tại tick sớm nhất cần xử lý"""
+        next_time = self.io_timers.next_time()
+        event = self._timer_event
+        if event is not None and event[2] is not None and event[0] == next_time:
+            return
+        self.engine.cancel(event)
+        self._timer_event = None
+        if next_time is not None:
+            # I/O hoàn tất được xử lý trước các sự kiện khác cùng thời điểm, như một ngắt
+            self._timer_event = self.engine.schedule(max(0, next_time - self.engine.now),
+                                                     EventType.IO_COMPLETE, urgent=True)
+    
+    def _balance(self):
+        """Chuyển tiến trình từ lõi tải cao nhất sang lõi tải thấp nhất cho tới khi cân bằng"""
+        self.balance_runs += 1
+        cpus = sorted(self.cpus, key=CPU.load)
+        low, high = 0, len(cpus) - 1
+        while low < high:
+            source, target = cpus[high], cpus[low]
+            if source.load() - target.load() <= 1 or not source.policy:
+                high -= 1
+                continue
+            process = source.policy.pop()
+            self._carry_policy_state(source, target, process)
+            self._place(target, process)
+            target.policy.add(process)
+            self._idle_cpus.discard(target.cpu_id)
+            self._request_dispatch(target)
+            if target.load() >= source.load() - 1:
+                low += 1
+    
+    def _handle_event(self, event_type, payload):
+        """Xử lý một sự kiện của bộ mô phỏng"""
+        if self._retention_due:
+            # Loại tiến trình giữa hai sự kiện, khi không còn bước xử lý nào đang dùng chúng
+            self._apply_retention()
+        if event_type == EventType.DISPATCH:
+            cpu = payload
+            cpu.dispatch_event = None
+            if cpu.running is None:
+                process = cpu.policy.pop() if cpu.policy else self._steal(cpu)
+                if process is not None:
+                    self._run_process(cpu, process)
+                else:
+                    self._idle_cpus.add(cpu.cpu_id)
+                
+        elif event_type == EventType.SLICE_END:
+            cpu = payload
+            process = cpu.running
+            cpu.slice_event = None
+            self._account_running(cpu)
+            if process.state == ProcessState.TERMINATED:
+                self._finish_running(cpu)
+            elif cpu.quantum is not None and self.engine.now - cpu.dispatched_at >= cpu.quantum - 1e-9:
+                # Hết quantum: đưa tiến trình về hàng đợi theo chính sách
+                self.metrics.preemptions += 1
+                if self.tracer is not None:
+                    self._trace_process(TraceKind.EXPIRE, process)
+                process.state = ProcessState.READY
+                cpu.policy.requeue(process, expired=True)
+                self._release_cpu(cpu)
+            else:
+                self._schedule_segment(cpu)
+            
+        elif event_type == EventType.IO_BLOCK:
+            cpu = payload
+            process = cpu.running
+            cpu.slice_event = None
+            self._account_running(cpu)
+            process.wait("I/O Operation", deadline=self._io_deadline())
+            self._release_cpu(cpu)
+            self._block_for_io(process)
+            
+        elif event_type == EventType.IO_COMPLETE:
+            self._timer_event = None
+            # Chỉ các tiến trình thực sự tới hạn được lấy ra khỏi bánh xe hẹn giờ
+            for process in self.io_timers.advance(self.engine.now):
+                if process.resume():
+                    self._make_ready(process)
+            self._schedule_timer()
+                
+        elif event_type == EventType.BALANCE:
+            self._balance_event = None
+            self._balance()
+            self._schedule_balance()
+    
+    def set_process_state(self, pid, new_state):
+        """Thay đổi trạng thái của một tiến trình theo ID"""
+        if pid not in self.processes:
+            return False
+            
+        process = self.processes[pid]
+        
+        with self.scheduler_lock:
+            self._trace_input(TraceKind.SET_STATE, pid, code=_STATE_CODE[new_state])
+            if process.state == ProcessState.TERMINATED:
+                # Tiến trình đã kết thúc không thể chuyển sang trạng thái khác
+                return new_state == ProcessState.TERMINATED
+            
+            cpu = self._cpu_of(process)
+                
+            if new_state == ProcessState.RUNNING:
+                if process.state != ProcessState.RUNNING:
+                    # Xóa tiến trình khỏi các hàng đợi khác nếu có
+                    self._dequeue(process)
+                    if process.state == ProcessState.WAITING:
+                        self._cancel_io(process)
+                        process.resume()
+                    
+                    # Chạy trên lõi cũ, hoặc lõi rảnh, hoặc lõi đầu tiên
+                    if cpu is None:
+                        cpu = self.cpus[min(self._idle_cpus)] if self._idle_cpus else self.cpus[0]
+                    if cpu.running:
+                        # Nếu lõi đang chạy tiến trình khác, đưa tiến trình đó về ready
+                        self._preempt_running(cpu)
+                        
+                    self._run_process(cpu, process)
+                
+            elif new_state == ProcessState.READY:
+                # Đưa tiến trình vào hàng đợi ready
+                if process.state == ProcessState.WAITING:
+                    self._cancel_io(process)
+                    process.resume()
+                    self._make_ready(process)
+                elif process.state == ProcessState.RUNNING:
+                    self._preempt_running(cpu)
+                    
+            elif new_state == ProcessState.WAITING:
+                if process.state == ProcessState.RUNNING:
+                    self._preempt_running(cpu, requeue=False)
+                    process.wait()
+                elif process.state == ProcessState.READY:
+                    self._dequeue(process)
+                    process.state = ProcessState.WAITING  # Đảm bảo trạng thái được cập nhật
+                    process.waiting_reason = "User Request"
+                    
+                if process.state == ProcessState.WAITING and process.pid not in self.io_timers:
+                    self._block_for_io(process)
+                    
+            elif new_state == ProcessState.TERMINATED:
+                # Xóa tiến trình khỏi tất cả các hàng đợi
+                if process.state == ProcessState.RUNNING:
+                    self._preempt_running(cpu, requeue=False)
+                    
+                self._dequeue(process)
+                if cpu is not None:
+                    cpu.policy.forget(process)
+                self._cancel_io(process)
+                
+                process.terminate(self.engine.now)
+                    
+            self._touch(process)
+        
+        # Cập nhật giao diện
+        if self.update_callback:
+            self.update_callback()
+            
+        return True
+    
+    def _cpu_of(self, process):
+        """Lõi đang chứa hoặc vừa chạy tiến trình, None nếu chưa có"""
+        if process.cpu_id is not None and process.cpu_id < len(self.cpus):
+            return self.cpus[process.cpu_id]
+        return None
+    
+    def _cancel_io(self, process):
+        """Hủy chờ I/O của tiến trình và xóa khỏi danh sách đợi"""
+        if self.io_timers.discard(process.pid):
+            self._schedule_timer()
+    
+    def _touch(self, process):
+        """Ghi nhận tiến trình vừa thay đổi: cập nhật chỉ mục trạng thái và hàng đợi thay đổi"""
+        pid = process.pid
+        state = process.state
+        old_state = self._indexed_state.get(pid)
+        if old_state is not state:
+            if old_state is not None:
+                del self.state_index[old_state][pid]
+            self.state_index[state][pid] = process
+            self._indexed_state[pid] = state
+            self._record_transition(process, old_state, state)
+        changes = self._changes
+        if changes is not None:
+            if len(changes) == changes.maxlen:
+                self._change_overflows += 1
+            changes.append(pid)
+        if self._dirty is not None:
+            self._dirty.add(pid)
+    
+    def _touch_many(self, processes):
+        """Như _touch cho một lô tiến trình, hàng đợi thay đổi được cập nhật một lần"""
+        index = self.state_index
+        indexed = self._indexed_state
+        for process in processes:
+            pid = process.pid
+            state = process.state
+            old_state = indexed.get(pid)
+            if old_state is not state:
+                if old_state is not None:
+                    del index[old_state][pid]
+                index[state][pid] = process
+                indexed[pid] = state
+                self._record_transition(process, old_state, state)
+        pids = [process.pid for process in processes]
+        changes = self._changes
+        if changes is not None:
+            # Mỗi pid đẩy ra một pid cũ khi hàng đợi đã đầy, giống như các lần append của _touch
+            self._change_overflows += max(0, len(changes) + len(pids) - changes.maxlen)
+            changes.extend(pids)
+        if self._dirty is not None:
+            self._dirty.update(pids)
+    
+    def _record_transition(self, process, old_state, state):
+        """Cập nhật thời gian chờ ready và chỉ số khi tiến trình kết thúc"""
+        now = self.engine.now
+        if old_state is ProcessState.READY and process.ready_since is not None:
+            process.ready_wait += now - process.ready_since
+            process.ready_since = None
+        if state is ProcessState.READY:
+            process.ready_since = now
+        elif state is ProcessState.TERMINATED:
+            self.metrics.process_finished(process)
+            if self.keep_last is not None or self.keep_for is not None:
+                self._terminated_order.append(process.pid)
+                self._retention_due = True
+        if self.tracer is not None:
+            self._trace_process(TraceKind.STATE, process, code=_STATE_CODE[state],
+                                aux=_STATE_CODE[old_state] if old_state is not None else 255)
+        for listener in self.listeners:
+            listener(process, old_state, state, now)
+    
+    def _trace_process(self, kind, process, code=0, aux=0):
+        """Ghi một bản ghi trace về tiến trình: thời gian còn lại và lõi hiện tại"""
+        cpu_id = process.cpu_id
+        self.tracer.record(kind, self.engine.now, process.pid, self.engine.processed,
+                           process.remaining_time, code, -1 if cpu_id is None else cpu_id, aux)
+    
+    def _trace_input(self, kind, pid=0, value=0.0, code=0, aux=0):
+        """Ghi một thao tác từ bên ngoài tại vị trí hiện tại của bộ mô phỏng"""
+        if self.tracer is not None:
+            self.tracer.record(kind, self.engine.now, pid, self.engine.processed, value, code, -1, aux)
+    
+    def _preempt_all(self):
+        """Đưa mọi tiến trình đang chạy về hàng đợi ready"""
+        for cpu in self.cpus:
+            if cpu.running:
+                self._preempt_running(cpu)
+    
+    def start_trace(self, path):
+        """Bắt đầu ghi trace nhị phân của mọi chuyển trạng thái vào tệp path"""
+        with self.scheduler_lock:
+            if self.tracer is not None:
+                self.tracer.close()
+            self.tracer = TraceWriter(path)
+            self.tracer.record_text(TraceKind.HEADER, self.engine.now, self.cpus[0].policy.name, self.seed,
+                                    self.engine.processed, len(self.processes), code=1 if isinstance(self.processes, ProcessTable) else 0,
+                                    cpu=len(self.cpus))
+            for code, name in enumerate(TRACE_CONFIG):
+                self._trace_input(TraceKind.CONFIG, value=getattr(self, name), code=code)
+            self._trace_model()
+            return self.tracer
+    
+    def _trace_model(self):
+        """Ghi trạng thái mô hình workload vào trace để lần phát lại rút đúng các giá trị ngẫu nhiên"""
+        if self.tracer is not None:
+            self.tracer.record_text(TraceKind.MODEL, self.engine.now, json.dumps(self.model.snapshot()),
+                                    seq=self.engine.processed)
+    
+    def stop_trace(self):
+        """Kết thúc và đóng trace đang ghi"""
+        with self.scheduler_lock:
+            if self.tracer is None:
+                return False
+            self._trace_input(TraceKind.END)
+            self.tracer.close()
+            self.tracer = None
+            return True
+            
+    @property
+    def waiting_processes(self):
+        """Danh sách tiến trình đang đợi"""
+        return list(self.state_index[ProcessState.WAITING].values())
+        
+    @property
+    def terminated_processes(self):
+        """Danh sách tiến trình đã kết thúc"""
+        return list(self.state_index[ProcessState.TERMINATED].values())
+        
+    def get_processes_by_state(self, state):
+        """Trả về danh sách tiến trình ở một trạng thái"""
+        with self.scheduler_lock:
+            return list(self.state_index[state].values())
+            
+    def count_processes(self, state):
+        """Số tiến trình ở một trạng thái (O(1))"""
+        return len(self.state_index[state])
+            
+    def watch_changes(self):
+        """Bắt đầu ghi nhận các tiến trình thay đổi và bị loại cho drain_changes()/drain_evicted() (giao diện gọi một lần)"""
+        with self.scheduler_lock:
+            if self._changes is None:
+                self._changes = deque(maxlen=CHANGE_QUEUE_LIMIT)
+                self._evicted = deque()
+    
+    def drain_changes(self):
+        """Trả về các tiến trình đã thay đổi kể từ lần gọi trước, không giữ khóa scheduler"""
+        changes = self._changes
+        if changes is None:
+            return []
+        # Đọc số lần tràn trước khi lấy: lần tràn xảy ra trong lúc lấy sẽ được thấy ở lần gọi sau
+        overflows = self._change_overflows
+        changed = {changes.popleft() for _ in range(len(changes))}
+        processes = self.processes
+        if overflows != self._overflows_seen:
+            self._overflows_seen = overflows
+            # Đã mất một số thay đổi: trả về mọi tiến trình để giao diện cập nhật lại toàn bộ
+            return list(processes.values())
+        return [process for process in map(processes.get, changed) if process is not None]
+            
+    def get_all_processes(self):
+        """Trả về danh sách tất cả các tiến trình còn trong bộ nhớ"""
+        return list(self.processes.values())
+        
+    def get_process_by_pid(self, pid):
+        """Trả về tiến trình theo ID, tìm trong kho lưu trữ nếu đã bị loại khỏi bộ nhớ"""
+        process = self.processes.get(pid)
+        if process is None and self.archive is not None:
+            process = self.archive.get(pid)
+        return process
+        
+    def get_process_counts(self):
+        """Trả về số lượng tiến trình theo từng trạng thái và mức chiếm dụng của từng lõi"""
+        with self.scheduler_lock:
+            index = self.state_index
+            return {
+                "total": len(self.processes),
+                "ready": len(index[ProcessState.READY]),
+                "running": len(index[ProcessState.RUNNING]),
+                "waiting": len(index[ProcessState.WAITING]),
+                "terminated": len(index[ProcessState.TERMINATED]),
+                "cpus": [{
+                    "cpu": cpu.cpu_id,
+                    "running": cpu.running.pid if cpu.running else None,
+                    "queued": len(cpu.policy),
+                } for cpu in self.cpus],
+                "migrations": self.migrations,
+                "steals": self.steals,
+                "archived": self.archived,
+                "arriving": len(self._arrivals),
+            }
+    
+    def get_metrics(self):
+        """Tóm tắt chỉ số lập lịch: thông lượng, mức dùng CPU, số lần chuyển ngữ cảnh và phân vị thời gian"""
+        with self.scheduler_lock:
+            return self.metrics.summary(self.engine.now, len(self.cpus))
+    
+    def get_process_metrics(self, pid):
+        """Chỉ số của một tiến trình, None nếu không tồn tại"""
+        process = self.get_process_by_pid(pid)
+        if process is None:
+            return None
+        with self.scheduler_lock:
+            now = self.engine.now
+            ready_wait = process.ready_wait
+            if process.ready_since is not None:
+                ready_wait += now - process.ready_since
+            return {
+                "pid": process.pid,
+                "turnaround": process.end_time - process.creation_time if process.end_time is not None else None,
+                "response": process.start_time - process.creation_time if process.start_time is not None else None,
+                "ready_wait": ready_wait,
+                "cpu_time": process.burst_time - process.remaining_time,
+            }
+    
+    def reset_metrics(self):
+        """Xóa các chỉ số đã tích lũy"""
+        with self.scheduler_lock:
+            self.metrics = SchedulerMetrics()
+    
+    def set_retention(self, keep_last=None, keep_for=None, archive=None):
+        """Giới hạn số tiến trình đã kết thúc giữ trong bộ nhớ (archive: ProcessArchive hoặc đường dẫn SQLite)"""
+        if isinstance(self.processes, ProcessTable):
+            raise ValueError("Bảng gọn không hỗ trợ loại bỏ tiến trình")
+        if isinstance(archive, str):
+            archive = ProcessArchive(archive)
+        with self.scheduler_lock:
+            self.keep_last = keep_last
+            self.keep_for = keep_for
+            if archive is not self.archive and self.checkpointer is not None:
+                self.checkpointer.base_size = 0  # Kho đổi: khung kế tiếp ghi lại toàn bộ
+            self.archive = archive
+            # Các tiến trình đã kết thúc trước đó được xếp theo thời điểm kết thúc
+            terminated = sorted(self.state_index[ProcessState.TERMINATED].values(), key=lambda p: (p.end_time, p.pid))
+            self._terminated_order = deque(p.pid for p in terminated)
+            self._apply_retention()
+    
+    def _apply_retention(self):
+        """Chuyển các tiến trình đã kết thúc vượt chính sách lưu giữ sang kho lưu trữ (đã giữ khóa)"""
+        self._retention_due = False
+        order = self._terminated_order
+        if not order:
+            return
+        keep_last = self.keep_last if self.keep_last is not None else len(order)
+        cutoff = self.engine.now - self.keep_for if self.keep_for is not None else None
+        processes = self.processes
+        terminated = self.state_index[ProcessState.TERMINATED]
+        evicted = []
+        while order and (len(order) > keep_last or (cutoff is not None and processes[order[0]].end_time < cutoff)):
+            pid = order.popleft()
+            evicted.append(processes.pop(pid))
+            del terminated[pid]
+            del self._indexed_state[pid]
+        if evicted:
+            self.archived += len(evicted)
+            if self.archive is not None:
+                self.archive.add_many(evicted)
+            if self._evicted is not None:
+                self._evicted.extend(p.pid for p in evicted)
+            if self._dirty is not None:
+                # Khung checkpoint kế tiếp phải ghi các pid này là đã bị xóa
+                self._dirty.update(p.pid for p in evicted)
+    
+    def checkpoint(self, path):
+        """Ghi checkpoint vào path: lần đầu đầy đủ, các lần sau chỉ nối thêm phần thay đổi"""
+        with self.scheduler_lock:
+            if self.checkpointer is None or self.checkpointer.path != path:
+                self.checkpointer = Checkpointer(self, path)
+            checkpointer = self.checkpointer
+        return checkpointer.checkpoint()
+    
+    def checkpoint_in_background(self, path):
+        """Ghi checkpoint trên một luồng riêng, trả về Future của số byte đã ghi"""
+        from concurrent.futures import Future
+        future = Future()
+        threading.Thread(target=self._run_command, args=(future, self.checkpoint, (path,), {}), daemon=True).start()
+        return future
+    
+    def _begin_checkpoint(self, base):
+        """Bắt đầu một khung checkpoint (đã giữ khóa), trả về (pid cần ghi hoặc None: tất cả, tiến trình đọc ngoài khóa)"""
+        for cpu in self.cpus:
+            if cpu.policy.name not in SCHEDULING_POLICIES:
+                raise ValueError(f"Chính sách {cpu.policy.name} không hỗ trợ checkpoint")
+        pids = None if base or self._dirty is None else sorted(self._dirty)
+        # Từ đây mọi thay đổi được ghi vào _dirty để đọc lại ở _capture_checkpoint
+        self._dirty = set()
+        processes = self.processes
+        if isinstance(processes, ProcessTable):
+            return pids, []  # Bảng gọn chép nguyên cột dưới khóa, chỉ tốn vài memcpy
+        items = list(processes.values()) if pids is None else [processes[pid] for pid in pids if pid in processes]
+        return pids, items
+    
+    def _capture_checkpoint(self, pids, rows):
+        """Chụp trạng thái cho một khung checkpoint (đã giữ khóa), trả về (trạng thái, {tên: mảng}, hàm gọi sau khi nhả khóa)"""
+        processes = self.processes
+        touched = self._dirty  # Thay đổi kể từ _begin_checkpoint
+        self._dirty = set()
+        changed = touched if pids is None else touched.union(pids)
+        removed = sorted(pid for pid in changed if pid not in processes) if pids is not None else []
+        archive_rows = None
+        if self.archive is not None:
+            self.archive.flush()
+            if self.archive.path == ":memory:":
+                # Kho trong bộ nhớ mất cùng tiến trình: chép các hàng vào khung (DELTA chỉ chép pid mới bị loại)
+                archive_rows = self.archive.rows(None if pids is None else removed)
+        
+        state = {
+            "compact": isinstance(processes, ProcessTable),
+            "removed": removed,
+            "config": {name: getattr(self, name) for name in CHECKPOINT_CONFIG},
+            "seed": self.seed,
+            "model": self.model.snapshot(),
+            "policy": getattr(self.policy_factory, "name", None),
+            "migrations": self.migrations,
+            "steals": self.steals,
+            "balance_runs": self.balance_runs,
+            "archived": self.archived,
+            "archive": self.archive.path if self.archive is not None else None,
+            "idle_cpus": sorted(self._idle_cpus),
+            "next_cpu": self._next_cpu,
+            "balance_event": self._event_seq(self._balance_event),
+            "timer_event": self._event_seq(self._timer_event),
+            "metrics": self.metrics.snapshot(),
+            "cpus": [],
+        }
+        next_pid = next(self._pids)
+        self._pids = itertools.count(next_pid)
+        state["next_pid"] = next_pid
+        
+        arrays = {}
+        if isinstance(processes, ProcessTable):
+            fixes = self._table_columns(None if pids is None else sorted(changed))
+        else:
+            fixes = self._process_rows([processes[pid] for pid in sorted(touched) if pid in processes])
+        arrays["terminated_order"] = array("q", self._terminated_order)
+        arrivals = self._arrivals
+        arrays["arrival_time"] = array("d", map(itemgetter(0), arrivals))
+        arrays["arrival_priority"] = array("B", [_PRIORITY_CODE[arrival[2]] for arrival in arrivals])
+        arrays["arrival_burst"] = array("d", [arrival[3] or 0.0 for arrival in arrivals])
+        arrays.update({f"arrival_{name}": values for name, values in _encode_names(map(itemgetter(1), arrivals)).items()})
+        state["engine"], engine_arrays = self.engine.snapshot(lambda cpu: cpu.cpu_id if cpu is not None else -1)
+        arrays.update({f"event_{name}": values for name, values in engine_arrays.items()})
+        state["wheel"], wheel_arrays = self.io_timers.snapshot()
+        arrays.update({f"wheel_{name}": values for name, values in wheel_arrays.items()})
+        for cpu in self.cpus:
+            policy_state, policy_arrays = cpu.policy.snapshot()
+            state["cpus"].append({
+                "running": cpu.running.pid if cpu.running else None,
+                "dispatch_event": self._event_seq(cpu.dispatch_event),
+                "slice_event": self._event_seq(cpu.slice_event),
+                "slice_started": cpu.slice_started,
+                "dispatched_at": cpu.dispatched_at,
+                "quantum": cpu.quantum,
+                "busy_time": cpu.busy_time,
+                "last_pid": cpu.last_pid,
+                "policy": cpu.policy.name,
+                "policy_state": policy_state,
+            })
+            arrays.update({f"cpu{cpu.cpu_id}_{name}": values for name, values in policy_arrays.items()})
+        
+        def finish():
+            reasons, columns, names = fixes if rows is None else _merge_rows(rows, fixes, touched)
+            state["reasons"] = reasons
+            arrays.update(columns)
+            arrays.update(_encode_names(names))
+            if archive_rows is not None:
+                arrays.update(_archive_arrays(archive_rows))
+            _build_arrays(arrays)
+        return state, arrays, finish
+    
+    def _event_seq(self, event):
+        """Số thứ tự của sự kiện còn hiệu lực, None nếu không có hoặc đã hủy"""
+        return event[1] if event is not None and event[2] is not None else None
+    
+    def _table_columns(self, pids):
+        """Chép các cột của bảng gọn theo pids (None: tất cả, đã giữ khóa), trả về (lý do đợi, cột, tên)"""
+        table = self.processes
+        if pids is None:
+            count = len(table)
+            # Cùng kiểu nên array() chép bằng memcpy; cột pid dựng sau khi nhả khóa
+            columns = {name: array(typecode, getattr(table, name)) for name, typecode in CHECKPOINT_COLUMNS[1:]}
+            columns["pid"] = lambda: array("q", range(1, count + 1))
+            return list(table.reasons), columns, table.names[:]
+        rows = [pid - 1 for pid in pids if pid in table]
+        columns = {name: array(typecode, map(getattr(table, name).__getitem__, rows))
+                   for name, typecode in CHECKPOINT_COLUMNS[1:]}
+        columns["pid"] = array("q", [row + 1 for row in rows])
+        return list(table.reasons), columns, [table.names[row] for row in rows]
+    
+    def _process_rows(self, items):
+        """Lý do đợi, các cột và tên của các Process (đọc được ngoài khóa: hàng bị đọc dở sẽ được đọc lại)"""
+        reasons = [None]
+        codes = {None: 0}
+        
+        def reason_code(reason):
+            code = codes.get(reason)
+            if code is None:
+                code = codes[reason] = len(reasons)
+                reasons.append(reason)
+            return code
+        
+        def column(name):
+            return map(attrgetter(name), items)
+        
+        def times(name):
+            return array("d", [_NO_TIME if value is None else value for value in column(name)])
+        
+        columns = {
+            "pid": array("q", column("pid")),
+            "state": array("b", map(_STATE_CODE.__getitem__, column("state"))),
+            "priority": array("b", map(_PRIORITY_CODE.__getitem__, column("priority"))),
+            "burst_time": array("d", column("burst_time")),
+            "remaining_time": array("d", column("remaining_time")),
+            "creation_time": times("creation_time"),
+            "start_time": times("start_time"),
+            "end_time": times("end_time"),
+            "io_deadline": times("io_deadline"),
+            "ready_since": times("ready_since"),
+            "ready_wait": array("d", column("ready_wait")),
+            "cpu_id": array("h", [-1 if value is None else value for value in column("cpu_id")]),
+            "waiting_reason": array("b", map(reason_code, column("waiting_reason"))),
+        }
+        return reasons, columns, list(column("name"))
+    
+    def restore_checkpoint(self, path):
+        """Khôi phục toàn bộ trạng thái từ tệp checkpoint (scheduler phải đang dừng)"""
+        if self.scheduler_running:
+            return False
+        # Trạng thái bộ lập lịch (hàng đợi, sự kiện, hẹn giờ) lấy từ khung mới nhất
+        state, arrays, columns, names, reasons, archive_rows = _merge_checkpoint(path)
+        with self.scheduler_lock:
+            self._restore_checkpoint(state, arrays, columns, names, reasons, archive_rows)
+        if self.update_callback:
+            self.update_callback()
+        return True
+    
+    def _restore_checkpoint(self, state, arrays, columns, names, reasons, archive_rows=()):
+        """Dựng lại tiến trình, chỉ mục, hàng đợi, sự kiện và hẹn giờ từ checkpoint (đã giữ khóa)"""
+        if state["compact"]:
+            if list(columns["pid"]) != list(range(1, len(names) + 1)):
+                raise ValueError("pid của bảng gọn phải liên tiếp từ 1")
+            processes = ProcessTable()
+            for name, _ in CHECKPOINT_COLUMNS[1:]:
+                setattr(processes, name, columns[name])
+            processes.names = names
+            processes.reasons = reasons
+            processes._reason_codes = {reason: code for code, reason in enumerate(reasons)}
+            processes._views = [ProcessView(processes, row) for row in range(len(names))]
+        else:
+            processes = self._restore_processes(columns, names, reasons)
+        self.processes = processes
+        # Hàm lấy tiến trình theo pid cho việc dựng lại hàng đợi và hẹn giờ
+        if state["compact"]:
+            lookup = ([None] + processes._views).__getitem__
+        else:
+            lookup = processes.__getitem__
+        
+        # Chỉ mục trạng thái dựng trực tiếp từ cột, không đọc thuộc tính từng tiến trình
+        states = list(map(STATE_CODES.__getitem__, columns["state"]))
+        self._indexed_state = dict(zip(columns["pid"], states))
+        self.state_index = {state: {} for state in ProcessState}
+        index = self.state_index
+        for pid, process_state, process in zip(columns["pid"], states, processes.values()):
+            index[process_state][pid] = process
+        
+        for name, value in state["config"].items():
+            setattr(self, name, value)
+        self.seed = state["seed"]
+        self.model = WorkloadModel.from_snapshot(state["model"])
+        if state["policy"] is not None:
+            self.policy_factory = SCHEDULING_POLICIES[state["policy"]]
+        self.migrations = state["migrations"]
+        self.steals = state["steals"]
+        self.balance_runs = state["balance_runs"]
+        self.archived = state["archived"]
+        if state["archive"] == ":memory:":
+            self.archive = ProcessArchive()
+            self.archive.add_rows(archive_rows)
+        elif state["archive"] is not None:
+            self.archive = ProcessArchive(state["archive"])
+        self.metrics = SchedulerMetrics()
+        self.metrics.restore(state["metrics"])
+        self._terminated_order = deque(arrays["terminated_order"])
+        self._arrivals = deque(zip(
+            arrays["arrival_time"], _decode_names(_prefixed(arrays, "arrival_")),
+            map(PRIORITY_CODES.__getitem__, arrays["arrival_priority"]),
+            [_trace_number(burst_time) if burst_time else None for burst_time in arrays["arrival_burst"]],
+        ))
+        self._pids = itertools.count(state["next_pid"])
+        
+        self.cpus = []
+        for cpu_id, cpu_state in enumerate(state["cpus"]):
+            cpu = CPU(cpu_id, SCHEDULING_POLICIES[cpu_state["policy"]]())
+            cpu.policy.restore(cpu_state["policy_state"], _prefixed(arrays, f"cpu{cpu_id}_"), lookup)
+            cpu.running = lookup(cpu_state["running"]) if cpu_state["running"] is not None else None
+            for name in ("slice_started", "dispatched_at", "quantum", "busy_time", "last_pid"):
+                setattr(cpu, name, cpu_state[name])
+            self.cpus.append(cpu)
+        self._idle_cpus = set(state["idle_cpus"])
+        self._next_cpu = state["next_cpu"]
+        
+        events = self.engine.restore(state["engine"], _prefixed(arrays, "event_"),
+                                     lambda cpu_id: self.cpus[cpu_id] if cpu_id >= 0 else None)
+        for cpu, cpu_state in zip(self.cpus, state["cpus"]):
+            cpu.dispatch_event = events.get(cpu_state["dispatch_event"])
+            cpu.slice_event = events.get(cpu_state["slice_event"])
+        self._balance_event = events.get(state["balance_event"])
+        self._timer_event = events.get(state["timer_event"])
+        self.io_timers.restore(state["wheel"], _prefixed(arrays, "wheel_"), lookup)
+        
+        if self._changes is not None:
+            self._changes.clear()
+            self._evicted.clear()
+        self._retention_due = False
+        self._dirty = None
+        self.checkpointer = None
+    
+    def _restore_processes(self, columns, names, reasons):
+        """Tạo các Process từ cột checkpoint mà không lấy pid mới"""
+        def optional(values):
+            return [None if value != value else value for value in values]
+        
+        def number(values):
+            return [int(value) if value.is_integer() else value for value in values]
+        
+        keys = ("pid", "name", "state", "priority", "creation_time", "start_time", "end_time", "burst_time",
+                "remaining_time", "waiting_reason", "io_deadline", "ready_since", "ready_wait", "cpu_id")
+        rows = zip(
+            columns["pid"], names,
+            map(STATE_CODES.__getitem__, columns["state"]),
+            map(PRIORITY_CODES.__getitem__, columns["priority"]),
+            columns["creation_time"], optional(columns["start_time"]), optional(columns["end_time"]),
+            number(columns["burst_time"]), number(columns["remaining_time"]),
+            map(reasons.__getitem__, columns["waiting_reason"]),
+            optional(columns["io_deadline"]), optional(columns["ready_since"]), columns["ready_wait"],
+            [None if cpu_id < 0 else cpu_id for cpu_id in columns["cpu_id"]],
+        )
+        new = Process.__new__
+        processes = {}
+        for row in rows:
+            process = new(Process)
+            process.__dict__ = dict(zip(keys, row))
+            processes[process.pid] = process
+        return processes
+    
+    def drain_evicted(self):
+        """Trả về pid các tiến trình đã bị loại khỏi bộ nhớ kể từ lần gọi trước, không giữ khóa scheduler"""
+        evicted = self._evicted
+        if evicted is None:
+            return []
+        return [evicted.popleft() for _ in range(len(evicted))]
+    
+    def set_time_slice(self, time_slice):
+        """Thiết lập time slice mới"""
+        if time_slice > 0:
+            with self.scheduler_lock:
+                self.time_slice = time_slice
+                self._trace_input(TraceKind.CONFIG, value=time_slice, code=TRACE_CONFIG.index("time_slice"))
+            return True
+        return False
+        
+    def set_update_callback(self, callback):
+        """Đặt hàm callback để cập nhật giao diện"""
+        self.update_callback = callback
+
+def _trace_number(value):
+    """Giá trị số trong trace, trả về int nếu là số nguyên"""
+    return int(value) if float(value).is_integer() else value
+
+def replay_trace(path, trace_path=None):
+    """Phát lại trace vào một ProcessManager mới, tái tạo đúng lần chạy đã ghi (trace_path: ghi lại trace của lần phát lại)"""
+    manager = None
+    pids = {}  # {pid trong trace: pid của tiến trình phát lại}
+    for record in read_trace(path):
+        kind = record.kind
+        if kind == TraceKind.HEADER:
+            if record.seq != 0 or record.value != 0:
+                raise ValueError("Trace không được ghi từ đầu lần chạy nên không thể phát lại")
+            manager = ProcessManager(seed=record.pid, policy=SCHEDULING_POLICIES[record.text],
+                                     num_cpus=record.cpu, compact=bool(record.code))
+            manager.engine.now = record.time
+            continue
+        if manager is None:
+            raise ValueError("Trace thiếu bản ghi đầu")
+        if kind not in TRACE_INPUT_KINDS and kind != TraceKind.END:
+            continue
+        if trace_path is not None and manager.tracer is None and kind not in (TraceKind.CONFIG, TraceKind.MODEL):
+            manager.start_trace(trace_path)
+        # Xử lý đúng số sự kiện đã xử lý trước thao tác này trong lần chạy gốc
+        engine = manager.engine
+        while engine.processed < record.seq and engine.step():
+            pass
+        if engine.processed != record.seq:
+            raise ValueError(f"Trace không khớp: dừng ở sự kiện {engine.processed}, cần {record.seq}")
+        engine.now = record.time
+        if kind == TraceKind.CREATE:
+            process = manager.create_process(record.text, PRIORITY_CODES[record.code], _trace_number(record.value))
+            pids[record.pid] = process.pid
+        elif kind == TraceKind.SET_STATE:
+            manager.set_process_state(pids.get(record.pid, record.pid), STATE_CODES[record.code])
+        elif kind == TraceKind.CONFIG:
+            name = TRACE_CONFIG[record.code]
+            if name == "time_slice" and manager.tracer is not None:
+                manager.set_time_slice(_trace_number(record.value))
+            else:
+                setattr(manager, name, _trace_number(record.value))
+        elif kind == TraceKind.POLICY:
+            manager.set_policy(SCHEDULING_POLICIES[record.text])
+        elif kind == TraceKind.MODEL:
+            # Giữ nguyên vị trí các dòng ngẫu nhiên thay vì sinh lại từ seed như set_model
+            with manager.scheduler_lock:
+                manager.model = WorkloadModel.from_snapshot(json.loads(record.text))
+                manager._trace_model()
+        elif kind == TraceKind.CPUS:
+            manager.set_cpu_count(record.aux)
+        elif kind == TraceKind.STOP:
+            with manager.scheduler_lock:
+                manager._trace_input(TraceKind.STOP)
+                manager._preempt_all()
+        elif kind == TraceKind.END:
+            break
+    if manager is not None and trace_path is not None:
+        manager.stop_trace()
+    return manager
+
+# Các cách viết độ ưu tiên trong tệp workload: tên, giá trị hiển thị hoặc số 1-3
+_PRIORITY_ALIASES = {"": ProcessPriority.MEDIUM}
+for _value, _priority in enumerate(PRIORITY_CODES, start=1):
+    for _alias in (_priority.name, _priority.name.lower(), _priority.value, str(_value), _value):
+        _PRIORITY_ALIASES[_alias] = _priority
+
+def parse_priority(value):
+    """Độ ưu tiên từ tên (HIGH), giá trị hiển thị (Cao) hoặc số 1-3; mặc định Trung bình"""
+    if value is None or isinstance(value, ProcessPriority):
+        return value or ProcessPriority.MEDIUM
+    priority = _PRIORITY_ALIASES.get(value)
+    if priority is None:
+        priority = _PRIORITY_ALIASES.get(str(value).strip())
+        if priority is None:
+            raise ValueError(f"Độ ưu tiên không hợp lệ: {value}")
+    return priority
+
+def _parse_burst(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return _trace_number(float(value))
+
+def load_workload_csv(path):
+    """Đọc lần lượt các tiến trình từ tệp CSV có tiêu đề name, priority, burst_time"""
+    import csv
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip() for column in header]
+        name_col = columns.index("name")
+        priority_col = columns.index("priority") if "priority" in columns else None
+        burst_col = columns.index("burst_time") if "burst_time" in columns else None
+        for row in reader:
+            if not row:
+                continue
+            priority = parse_priority(row[priority_col]) if priority_col is not None else ProcessPriority.MEDIUM
+            burst_time = _parse_burst(row[burst_col]) if burst_col is not None else None
+            yield row[name_col], priority, burst_time
+
+def load_workload_jsonl(path):
+    """Đọc lần lượt các tiến trình từ tệp JSON Lines, mỗi dòng một đối tượng {name, priority, burst_time}"""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = list(itertools.islice(f, 10000))
+            if not chunk:
+                break
+            lines = [line for line in chunk if line.strip()]
+            if not lines:
+                continue
+            # Giải mã cả khối dòng bằng một lần gọi json.loads
+            for row in json.loads("[" + ",".join(lines) + "]"):
+                yield row["name"], parse_priority(row.get("priority")), _parse_burst(row.get("burst_time"))
+
+def load_workload(path):
+    """Chọn bộ đọc workload theo phần mở rộng của tệp"""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return load_workload_jsonl(path)
+    return load_workload_csv(path)
+
+# Một tiến trình thật của máy đọc từ /proc; bản ghi bất biến, mỗi lần thay đổi là một bản ghi mới
+HostProcess = namedtuple("HostProcess", "pid name state cpu_percent rss cmdline")
+
+# Theo dõi tiến trình thật qua /proc trên một luồng riêng. Mỗi lượt chỉ đọc /proc/<pid>/stat
+# bằng pread trên fd mở sẵn; tên và dòng lệnh không đổi nên chỉ đọc một lần cho mỗi pid;
+# %CPU tính từ chênh lệch utime + stime giữa hai lượt; chỉ tiến trình có giá trị hiển thị
+# thay đổi mới được gửi sang giao diện.
+class SystemMonitor:
+    def __init__(self, interval=1.0, proc="/proc", max_fds=None):
+        self.interval = interval
+        self.proc = proc
+        self.available = os.path.isdir(proc)
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if self.available else 100
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if self.available else 4096
+        if max_fds is None:
+            # Chừa một nửa giới hạn fd cho phần còn lại của ứng dụng
+            try:
+                import resource
+                max_fds = resource.getrlimit(resource.RLIMIT_NOFILE)[0] // 2
+            except (ImportError, ValueError):
+                max_fds = 512
+        self.max_fds = max_fds
+        self._entries = {}  # {pid: [fd hoặc None, starttime, tổng tick CPU, HostProcess, nội dung stat]}
+        self._open_fds = 0
+        self._last_sample = None
+        self._changes = deque()  # Các cặp (pid, HostProcess hoặc None) chờ giao diện lấy
+        self.processes = {}  # {pid: HostProcess} mà giao diện đang hiển thị, chỉ dùng trên luồng Tk
+        self.update_callback = None
+        self.thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Bắt đầu luồng lấy mẫu"""
+        if not self.available or self.thread is not None:
+            return False
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Dừng luồng lấy mẫu, giữ các fd để lần bật lại không phải mở lại"""
+        if self.thread is None:
+            return False
+        self._stop.set()
+        self.thread.join()
+        self.thread = None
+        return True
+
+    def close(self):
+        """Dừng và đóng mọi fd đang giữ"""
+        self.stop()
+        for entry in self._entries.values():
+            if entry[0] is not None:
+                os.close(entry[0])
+        self._entries.clear()
+        self._open_fds = 0
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self.sample() and self.update_callback:
+                self.update_callback()
+            self._stop.wait(self.interval)
+
+    def _open_stat(self, pid):
+        """Mở /proc/<pid>/stat để giữ cho các lượt sau, None nếu hết hạn mức fd hoặc không mở được"""
+        if self._open_fds >= self.max_fds:
+            return None
+        try:
+            fd = os.open(f"{self.proc}/{pid}/stat", os.O_RDONLY)
+        except OSError:
+            return None
+        self._open_fds += 1
+        return fd
+
+    def _close_stat(self, fd):
+        os.close(fd)
+        self._open_fds -= 1
+
+    def _read_stat(self, pid, fd):
+        """Nội dung /proc/<pid>/stat, dùng fd đã mở nếu có"""
+        if fd is not None:
+            return os.pread(fd, 4096, 0)
+        with open(f"{self.proc}/{pid}/stat", "rb") as f:
+            return f.read()
+
+    def _read_cmdline(self, pid):
+        try:
+            with open(f"{self.proc}/{pid}/cmdline", "rb") as f:
+                return f.read().replace(b"\0", b" ").decode("utf-8", "replace").strip()
+        except OSError:
+            return ""
+
+    def sample(self):
+        """Một lượt đọc /proc, trả về số tiến trình đã thay đổi (kể cả mới xuất hiện hoặc đã mất)"""
+        now = time.monotonic()
+        elapsed = now - self._last_sample if self._last_sample is not None else None
+        self._last_sample = now
+        entries = self._entries
+        pids = {int(name) for name in os.listdir(self.proc) if name.isdigit()}
+        changes = []
+        
+        for pid in list(entries):
+            if pid not in pids:
+                self._forget(pid)
+                changes.append((pid, None))
+        
+        for pid in pids:
+            entry = entries.get(pid)
+            # pid mới: mở stat một lần, cùng fd đó dùng để đọc lượt này và được giữ cho các lượt sau
+            fd = entry[0] if entry is not None else self._open_stat(pid)
+            try:
+                data = self._read_stat(pid, fd)
+            except OSError:
+                # Tiến trình vừa kết thúc giữa lúc liệt kê và lúc đọc
+                if entry is not None:
+                    self._forget(pid)
+                    changes.append((pid, None))
+                elif fd is not None:
+                    self._close_stat(fd)
+                continue
+            if entry is not None and data == entry[4] and not entry[3].cpu_percent:
+                # stat không đổi: tiến trình đang ngủ, không cần tách trường
+                continue
+            close = data.rindex(b")")
+            fields = data[close + 2:].split()
+            ticks = int(fields[11]) + int(fields[12])
+            starttime = int(fields[19])
+            if entry is not None and entry[1] != starttime:
+                # pid đã được dùng lại cho tiến trình khác (stat được đọc theo đường dẫn)
+                self._forget(pid)
+                entry = None
+                fd = self._open_stat(pid)
+            if entry is None:
+                name = data[data.index(b"(") + 1:close].decode("utf-8", "replace")
+                entry = entries[pid] = [fd, starttime, ticks, HostProcess(pid, name, "", 0.0, 0, self._read_cmdline(pid)), data]
+                cpu_percent = 0.0
+            else:
+                cpu_percent = (ticks - entry[2]) / self.clock_ticks / elapsed * 100 if elapsed else 0.0
+                entry[2] = ticks
+            entry[4] = data
+            old = entry[3]
+            state = fields[0].decode()
+            rss = int(fields[21]) * self.page_size
+            cpu_percent = round(cpu_percent, 1)
+            if state != old.state or cpu_percent != old.cpu_percent or rss != old.rss:
+                entry[3] = old._replace(state=state, cpu_percent=cpu_percent, rss=rss)
+                changes.append((pid, entry[3]))
+        
+        self._changes.extend(changes)
+        return len(changes)
+
+    def _forget(self, pid):
+        entry = self._entries.pop(pid)
+        if entry[0] is not None:
+            self._close_stat(entry[0])
+
+    def drain(self):
+        """Lấy các thay đổi từ lượt đọc gần nhất và áp dụng vào processes (gọi trên luồng Tk)"""
+        changes = self._changes
+        pairs = [changes.popleft() for _ in range(len(changes))]
+        processes = self.processes
+        for pid, host_process in pairs:
+            if host_process is None:
+                processes.pop(pid, None)
+            else:
+                processes[pid] = host_process
+        return pairs
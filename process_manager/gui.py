@@ -0,0 +1,1128 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import time
+import bisect
+
+from .core import (
+    SCHEDULING_POLICIES, GanttHistory, ProcessManager, ProcessPriority, ProcessState, SystemMonitor,
+    format_metric, load_workload,
+)
+
+# Các cột của bảng tiến trình
+PROCESS_COLUMNS = ("pid", "name", "state", "priority", "burst_time", "remaining_time", "creation_time")
+PROCESS_HEADINGS = {
+    "pid": ("ID", 80),
+    "name": ("Tên tiến trình", 150),
+    "state": ("Trạng thái", 100),
+    "priority": ("Độ ưu tiên", 100),
+    "burst_time": ("Thời gian xử lý", 100),
+    "remaining_time": ("Thời gian còn lại", 100),
+    "creation_time": ("Thời điểm tạo", 150),
+}
+STATE_ORDER = {state: index for index, state in enumerate(ProcessState)}
+PROCESS_SORT_KEYS = {
+    "pid": lambda p: p.pid,
+    "name": lambda p: p.name,
+    "state": lambda p: STATE_ORDER[p.state],
+    "priority": lambda p: p.get_priority_value(),
+    "burst_time": lambda p: p.burst_time,
+    "remaining_time": lambda p: p.remaining_time,
+    "creation_time": lambda p: p.creation_time,
+}
+STATE_TAG_COLORS = {
+    "ready": "lightblue",
+    "running": "lightgreen",
+    "waiting": "lightyellow",
+    "terminated": "lightgray",
+}
+
+# Các cột của bảng tiến trình thật (tab Hệ thống)
+HOST_COLUMNS = ("pid", "name", "state", "cpu_percent", "rss", "cmdline")
+HOST_HEADINGS = {
+    "pid": ("PID", 70),
+    "name": ("Tên", 130),
+    "state": ("Trạng thái", 90),
+    "cpu_percent": ("CPU %", 60),
+    "rss": ("RSS (MB)", 80),
+    "cmdline": ("Dòng lệnh", 400),
+}
+HOST_SORT_KEYS = {
+    "pid": lambda p: p.pid,
+    "name": lambda p: p.name,
+    "state": lambda p: p.state,
+    "cpu_percent": lambda p: p.cpu_percent,
+    "rss": lambda p: p.rss,
+    "cmdline": lambda p: p.cmdline,
+}
+# Trạng thái trong /proc/<pid>/stat: (tên hiển thị, tag màu)
+HOST_STATES = {
+    "R": ("Đang chạy", "running"),
+    "S": ("Ngủ", "ready"),
+    "I": ("Rảnh", "ready"),
+    "D": ("Chờ I/O", "waiting"),
+    "T": ("Dừng", "waiting"),
+    "t": ("Bị theo dõi", "waiting"),
+    "Z": ("Zombie", "terminated"),
+    "X": ("Đã kết thúc", "terminated"),
+}
+
+# Chỉ mục có thứ tự các cặp (khóa sắp xếp, id) dùng bisect trên một danh sách
+class SortedIndex:
+    def __init__(self, key):
+        self.key = key  # Hàm lấy khóa sắp xếp của một đối tượng
+        self._keys = []  # Các cặp (khóa, id) đã sắp xếp
+        self._by_id = {}  # {id: (khóa, id)}
+
+    def update(self, item_id, item):
+        """Thêm hoặc đặt lại vị trí của một đối tượng, trả về True nếu thứ tự thay đổi"""
+        entry = (self.key(item), item_id)
+        old_entry = self._by_id.get(item_id)
+        if old_entry == entry:
+            return False
+        if old_entry is not None:
+            del self._keys[bisect.bisect_left(self._keys, old_entry)]
+        bisect.insort(self._keys, entry)
+        self._by_id[item_id] = entry
+        return True
+
+    def update_many(self, pairs, removed=()):
+        """Cập nhật nhiều cặp (id, đối tượng) và xóa các id trong removed cùng lúc"""
+        if len(pairs) + len(removed) < max(64, len(self._keys) // 8):
+            for item_id in removed:
+                self.discard(item_id)
+            for item_id, item in pairs:
+                self.update(item_id, item)
+            return
+        # Lô lớn: sắp xếp lại một lần thay vì chèn từng phần tử vào giữa danh sách
+        key = self.key
+        by_id = self._by_id
+        for item_id in removed:
+            by_id.pop(item_id, None)
+        for item_id, item in pairs:
+            by_id[item_id] = (key(item), item_id)
+        self._keys = sorted(by_id.values())
+
+    def discard(self, item_id):
+        """Xóa một đối tượng khỏi chỉ mục nếu có"""
+        entry = self._by_id.pop(item_id, None)
+        if entry is None:
+            return False
+        del self._keys[bisect.bisect_left(self._keys, entry)]
+        return True
+
+    def rebuild(self, key, items):
+        """Đổi khóa sắp xếp và dựng lại chỉ mục từ các cặp (id, đối tượng)"""
+        self.key = key
+        self._keys = sorted((key(item), item_id) for item_id, item in items)
+        self._by_id = {entry[1]: entry for entry in self._keys}
+
+    def position(self, item_id):
+        """Vị trí của đối tượng trong thứ tự sắp xếp, None nếu không có"""
+        entry = self._by_id.get(item_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self._keys, entry)
+
+    def ids(self, start, stop):
+        """Các id trong khoảng vị trí [start, stop)"""
+        return [entry[1] for entry in self._keys[start:stop]]
+
+    def __contains__(self, item_id):
+        return item_id in self._by_id
+
+    def __iter__(self):
+        return iter(self._by_id)
+
+    def __len__(self):
+        return len(self._keys)
+
+# Bảng ảo: Treeview chỉ giữ số dòng vừa khung nhìn, nội dung lấy từ chỉ mục có thứ tự,
+# nên bộ nhớ và chi phí vẽ lại không phụ thuộc vào tổng số dòng
+class VirtualTable:
+    row_height = 20  # Chiều cao ước tính của một dòng (pixel)
+
+    def __init__(self, parent, columns, headings, sort_keys, lookup, format_row,
+                 row_filter=None, tag_of=None, tag_colors=None, sort_column=None, descending=False, on_select=None):
+        self.columns = columns
+        self.headings = headings  # {cột: (tiêu đề, độ rộng)}
+        self.sort_keys = sort_keys  # {cột: hàm lấy khóa sắp xếp}
+        self.lookup = lookup  # Hàm lấy đối tượng theo id
+        self.format_row = format_row  # Hàm tạo giá trị các cột từ đối tượng
+        self.row_filter = row_filter  # Hàm chọn đối tượng được hiển thị
+        self.tag_of = tag_of  # Hàm lấy tag màu của đối tượng
+        self.on_select = on_select  # Hàm gọi khi người dùng chọn một dòng
+        self.sort_column = sort_column if sort_column else columns[0]
+        self.descending = descending
+        self.index = SortedIndex(sort_keys[self.sort_column])
+        self.offset = 0  # Vị trí dòng đầu tiên trong khung nhìn
+        self.page_size = 25  # Số dòng vừa khung nhìn
+        self.selected_id = None
+        self._slots = []  # Các item Treeview được dùng lại cho khung nhìn
+        self._slot_ids = []  # id đang hiển thị ở từng item
+        self._slot_values = []  # Giá trị đang hiển thị ở từng item
+        self._attached = 0  # Số item đang hiển thị
+        
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", selectmode="browse")
+        for column in columns:
+            text, width = headings[column]
+            self.tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width)
+        for tag, color in (tag_colors or {}).items():
+            self.tree.tag_configure(tag, background=color)
+        self._update_headings()
+        
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(expand=True, fill="both")
+        
+        self.tree.bind("<<TreeviewSelect>>", self.on_select_row)
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+
+    def update(self, item_id, item):
+        """Cập nhật vị trí của một đối tượng trong chỉ mục (hoặc xóa nếu không còn hiển thị)"""
+        if item is None or (self.row_filter and not self.row_filter(item)):
+            self.index.discard(item_id)
+        else:
+            self.index.update(item_id, item)
+
+    def update_many(self, items):
+        """Cập nhật nhiều cặp (id, đối tượng) trong một lần"""
+        row_filter = self.row_filter
+        pairs, removed = [], []
+        for item_id, item in items:
+            if item is None or (row_filter and not row_filter(item)):
+                removed.append(item_id)
+            else:
+                pairs.append((item_id, item))
+        self.index.update_many(pairs, removed)
+
+    def reset(self, items):
+        """Dựng lại toàn bộ chỉ mục từ các cặp (id, đối tượng), ví dụ sau khi khôi phục checkpoint"""
+        row_filter = self.row_filter
+        if row_filter:
+            items = [(item_id, item) for item_id, item in items if row_filter(item)]
+        self.index.rebuild(self.sort_keys[self.sort_column], items)
+        if self.selected_id not in self.index:
+            self.selected_id = None
+        self.redraw()
+
+    def sort_by(self, column):
+        """Sắp xếp theo cột, bấm lại cùng cột để đảo chiều"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+            lookup = self.lookup
+            self.index.rebuild(self.sort_keys[column], [(i, lookup(i)) for i in list(self.index)])
+        self._update_headings()
+        self.scroll_to(self.selected_id)
+
+    def _update_headings(self):
+        for column in self.columns:
+            text = self.headings[column][0]
+            if column == self.sort_column:
+                text += " ▼" if self.descending else " ▲"
+            self.tree.heading(column, text=text)
+
+    def row_of(self, item_id):
+        """Vị trí hiển thị của đối tượng, None nếu không có trong bảng"""
+        position = self.index.position(item_id)
+        if position is not None and self.descending:
+            position = len(self.index) - 1 - position
+        return position
+
+    def scroll_to(self, item_id):
+        """Cuộn để đối tượng nằm giữa khung nhìn (giữ nguyên vị trí nếu không tìm thấy)"""
+        row = self.row_of(item_id) if item_id is not None else None
+        if row is not None:
+            self.offset = row - self.page_size // 2
+        self.redraw()
+        return row is not None
+
+    def select(self, item_id):
+        """Chọn và cuộn tới một đối tượng"""
+        self.selected_id = item_id
+        return self.scroll_to(item_id)
+
+    def scroll(self, rows):
+        """Cuộn khung nhìn một số dòng"""
+        self.offset += rows
+        self.redraw()
+
+    def on_scroll(self, *args):
+        """Xử lý lệnh từ thanh cuộn"""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.index))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.offset += amount * self.page_size if args[2] == "pages" else amount
+        self.redraw()
+
+    def on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        page_size = max(1, event.height // self.row_height - 1)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.redraw()
+
+    def on_select_row(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._slots[:self._attached]:
+            item_id = self._slot_ids[self._slots.index(selection[0])]
+            if item_id != self.selected_id:
+                self.selected_id = item_id
+                if self.on_select:
+                    self.on_select(item_id)
+
+    def redraw(self):
+        """Vẽ lại các dòng trong khung nhìn, chỉ ghi những ô thay đổi"""
+        total = len(self.index)
+        self.offset = max(0, min(self.offset, total - self.page_size))
+        start, stop = self.offset, min(total, self.offset + self.page_size)
+        if self.descending:
+            ids = self.index.ids(total - stop, total - start)[::-1]
+        else:
+            ids = self.index.ids(start, stop)
+        
+        # Tạo thêm hoặc ẩn bớt item cho vừa số dòng hiển thị
+        while self._attached < min(len(ids), len(self._slots)):
+            self.tree.move(self._slots[self._attached], "", self._attached)
+            self._attached += 1
+        while len(self._slots) < len(ids):
+            self._slots.append(self.tree.insert("", "end"))
+            self._slot_ids.append(None)
+            self._slot_values.append(None)
+            self._attached += 1
+        while self._attached > len(ids):
+            self._attached -= 1
+            self.tree.detach(self._slots[self._attached])
+            self._slot_ids[self._attached] = None
+            self._slot_values[self._attached] = None
+            
+        selected_slot = None
+        for slot, item_id in enumerate(ids):
+            item = self.lookup(item_id)
+            values = self.format_row(item)
+            if values != self._slot_values[slot]:
+                tags = (self.tag_of(item),) if self.tag_of else ()
+                self.tree.item(self._slots[slot], values=values, tags=tags)
+                self._slot_values[slot] = values
+            self._slot_ids[slot] = item_id
+            if item_id == self.selected_id:
+                selected_slot = self._slots[slot]
+                
+        if selected_slot is not None:
+            if self.tree.selection() != (selected_slot,):
+                self.tree.selection_set(selected_slot)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+            
+        if total:
+            self.scrollbar.set(start / total, stop / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+# Màu của tiến trình trên biểu đồ Gantt, chọn theo pid
+GANTT_COLORS = ["#4e79a7", "#f28e2b", "#e15759", "#76b7b2", "#59a14f",
+                "#edc948", "#b07aa1", "#ff9da7", "#9c755f", "#bab0ac"]
+
+# Biểu đồ Gantt trên Canvas: mỗi lõi một làn, trục ngang là thời gian ảo.
+# Khi theo dõi, mỗi lần vẽ chỉ dịch các hình đã có và thêm đoạn mới; đoạn hẹp hơn
+# min_width pixel được nối vào hình trước hoặc gộp theo cột pixel khi thu nhỏ
+class GanttView:
+    lane_height = 24
+    margin = 50  # Chiều rộng cột nhãn lõi bên trái (pixel)
+    min_width = 2  # Đoạn hẹp hơn số pixel này được gộp
+
+    def __init__(self, parent, history, lock, on_select=None):
+        self.history = history
+        self.lock = lock  # Khóa của bộ lập lịch, giữ khi đọc lịch sử
+        self.on_select = on_select  # Hàm gọi với pid khi người dùng nhấn vào một đoạn
+        self.scale = 20.0  # Số pixel mỗi đơn vị thời gian
+        self.now = 0.0
+        self.view_end = 0.0  # Thời điểm ở mép phải khung nhìn
+        self.width = 800  # Chiều rộng vùng vẽ (pixel), không tính cột nhãn
+        self.num_cpus = 0
+        self._drawn = None  # Số thứ tự đoạn kế tiếp cần vẽ, None khi phải vẽ lại toàn bộ
+        self._tails = {}  # {lõi: (item, thời điểm kết thúc)} hình cuối cùng của mỗi làn
+        self._drag_x = None
+        self._press_x = None
+        
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill="x")
+        ttk.Button(toolbar, text="Phóng to", command=lambda: self.zoom(2)).pack(side="left", padx=5, pady=2)
+        ttk.Button(toolbar, text="Thu nhỏ", command=lambda: self.zoom(0.5)).pack(side="left", padx=5, pady=2)
+        self.follow_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="Theo dõi", variable=self.follow_var,
+                        command=self.on_follow).pack(side="left", padx=5, pady=2)
+        self.range_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.range_var).pack(side="left", padx=10, pady=2)
+        
+        self.canvas = tk.Canvas(parent, background="white", highlightthickness=0)
+        self.canvas.pack(expand=True, fill="both")
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(2 if event.delta > 0 else 0.5))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(2))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(0.5))
+        self.canvas.bind("<ButtonPress-1>", self.on_press)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+
+    def invalidate(self):
+        """Yêu cầu vẽ lại toàn bộ ở lần redraw kế tiếp"""
+        self._drawn = None
+
+    def zoom(self, factor):
+        """Phóng to (factor > 1) hoặc thu nhỏ, giữ nguyên tâm khung nhìn khi không theo dõi"""
+        center = self.view_end - self.width / self.scale / 2
+        self.scale = min(1000.0, max(1e-6, self.scale * factor))
+        if not self.follow_var.get():
+            self.view_end = center + self.width / self.scale / 2
+        self.invalidate()
+        self.redraw()
+
+    def on_follow(self):
+        self.invalidate()
+        self.redraw()
+
+    def on_resize(self, event):
+        self.width = max(1, event.width - self.margin)
+        self.invalidate()
+        self.redraw()
+
+    def on_press(self, event):
+        self._drag_x = self._press_x = event.x
+
+    def on_drag(self, event):
+        """Kéo để xem lại lịch sử, tắt chế độ theo dõi"""
+        if self._drag_x is None or event.x == self._drag_x:
+            return
+        self.follow_var.set(False)
+        self.view_end -= (event.x - self._drag_x) / self.scale
+        self._drag_x = event.x
+        self.invalidate()
+        self.redraw()
+
+    def on_release(self, event):
+        """Nhấn mà không kéo: chọn tiến trình của đoạn dưới con trỏ"""
+        clicked = event.x == self._press_x
+        self._drag_x = self._press_x = None
+        if not clicked or not self.on_select:
+            return
+        for item in self.canvas.find_overlapping(event.x, event.y, event.x, event.y):
+            for tag in self.canvas.gettags(item):
+                if tag.startswith("p") and tag[1:].isdigit():
+                    self.on_select(int(tag[1:]))
+                    return
+
+    def _x(self, time):
+        return self.margin + self.width - (self.view_end - time) * self.scale
+
+    def _rect(self, cpu, pid, x0, x1, tag="seg"):
+        y0 = 4 + cpu * self.lane_height
+        return self.canvas.create_rectangle(
+            x0, y0, x1, y0 + self.lane_height - 4, width=0,
+            fill=GANTT_COLORS[pid % len(GANTT_COLORS)], tags=(tag, f"p{pid}"))
+
+    def redraw(self, now=None, num_cpus=None):
+        """Thêm các đoạn mới vào hình đang có, hoặc vẽ lại toàn bộ khi khung nhìn đã đổi"""
+        if now is not None:
+            self.now = now
+        if num_cpus is not None and num_cpus != self.num_cpus:
+            self.num_cpus = num_cpus
+            self.invalidate()
+        shift = 0.0
+        if self.follow_var.get():
+            shift = self.now - self.view_end
+            self.view_end = self.now
+        start = self.view_end - self.width / self.scale
+        
+        # Chỉ chép dữ liệu khi giữ khóa, vẽ sau khi nhả để không chặn bộ lập lịch
+        with self.lock:
+            new = self.history.since(self._drawn) if self._drawn is not None else None
+            if new is None:
+                total = self.history.total
+                coarse = list(self.history.coarse(start, self.view_end))
+                segments = list(self.history.segments(start, self.view_end))
+            running = self.history.running()
+        
+        if new is None:
+            self._draw_all(coarse, segments)
+            self._drawn = total
+        else:
+            self._draw_new(shift, new[1])
+            self._drawn = new[0]
+        
+        self.canvas.delete("open")
+        for cpu, pid, begin in running:
+            if cpu is not None and cpu < self.num_cpus:
+                x0, x1 = max(self._x(begin), self.margin), self._x(self.now)
+                self._rect(cpu, pid, x0, max(x1, x0 + self.min_width), tag="open")
+        self.canvas.tag_raise("label")
+        self.range_var.set(f"t = {max(start, 0):.2f} – {self.view_end:.2f}")
+
+    def _draw_all(self, coarse, segments):
+        """Vẽ lại khung nhìn: ô thô cũ, các đoạn trong vòng đệm và nhãn các làn"""
+        self.canvas.delete("all")
+        self._tails = {}
+        bins = {}  # {(lõi, cột pixel): (pid, độ dài)} các đoạn quá hẹp để vẽ riêng
+        # Ô thô được vẽ dồn về đầu ô với độ dài bằng thời gian bận
+        for cpu, pid, begin, _, busy in coarse:
+            self._place(cpu, pid, begin, begin + busy, bins)
+        for cpu, pid, begin, end in segments:
+            self._place(cpu, pid, begin, end, bins)
+        for (cpu, column), (pid, _) in bins.items():
+            self._rect(cpu, pid, column * self.min_width, (column + 1) * self.min_width)
+        for cpu in range(self.num_cpus):
+            y0 = 4 + cpu * self.lane_height
+            self.canvas.create_rectangle(0, y0 - 4, self.margin, y0 + self.lane_height,
+                                         fill="white", width=0, tags="label")
+            self.canvas.create_text(5, y0 + self.lane_height / 2 - 2, text=f"CPU{cpu}",
+                                    anchor="w", tags="label")
+
+    def _place(self, cpu, pid, begin, end, bins):
+        """Vẽ một đoạn nếu đủ rộng, nếu không thì gộp vào cột pixel chứa nó"""
+        if cpu >= self.num_cpus:
+            return
+        x0, x1 = max(self._x(begin), self.margin - 1), self._x(end)
+        if x1 < self.margin or x0 > self.margin + self.width:
+            return
+        if x1 - x0 >= self.min_width:
+            item = self._rect(cpu, pid, x0, x1)
+            tail = self._tails.get(cpu)
+            if tail is None or end >= tail[1]:
+                self._tails[cpu] = (item, end)
+            return
+        # Cột giữ tiến trình có đoạn dài nhất
+        key = (cpu, int(x0) // self.min_width)
+        cell = bins.get(key)
+        if cell is None or end - begin > cell[1]:
+            bins[key] = (pid, end - begin)
+
+    def _draw_new(self, shift, segments):
+        """Dịch hình sang trái theo thời gian đã trôi và vẽ thêm các đoạn mới"""
+        canvas = self.canvas
+        if shift:
+            canvas.move("seg", -shift * self.scale, 0)
+            # Xóa các hình đã trôi hết ra khỏi khung nhìn để số hình không tăng mãi
+            height = (self.num_cpus + 1) * self.lane_height
+            gone = [item for item in canvas.find_enclosed(-1e9, -1, self.margin, height)
+                    if "seg" in canvas.gettags(item)]
+            if gone:
+                canvas.delete(*gone)
+        gap = self.min_width / self.scale  # Khoảng thời gian ứng với min_width pixel
+        for cpu, pid, begin, end in segments:
+            if cpu >= self.num_cpus:
+                continue
+            x0, x1 = max(self._x(begin), self.margin - 1), self._x(end)
+            if x1 < self.margin:
+                continue
+            tail = self._tails.get(cpu)
+            if x1 - x0 < self.min_width and tail is not None and tail[1] >= begin - gap:
+                # Đoạn hẹp nối tiếp hình cuối của làn: kéo dài hình đó thay vì tạo hình mới
+                coords = canvas.coords(tail[0])
+                if coords:
+                    canvas.coords(tail[0], coords[0], coords[1], max(coords[2], x1), coords[3])
+                    self._tails[cpu] = (tail[0], max(tail[1], end))
+                    continue
+            item = self._rect(cpu, pid, x0, max(x1, x0 + self.min_width))
+            self._tails[cpu] = (item, end)
+
+# Gom các yêu cầu cập nhật giao diện: notify() có thể gọi từ bất kỳ luồng nào,
+# vòng lặp Tk kiểm tra bằng root.after và vẽ lại tối đa một lần mỗi khung hình
+class UIUpdatePipeline:
+    def __init__(self, root, refresh, fps=10):
+        self.root = root
+        self.refresh = refresh  # Hàm vẽ lại, luôn chạy trên luồng Tk
+        self.fps = fps
+        self._pending = False
+        self._after_id = None
+
+    def notify(self):
+        """Đánh dấu cần vẽ lại (an toàn khi gọi từ luồng khác)"""
+        self._pending = True
+
+    def start(self):
+        """Bắt đầu vòng lặp khung hình trên luồng Tk"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval(), self._on_frame)
+
+    def stop(self):
+        """Dừng vòng lặp khung hình"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def set_fps(self, fps):
+        """Thiết lập số lần vẽ lại tối đa mỗi giây"""
+        if fps > 0:
+            self.fps = fps
+            return True
+        return False
+
+    def interval(self):
+        """Khoảng cách giữa hai khung hình (ms)"""
+        return max(1, int(1000 / self.fps))
+
+    def _on_frame(self):
+        if self._pending:
+            self._pending = False
+            self.refresh()
+        self._after_id = self.root.after(self.interval(), self._on_frame)
+
+# Lớp giao diện người dùng
+class ProcessManagerApp:
+    def __init__(self, root, fps=10):
+        self.root = root
+        self.root.title("Hệ thống Quản lý Tiến trình")
+        self.root.geometry("900x600")
+        self.root.resizable(True, True)
+        
+        self.process_manager = ProcessManager()
+        self.process_manager.watch_changes()
+        # Lịch sử đoạn chạy cho tab Gantt, ghi từ các lần chuyển trạng thái của bộ lập lịch
+        self.gantt_history = GanttHistory()
+        self.process_manager.listeners.append(self.gantt_history.record)
+        
+        self.create_widgets()
+        
+        # Luồng scheduler chỉ báo có thay đổi, giao diện vẽ lại tối đa fps lần mỗi giây
+        self.ui_pipeline = UIUpdatePipeline(self.root, self.update_ui, fps)
+        self.process_manager.set_update_callback(self.ui_pipeline.notify)
+        self.ui_pipeline.start()
+        
+        # Bộ lập lịch không tự động bắt đầu, người dùng phải nhấn "Bắt đầu scheduler"
+        
+    def create_widgets(self):
+        """Tạo các thành phần giao diện"""
+        # Frame chứa các điều khiển
+        control_frame = ttk.LabelFrame(self.root, text="Điều khiển")
+        control_frame.pack(fill="x", padx=10, pady=5)
+        
+        # Frame điều khiển scheduler
+        scheduler_frame = ttk.Frame(control_frame)
+        scheduler_frame.pack(fill="x", padx=5, pady=5)
+        
+        self.scheduler_status_var = tk.StringVar(value="Scheduler: Dừng")
+        ttk.Label(scheduler_frame, textvariable=self.scheduler_status_var).grid(row=0, column=0, padx=5, pady=5)
+        
+        self.start_scheduler_btn = ttk.Button(scheduler_frame, text="Bắt đầu Scheduler", command=self.start_scheduler)
+        self.start_scheduler_btn.grid(row=0, column=1, padx=5, pady=5)
+        
+        self.stop_scheduler_btn = ttk.Button(scheduler_frame, text="Dừng Scheduler", command=self.stop_scheduler)
+        self.stop_scheduler_btn.grid(row=0, column=2, padx=5, pady=5)
+        self.stop_scheduler_btn.config(state="disabled")
+        
+        ttk.Label(scheduler_frame, text="Time Slice:").grid(row=0, column=3, padx=5, pady=5)
+        self.time_slice_var = tk.StringVar(value="1")
+        time_slice_entry = ttk.Entry(scheduler_frame, textvariable=self.time_slice_var, width=5)
+        time_slice_entry.grid(row=0, column=4, padx=5, pady=5)
+        
+        ttk.Button(scheduler_frame, text="Đặt Time Slice", command=self.set_time_slice).grid(row=0, column=5, padx=5, pady=5)
+        
+        ttk.Label(scheduler_frame, text="Chính sách:").grid(row=0, column=6, padx=5, pady=5)
+        self.policy_var = tk.StringVar(value=self.process_manager.policy_factory.name)
+        policy_combo = ttk.Combobox(scheduler_frame, textvariable=self.policy_var,
+                                    values=list(SCHEDULING_POLICIES), state="readonly", width=12)
+        policy_combo.grid(row=0, column=7, padx=5, pady=5)
+        policy_combo.bind("<<ComboboxSelected>>", self.set_policy)
+        
+        ttk.Label(scheduler_frame, text="Số CPU:").grid(row=0, column=8, padx=5, pady=5)
+        self.cpu_count_var = tk.StringVar(value=str(len(self.process_manager.cpus)))
+        ttk.Spinbox(scheduler_frame, from_=1, to=64, textvariable=self.cpu_count_var, width=4).grid(row=0, column=9, padx=5, pady=5)
+        ttk.Button(scheduler_frame, text="Đặt số CPU", command=self.set_cpu_count).grid(row=0, column=10, padx=5, pady=5)
+        ttk.Button(scheduler_frame, text="Lưu checkpoint", command=self.save_checkpoint).grid(row=0, column=11, padx=5, pady=5)
+        ttk.Button(scheduler_frame, text="Khôi phục checkpoint", command=self.restore_checkpoint).grid(row=0, column=12, padx=5, pady=5)
+        
+        # Frame tạo tiến trình
+        create_frame = ttk.Frame(control_frame)
+        create_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(create_frame, text="Tên tiến trình:").grid(row=0, column=0, padx=5, pady=5)
+        self.process_name_var = tk.StringVar()
+        ttk.Entry(create_frame, textvariable=self.process_name_var).grid(row=0, column=1, padx=5, pady=5)
+        
+        ttk.Label(create_frame, text="Độ ưu tiên:").grid(row=0, column=2, padx=5, pady=5)
+        self.priority_var = tk.StringVar(value=ProcessPriority.MEDIUM.value)
+        ttk.Combobox(create_frame, textvariable=self.priority_var, 
+                    values=[p.value for p in ProcessPriority], 
+                    state="readonly").grid(row=0, column=3, padx=5, pady=5)
+        
+        ttk.Label(create_frame, text="Thời gian xử lý:").grid(row=0, column=4, padx=5, pady=5)
+        self.burst_time_var = tk.StringVar(value="5")
+        ttk.Entry(create_frame, textvariable=self.burst_time_var, width=5).grid(row=0, column=5, padx=5, pady=5)
+        
+        ttk.Button(create_frame, text="Tạo tiến trình", command=self.create_process).grid(row=0, column=6, padx=5, pady=5)
+        ttk.Button(create_frame, text="Tạo ngẫu nhiên", command=self.create_random_processes).grid(row=0, column=7, padx=5, pady=5)
+        ttk.Button(create_frame, text="Nạp workload", command=self.load_workload).grid(row=0, column=8, padx=5, pady=5)
+        
+        # Frame điều khiển tiến trình được chọn
+        process_control_frame = ttk.Frame(control_frame)
+        process_control_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(process_control_frame, text="Thao tác với tiến trình đã chọn:").grid(row=0, column=0, padx=5, pady=5)
+        ttk.Button(process_control_frame, text="Chạy", command=lambda: self.change_process_state(ProcessState.RUNNING)).grid(row=0, column=1, padx=5, pady=5)
+        ttk.Button(process_control_frame, text="Chờ I/O", command=lambda: self.change_process_state(ProcessState.WAITING)).grid(row=0, column=2, padx=5, pady=5)
+        ttk.Button(process_control_frame, text="Sẵn sàng", command=lambda: self.change_process_state(ProcessState.READY)).grid(row=0, column=3, padx=5, pady=5)
+        ttk.Button(process_control_frame, text="Kết thúc", command=lambda: self.change_process_state(ProcessState.TERMINATED)).grid(row=0, column=4, padx=5, pady=5)
+        
+        ttk.Label(process_control_frame, text="ID:").grid(row=0, column=5, padx=5, pady=5)
+        self.find_pid_var = tk.StringVar()
+        ttk.Entry(process_control_frame, textvariable=self.find_pid_var, width=10).grid(row=0, column=6, padx=5, pady=5)
+        ttk.Button(process_control_frame, text="Tìm", command=self.find_process).grid(row=0, column=7, padx=5, pady=5)
+        
+        # Frame trạng thái hệ thống
+        stats_frame = ttk.LabelFrame(self.root, text="Trạng thái hệ thống")
+        stats_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.stats_vars = {
+            "total": tk.StringVar(value="Tổng số: 0"),
+            "ready": tk.StringVar(value="Sẵn sàng: 0"),
+            "running": tk.StringVar(value="Đang chạy: 0"),
+            "waiting": tk.StringVar(value="Đang đợi: 0"),
+            "terminated": tk.StringVar(value="Đã kết thúc: 0")
+        }
+        
+        stats_inner_frame = ttk.Frame(stats_frame)
+        stats_inner_frame.pack(fill="x", padx=5, pady=5)
+        
+        col = 0
+        for key, var in self.stats_vars.items():
+            ttk.Label(stats_inner_frame, textvariable=var).grid(row=0, column=col, padx=10, pady=5)
+            col += 1
+            
+        # Mức chiếm dụng của từng lõi CPU
+        self.cpu_status_var = tk.StringVar()
+        ttk.Label(stats_inner_frame, textvariable=self.cpu_status_var, wraplength=850,
+                  justify="left").grid(row=1, column=0, columnspan=col, sticky="w", padx=10, pady=5)
+        
+        # Bảng chỉ số lập lịch
+        metrics_frame = ttk.LabelFrame(self.root, text="Chỉ số lập lịch")
+        metrics_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.metrics_vars = {
+            "system": tk.StringVar(),
+            "turnaround": tk.StringVar(),
+            "response": tk.StringVar(),
+            "ready_wait": tk.StringVar(),
+        }
+        for row, var in enumerate(self.metrics_vars.values()):
+            ttk.Label(metrics_frame, textvariable=var).grid(row=row // 2, column=row % 2, sticky="w", padx=10, pady=2)
+            
+        # Notebook để hiển thị các danh sách tiến trình
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(expand=True, fill="both", padx=10, pady=5)
+        
+        # Tạo tab cho tất cả các tiến trình
+        all_processes_frame = ttk.Frame(self.notebook)
+        self.notebook.add(all_processes_frame, text="Tất cả tiến trình")
+        
+        # Tạo bảng tiến trình
+        self.process_table = self.create_process_table(all_processes_frame)
+        
+        # Tab cho các tiến trình theo trạng thái
+        self.ready_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.ready_frame, text="Sẵn sàng")
+        
+        self.running_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.running_frame, text="Đang chạy")
+        
+        self.waiting_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.waiting_frame, text="Đang đợi")
+        
+        self.terminated_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.terminated_frame, text="Đã kết thúc")
+        
+        # Tạo các bảng cho từng trạng thái
+        self.state_tables = {
+            ProcessState.READY: self.create_process_table(self.ready_frame, ProcessState.READY),
+            ProcessState.RUNNING: self.create_process_table(self.running_frame, ProcessState.RUNNING),
+            ProcessState.WAITING: self.create_process_table(self.waiting_frame, ProcessState.WAITING),
+            ProcessState.TERMINATED: self.create_process_table(self.terminated_frame, ProcessState.TERMINATED),
+        }
+        
+        # Tab biểu đồ Gantt: tiến trình nào giữ lõi nào theo thời gian
+        self.gantt_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.gantt_frame, text="Gantt")
+        self.gantt_view = GanttView(self.gantt_frame, self.gantt_history, self.process_manager.scheduler_lock,
+                                    on_select=self.on_gantt_select)
+        
+        # Tab hệ thống: tiến trình thật của máy đọc từ /proc, chỉ lấy mẫu khi tab đang mở
+        self.system_monitor = SystemMonitor()
+        self.monitor_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.monitor_frame, text="Hệ thống")
+        self.host_table = VirtualTable(
+            self.monitor_frame, HOST_COLUMNS, HOST_HEADINGS, HOST_SORT_KEYS,
+            lookup=self.system_monitor.processes.get,
+            format_row=self.format_host_row,
+            tag_of=lambda p: HOST_STATES.get(p.state, ("", "ready"))[1],
+            tag_colors=STATE_TAG_COLORS,
+            sort_column="cpu_percent",
+            descending=True,
+        )
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # Thanh trạng thái
+        self.status_var = tk.StringVar(value="Hệ thống đang chạy...")
+        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Cập nhật giao diện
+        self.update_ui()
+        
+    def create_process_table(self, parent, state=None):
+        """Tạo bảng tiến trình ảo cho một tab (state: chỉ hiện tiến trình ở trạng thái này)"""
+        return VirtualTable(
+            parent, PROCESS_COLUMNS, PROCESS_HEADINGS, PROCESS_SORT_KEYS,
+            lookup=self.process_manager.get_process_by_pid,
+            format_row=self.format_process_row,
+            row_filter=(lambda p: p.state == state) if state else None,
+            tag_of=lambda p: p.state.name.lower(),
+            tag_colors=STATE_TAG_COLORS,
+            sort_column="creation_time",
+            on_select=self.on_table_select if state else None,
+        )
+    
+    def on_table_select(self, pid):
+        """Xử lý khi chọn một tiến trình trong tab theo trạng thái"""
+        # Chọn tiến trình tương ứng trong tab tất cả tiến trình
+        self.process_table.select(pid)
+    
+    def on_tab_changed(self, event=None):
+        """Vẽ lại Gantt khi mở lại tab, chỉ đọc /proc khi tab Hệ thống đang mở"""
+        self.gantt_view.invalidate()
+        if self.notebook.select() == str(self.monitor_frame):
+            if not self.system_monitor.available:
+                self.status_var.set("Không có /proc: tab Hệ thống chỉ dùng được trên Linux")
+            else:
+                # Gán callback trước khi chạy luồng để lượt lấy mẫu đầu tiên cũng báo giao diện
+                self.system_monitor.update_callback = self.ui_pipeline.notify
+                self.system_monitor.start()
+        else:
+            self.system_monitor.stop()
+    
+    def on_gantt_select(self, pid):
+        """Xử lý khi nhấn vào một đoạn trên biểu đồ Gantt"""
+        self.notebook.select(0)
+        self.process_table.select(pid)
+    
+    def find_process(self):
+        """Tìm tiến trình theo ID và cuộn tới dòng của nó"""
+        pid = self.find_pid_var.get().strip()
+        try:
+            pid = int(pid)
+        except ValueError:
+            messagebox.showerror("Lỗi", "PID phải là số nguyên!")
+            return
+        if self.process_manager.get_process_by_pid(pid) is None:
+            messagebox.showerror("Lỗi", f"Không tìm thấy tiến trình {pid}!")
+            return
+        self.notebook.select(0)
+        self.process_table.select(pid)
+    
+    def start_scheduler(self):
+        """Bắt đầu bộ lập lịch"""
+        if self.process_manager.start_scheduler():
+            self.scheduler_status_var.set("Scheduler: Đang chạy")
+            self.start_scheduler_btn.config(state="disabled")
+            self.stop_scheduler_btn.config(state="normal")
+            self.status_var.set("Đã bắt đầu bộ lập lịch tiến trình")
+    
+    def stop_scheduler(self):
+        """Dừng bộ lập lịch"""
+        if self.process_manager.stop_scheduler():
+            self.scheduler_status_var.set("Scheduler: Dừng")
+            self.start_scheduler_btn.config(state="normal")
+            self.stop_scheduler_btn.config(state="disabled")
+            self.status_var.set("Đã dừng bộ lập lịch tiến trình")
+    
+    def set_time_slice(self):
+        """Thiết lập time slice mới"""
+        try:
+            time_slice = int(self.time_slice_var.get())
+            if time_slice <= 0:
+                messagebox.showerror("Lỗi", "Time slice phải là số dương!")
+                return
+                
+            self.process_manager.submit(self.process_manager.set_time_slice, time_slice)
+            self.status_var.set(f"Đã đặt time slice = {time_slice}")
+        except ValueError:
+            messagebox.showerror("Lỗi", "Time slice phải là số nguyên!")
+        
+    def set_policy(self, event=None):
+        """Đổi chính sách lập lịch theo lựa chọn của người dùng"""
+        name = self.policy_var.get()
+        self.process_manager.submit(self.process_manager.set_policy, SCHEDULING_POLICIES[name])
+        self.status_var.set(f"Đã chuyển sang chính sách {name}")
+        self.ui_pipeline.notify()
+        
+    def set_cpu_count(self):
+        """Thiết lập số lõi CPU"""
+        try:
+            num_cpus = int(self.cpu_count_var.get())
+            if not 1 <= num_cpus <= 64:
+                messagebox.showerror("Lỗi", "Số CPU phải nằm trong khoảng 1-64!")
+                return
+                
+            self.process_manager.submit(self.process_manager.set_cpu_count, num_cpus)
+            self.status_var.set(f"Đã đặt số CPU = {num_cpus}")
+        except ValueError:
+            messagebox.showerror("Lỗi", "Số CPU phải là số nguyên!")
+        
+    def create_process(self):
+        """Xử lý sự kiện tạo tiến trình mới"""
+        name = self.process_name_var.get().strip()
+        if not name:
+            messagebox.showerror("Lỗi", "Vui lòng nhập tên tiến trình!")
+            return
+            
+        try:
+            burst_time = int(self.burst_time_var.get().strip())
+            if burst_time <= 0:
+                messagebox.showerror("Lỗi", "Thời gian xử lý phải là số dương!")
+                return
+        except ValueError:
+            messagebox.showerror("Lỗi", "Thời gian xử lý phải là số nguyên!")
+            return
+        
+        priority_str = self.priority_var.get()
+        priority = next((p for p in ProcessPriority if p.value == priority_str), ProcessPriority.MEDIUM)
+        
+        self.process_manager.submit(self.process_manager.create_process, name, priority, burst_time)
+        self.process_name_var.set("")
+        self.burst_time_var.set("5")
+        self.ui_pipeline.notify()
+        
+    def create_random_processes(self):
+        """Tạo nhiều tiến trình ngẫu nhiên"""
+        count = simpledialog.askinteger("Tạo tiến trình", "Số lượng tiến trình muốn tạo:", initialvalue=5, minvalue=1, maxvalue=1000000)
+        if count is None:
+            return
+            
+        process_names = [
+            "Chrome", "Firefox", "Word", "Excel", "Photoshop", 
+            "Notepad", "Calculator", "Explorer", "VSCode", "Spotify",
+            "Discord", "Steam", "Skype", "Outlook", "OneDrive",
+            "Teams", "Zoom", "Slack", "WhatsApp", "Telegram"
+        ]
+        
+        # Độ ưu tiên, thời gian chạy và thời điểm đến lấy từ mô hình workload của bộ quản lý
+        self.process_manager.submit(self.process_manager.create_random_processes, count, process_names)
+        
+        self.ui_pipeline.notify()
+    
+    def load_workload(self):
+        """Nạp tiến trình từ tệp workload CSV hoặc JSONL"""
+        path = filedialog.askopenfilename(
+            title="Nạp workload",
+            filetypes=[("Workload", "*.csv *.jsonl *.ndjson"), ("Tất cả", "*.*")],
+        )
+        if not path:
+            return
+        # Nạp trên luồng scheduler (hoặc ngay nếu scheduler dừng), giao diện không bị chặn
+        future = self.process_manager.submit(self.process_manager.schedule_arrivals, load_workload(path))
+        self.status_var.set(f"Đang nạp workload từ {path}...")
+        
+        def done(future):
+            try:
+                count = future.result()
+            except (OSError, ValueError, KeyError) as e:
+                messagebox.showerror("Lỗi", f"Không đọc được workload: {e}")
+                return
+            self.status_var.set(f"Đã nạp {count} tiến trình từ {path}")
+            self.ui_pipeline.notify()
+        
+        self.when_done(future, done)
+    
+    def save_checkpoint(self):
+        """Ghi checkpoint ra tệp, các lần lưu tiếp theo vào cùng tệp chỉ nối thêm phần thay đổi"""
+        path = filedialog.asksaveasfilename(
+            title="Lưu checkpoint",
+            defaultextension=".ckpt",
+            filetypes=[("Checkpoint", "*.ckpt"), ("Tất cả", "*.*")],
+        )
+        if not path:
+            return
+        # Ghi trên luồng riêng: luồng scheduler chỉ bị chặn trong hai lần chụp ngắn dưới khóa
+        future = self.process_manager.checkpoint_in_background(path)
+        self.status_var.set(f"Đang lưu checkpoint vào {path}...")
+        
+        def done(future):
+            try:
+                size = future.result()
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Lỗi", f"Không lưu được checkpoint: {e}")
+                return
+            self.status_var.set(f"Đã lưu checkpoint ({size / 1024:.0f} KB) vào {path}")
+        
+        self.when_done(future, done)
+    
+    def restore_checkpoint(self):
+        """Khôi phục trạng thái từ tệp checkpoint (scheduler phải đang dừng)"""
+        if self.process_manager.scheduler_running:
+            messagebox.showwarning("Cảnh báo", "Vui lòng dừng scheduler trước khi khôi phục checkpoint!")
+            return
+        path = filedialog.askopenfilename(
+            title="Khôi phục checkpoint",
+            filetypes=[("Checkpoint", "*.ckpt"), ("Tất cả", "*.*")],
+        )
+        if not path:
+            return
+        manager = self.process_manager
+        try:
+            manager.restore_checkpoint(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Lỗi", f"Không đọc được checkpoint: {e}")
+            return
+        
+        # Dựng lại chỉ mục các bảng một lần thay vì cập nhật từng tiến trình
+        items = [(process.pid, process) for process in manager.get_all_processes()]
+        self.process_table.reset(items)
+        for table in self.state_tables.values():
+            table.reset(items)
+        # Lịch sử Gantt bắt đầu lại từ thời điểm của checkpoint
+        with manager.scheduler_lock:
+            self.gantt_history.clear()
+            for cpu in manager.cpus:
+                if cpu.running is not None:
+                    self.gantt_history.record(cpu.running, ProcessState.READY, ProcessState.RUNNING, manager.engine.now)
+        self.gantt_view.invalidate()
+        
+        self.time_slice_var.set(str(manager.time_slice))
+        self.policy_var.set(manager.policy_factory.name)
+        self.cpu_count_var.set(str(len(manager.cpus)))
+        self.update_ui()
+        self.status_var.set(f"Đã khôi phục {len(items)} tiến trình từ {path}")
+    
+    def when_done(self, future, callback):
+        """Gọi callback(future) trên luồng Tk khi lệnh gửi cho scheduler hoàn tất"""
+        if future.done():
+            callback(future)
+        else:
+            self.root.after(50, self.when_done, future, callback)
+        
+    def change_process_state(self, new_state):
+        """Thay đổi trạng thái của tiến trình được chọn"""
+        pid = self.process_table.selected_id
+        if pid is None:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn một tiến trình!")
+            return
+        
+        def done(future):
+            if future.result():
+                self.ui_pipeline.notify()
+            else:
+                messagebox.showerror("Lỗi", f"Không thể chuyển tiến trình sang trạng thái {new_state.value}!")
+        
+        self.when_done(self.process_manager.submit(self.process_manager.set_process_state, pid, new_state), done)
+            
+    def update_ui(self):
+        """Cập nhật giao diện người dùng"""
+        # Cập nhật thống kê
+        counts = self.process_manager.get_process_counts()
+        self.stats_vars["total"].set(f"Tổng số: {counts['total']}")
+        self.stats_vars["ready"].set(f"Sẵn sàng: {counts['ready']}")
+        self.stats_vars["running"].set(f"Đang chạy: {counts['running']}")
+        self.stats_vars["waiting"].set(f"Đang đợi: {counts['waiting']}")
+        self.stats_vars["terminated"].set(f"Đã kết thúc: {counts['terminated']}")
+        
+        # Cập nhật trạng thái từng lõi: tiến trình đang chạy [số tiến trình trong hàng đợi]
+        cores = " | ".join(
+            f"CPU{c['cpu']}: {c['running'] or 'rảnh'} [{c['queued']}]" for c in counts["cpus"]
+        )
+        self.cpu_status_var.set(f"{cores}  (di chuyển: {counts['migrations']}, lấy việc: {counts['steals']})")
+        
+        # Cập nhật các bảng tiến trình: chỉ xử lý những tiến trình đã thay đổi
+        changed = [(process.pid, process) for process in self.process_manager.drain_changes()]
+        # Tiến trình đã chuyển vào kho lưu trữ được gỡ khỏi các bảng
+        changed += [(pid, None) for pid in self.process_manager.drain_evicted()]
+        self.update_process_tree(self.process_table, changed)
+        
+        # Cập nhật danh sách theo trạng thái
+        for table in self.state_tables.values():
+            self.update_process_tree(table, changed)
+        
+        # Cập nhật tiêu đề các tab
+        self.notebook.tab(1, text=f"Sẵn sàng ({counts['ready']})")
+        self.notebook.tab(2, text=f"Đang chạy ({counts['running']})")
+        self.notebook.tab(3, text=f"Đang đợi ({counts['waiting']})")
+        self.notebook.tab(4, text=f"Đã kết thúc ({counts['terminated']})")
+        
+        # Bảng tiến trình thật: chỉ các tiến trình có giá trị thay đổi từ lượt đọc trước
+        host_changes = self.system_monitor.drain()
+        if host_changes:
+            self.host_table.update_many(host_changes)
+            self.host_table.redraw()
+            self.notebook.tab(self.monitor_frame, text=f"Hệ thống ({len(self.system_monitor.processes)})")
+        
+        # Biểu đồ Gantt chỉ vẽ khi tab đang mở
+        if self.notebook.select() == str(self.gantt_frame):
+            self.gantt_view.redraw(self.process_manager.engine.now, len(counts["cpus"]))
+        
+        # Cập nhật chỉ số lập lịch
+        metrics = self.process_manager.get_metrics()
+        self.metrics_vars["system"].set(
+            f"Hoàn thành: {metrics['completed']} | Thông lượng: {metrics['throughput']:.3f}/đv | "
+            f"CPU: {metrics['utilization']:.0%} | Chuyển ngữ cảnh: {metrics['context_switches']} | "
+            f"Chiếm quyền: {metrics['preemptions']} | Chặn I/O: {metrics['io_blocks']}"
+        )
+        self.metrics_vars["turnaround"].set(format_metric("Turnaround", metrics["turnaround"]))
+        self.metrics_vars["response"].set(format_metric("Phản hồi", metrics["response"]))
+        self.metrics_vars["ready_wait"].set(format_metric("Chờ ready", metrics["ready_wait"]))
+        
+        # Cập nhật thanh trạng thái
+        current_time = time.strftime("%H:%M:%S")
+        scheduler_status = "Đang chạy" if self.process_manager.scheduler_running else "Dừng"
+        self.status_var.set(f"Cập nhật lúc: {current_time} | Scheduler: {scheduler_status} | Tổng số tiến trình: {counts['total']}"
+                            + (f" | Đã lưu trữ: {counts['archived']}" if counts["archived"] else "")
+                            + (f" | Chờ đến: {counts['arriving']}" if counts["arriving"] else ""))
+        
+    def update_process_tree(self, table, changes):
+        """Áp dụng các cặp (pid, tiến trình) đã thay đổi vào chỉ mục của bảng và vẽ lại khung nhìn"""
+        table.update_many(changes)
+        table.redraw()
+            
+    def format_host_row(self, host_process):
+        """Giá trị các cột của một tiến trình thật"""
+        return (
+            host_process.pid,
+            host_process.name,
+            HOST_STATES.get(host_process.state, (host_process.state,))[0],
+            f"{host_process.cpu_percent:.1f}",
+            f"{host_process.rss / 1048576:.1f}",
+            host_process.cmdline,
+        )
+            
+    def format_process_row(self, process):
+        """Giá trị các cột của một tiến trình"""
+        creation_time = time.strftime("%H:%M:%S", time.localtime(self.process_manager.engine.epoch + process.creation_time))
+        return (
+            process.pid,
+            process.name,
+            process.state.value,
+            process.priority.value,
+            process.burst_time,
+            process.remaining_time,
+            creation_time
+        )
+        
+    def on_closing(self):
+        """Xử lý khi đóng ứng dụng"""
+        if messagebox.askokcancel("Thoát", "Bạn có muốn thoát không?"):
+            self.process_manager.stop_scheduler()
+            self.system_monitor.close()
+            self.ui_pipeline.stop()
+            self.root.destroy()
+
+# Hàm main để chạy ứng dụng
+def main():
+    root = tk.Tk()
+    app = ProcessManagerApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.mainloop()
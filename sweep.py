@@ -0,0 +1,183 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from process_manager import (
+    PRIORITY_CODES, PRIORITY_MIXES, SCHEDULING_POLICIES, ProcessManager, SchedulerMetrics, load_workload,
+)
+
+# Quét tham số song song: mỗi tổ hợp (chính sách, time slice, tỉ lệ độ ưu tiên, xác suất I/O, seed)
+# là một mô phỏng không giao diện chạy trên một tiến trình con của ProcessPoolExecutor.
+# Workload được ghi một lần vào bộ nhớ dùng chung dạng cột (mã độ ưu tiên, thời gian chạy),
+# các worker chỉ nhận tên vùng nhớ thay vì bản pickle của từng tiến trình.
+
+_HEADER = struct.Struct("<q")  # Số tiến trình
+_WORKLOAD = None  # Workload của worker, đọc một lần từ bộ nhớ dùng chung
+
+
+def share_workload(workload):
+    """Ghi workload [(tên, độ ưu tiên, thời gian chạy)] vào SharedMemory, trả về vùng nhớ"""
+    priorities = bytes(PRIORITY_CODES.index(priority) for _, priority, _ in workload)
+    bursts = [float(burst_time) if burst_time else 0.0 for _, _, burst_time in workload]
+    count = len(workload)
+    size = _HEADER.size + count * 8 + count
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    _HEADER.pack_into(shm.buf, 0, count)
+    offset = _HEADER.size
+    shm.buf[offset:offset + count * 8] = array("d", bursts).tobytes()
+    offset += count * 8
+    shm.buf[offset:offset + count] = priorities
+    return shm
+
+
+def read_workload(name):
+    """Đọc workload từ SharedMemory theo tên (dùng trong worker)"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        (count,) = _HEADER.unpack_from(shm.buf, 0)
+        offset = _HEADER.size
+        bursts = array("d")
+        bursts.frombytes(shm.buf[offset:offset + count * 8])
+        offset += count * 8
+        priorities = bytes(shm.buf[offset:offset + count])
+    finally:
+        shm.close()
+    return [(PRIORITY_CODES[code], burst_time or None) for code, burst_time in zip(priorities, bursts)]
+
+
+def _init_worker(name):
+    global _WORKLOAD
+    _WORKLOAD = read_workload(name)
+
+
+def run_case(params, workload=None, until=None):
+    """Chạy một mô phỏng với bộ tham số params, trả về (params, SchedulerMetrics, thời gian ảo)"""
+    workload = workload if workload is not None else _WORKLOAD
+    if params["mix"] != "workload":
+        # Gán lại độ ưu tiên theo tỉ lệ, cố định theo seed để mọi chính sách dùng cùng workload
+        rng = random.Random(params["seed"])
+        priorities = rng.choices(PRIORITY_CODES, weights=PRIORITY_MIXES[params["mix"]], k=len(workload))
+        workload = [(priority, burst_time) for priority, (_, burst_time) in zip(priorities, workload)]
+    manager = ProcessManager(seed=params["seed"], policy=SCHEDULING_POLICIES[params["policy"]],
+                             num_cpus=params["cpus"])
+    manager.set_time_slice(params["time_slice"])
+    manager.io_probability = params["io_probability"]
+    manager.create_processes((f"p{i}", priority, burst_time) for i, (priority, burst_time) in enumerate(workload))
+    manager.run(until=until)
+    return params, manager.metrics, manager.engine.now
+
+
+def build_grid(policies, time_slices, mixes, io_probabilities, cpus, seeds):
+    """Các bộ tham số của lưới quét"""
+    return [
+        {"policy": policy, "time_slice": time_slice, "mix": mix, "io_probability": io, "cpus": num_cpus, "seed": seed}
+        for policy, time_slice, mix, io, num_cpus, seed
+        in itertools.product(policies, time_slices, mixes, io_probabilities, cpus, range(seeds))
+    ]
+
+
+def case_key(params):
+    return (params["policy"], params["time_slice"], params["mix"], params["io_probability"], params["cpus"])
+
+
+def sweep(workload, grid, workers=None, until=None):
+    """Chạy cả lưới trên ProcessPoolExecutor, gộp chỉ số các seed của cùng một tổ hợp"""
+    merged = {}  # {tổ hợp: [SchedulerMetrics, tổng thời gian ảo, số lần chạy]}
+    shm = share_workload(workload)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shm.name,)) as pool:
+            futures = [pool.submit(run_case, params, None, until) for params in grid]
+            # Gộp theo thứ tự của lưới thay vì thứ tự hoàn thành: phép gộp số thực không kết hợp,
+            # nên bảng so sánh chỉ giống hệt nhau giữa các lần chạy khi thứ tự gộp cố định
+            for future in futures:
+                params, metrics, elapsed = future.result()
+                entry = merged.setdefault(case_key(params), [SchedulerMetrics(), 0.0, 0])
+                entry[0].merge(metrics)
+                entry[1] += elapsed
+                entry[2] += 1
+    finally:
+        shm.close()
+        shm.unlink()
+    return comparison_table(merged)
+
+
+def comparison_table(merged):
+    """Bảng so sánh: mỗi dòng là một tổ hợp tham số với chỉ số đã gộp qua các seed"""
+    rows = []
+    for key in sorted(merged):
+        metrics, elapsed, runs = merged[key]
+        policy, time_slice, mix, io, num_cpus = key
+        summary = metrics.summary(elapsed, num_cpus)
+        rows.append({
+            "policy": policy,
+            "time_slice": time_slice,
+            "mix": mix,
+            "io_probability": io,
+            "cpus": num_cpus,
+            "runs": runs,
+            "throughput": summary["throughput"],
+            "utilization": summary["utilization"],
+            "turnaround_mean": summary["turnaround"]["mean"],
+            "turnaround_p95": summary["turnaround"]["p95"],
+            "response_p95": summary["response"]["p95"],
+            "ready_wait_mean": summary["ready_wait"]["mean"],
+            "context_switches": metrics.context_switches / runs,
+            "preemptions": metrics.preemptions / runs,
+        })
+    return rows
+
+
+def print_table(rows):
+    if not rows:
+        return
+    columns = list(rows[0])
+    print("  ".join(f"{c:>15}" for c in columns))
+    for row in rows:
+        cells = [f"{v:.4g}" if isinstance(v, float) else str(v) for v in row.values()]
+        print("  ".join(f"{c:>15}" for c in cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quét tham số lập lịch song song trên nhiều lõi")
+    parser.add_argument("workload", nargs="?", help="Tệp workload CSV/JSONL (bỏ trống: sinh ngẫu nhiên)")
+    parser.add_argument("--random", type=int, default=1000, help="Số tiến trình khi sinh ngẫu nhiên")
+    parser.add_argument("--policies", nargs="+", choices=list(SCHEDULING_POLICIES), default=["Priority RR"])
+    parser.add_argument("--time-slices", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mixes", nargs="+", choices=["workload"] + list(PRIORITY_MIXES), default=["workload"])
+    parser.add_argument("--io", type=float, nargs="+", default=[0.2], help="Xác suất I/O sau mỗi đoạn chạy")
+    parser.add_argument("--cpus", type=int, nargs="+", default=[1])
+    parser.add_argument("--seeds", type=int, default=3, help="Số seed cho mỗi tổ hợp")
+    parser.add_argument("--until", type=float, help="Dừng mỗi mô phỏng tại thời điểm ảo này")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="Ghi bảng so sánh ra tệp JSON")
+    options = parser.parse_args(argv)
+
+    if options.workload:
+        workload = list(load_workload(options.workload))
+    else:
+        rng = random.Random(0)
+        workload = [(f"p{i}", rng.choice(PRIORITY_CODES), rng.randint(1, 10)) for i in range(options.random)]
+    grid = build_grid(options.policies, options.time_slices, options.mixes, options.io,
+                      options.cpus, options.seeds)
+
+    start = time.perf_counter()
+    rows = sweep(workload, grid, options.workers, options.until)
+    elapsed = time.perf_counter() - start
+    print_table(rows)
+    print(f"{len(grid)} mô phỏng, {options.workers} worker, {elapsed:.2f}s", file=sys.stderr)
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
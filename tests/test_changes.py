@@ -0,0 +1,57 @@
+import threading
+
+import process_manager.core as core
+from process_manager import ProcessManager, ProcessPriority
+
+
+def create(manager, count):
+    for i in range(count):
+        manager.create_process(f"p{i}", ProcessPriority.MEDIUM, 1 + i % 5)
+
+
+def test_changes_recorded_only_while_watched():
+    manager = ProcessManager(seed=1)
+    create(manager, 20)
+    manager.run(until=5)
+    assert manager.drain_changes() == [] and manager._changes is None
+    manager.watch_changes()
+    manager.run(until=10)
+    changed = manager.drain_changes()
+    assert changed and len({p.pid for p in changed}) == len(changed)
+    assert manager.drain_changes() == []
+
+
+def test_drain_does_not_wait_for_scheduler_lock():
+    manager = ProcessManager(seed=2)
+    manager.watch_changes()
+    create(manager, 10)
+    manager.set_retention(keep_last=2)
+    manager.run()
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with manager.scheduler_lock:
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait(5)
+    try:
+        # Luồng khác đang giữ khóa: giao diện vẫn lấy được thay đổi ngay
+        assert len(manager.drain_changes()) == 2
+        assert len(manager.drain_evicted()) == 8
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_overflow_returns_every_process(monkeypatch):
+    monkeypatch.setattr(core, "CHANGE_QUEUE_LIMIT", 8)
+    manager = ProcessManager(seed=3)
+    manager.watch_changes()
+    create(manager, 30)
+    # Hàng đợi chỉ giữ 8 pid cuối: mọi tiến trình được trả về để vẽ lại
+    assert len(manager.drain_changes()) == 30
+    manager.run(until=1)
+    assert 0 < len(manager.drain_changes()) <= 8
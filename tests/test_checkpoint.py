@@ -0,0 +1,161 @@
+import pytest
+
+from process_manager import (
+    SCHEDULING_POLICIES, ExponentialDistribution, ProcessManager, ProcessPriority, WorkloadModel,
+    read_checkpoint,
+)
+from process_manager.core import CHECKPOINT_BASE, CHECKPOINT_DELTA
+
+
+def state_of(manager):
+    """Trạng thái so sánh được của manager: mọi tiến trình theo pid, đồng hồ ảo và chỉ số"""
+    processes = sorted((p.pid, p.name, p.state, p.priority, p.burst_time, round(p.remaining_time, 9), p.start_time,
+                        p.end_time, p.io_deadline, p.cpu_id, p.waiting_reason) for p in manager.processes.values())
+    return processes, manager.engine.now, manager.get_metrics()
+
+
+def finished(manager):
+    """Kết quả sau khi chạy hết"""
+    return sorted((p.pid, p.name, p.state, p.start_time, p.end_time, p.cpu_id) for p in manager.processes.values())
+
+
+def make(policy, compact=False, seed=11):
+    model = WorkloadModel(io_duration=ExponentialDistribution(2), arrival=ExponentialDistribution(0.8))
+    manager = ProcessManager(seed=seed, num_cpus=3, policy=SCHEDULING_POLICIES[policy], compact=compact,
+                             model=model)
+    manager.io_probability = 0.3
+    manager.create_random_processes(300)
+    manager.schedule_arrivals([(f"late{i}", ProcessPriority.HIGH, None) for i in range(100)])
+    return manager
+
+
+def restored(path):
+    manager = ProcessManager()
+    manager.restore_checkpoint(path)
+    return manager
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["dict", "compact"])
+@pytest.mark.parametrize("policy", sorted(SCHEDULING_POLICIES))
+def test_base_and_delta_round_trip(tmp_path, policy, compact):
+    path = str(tmp_path / "run.ckpt")
+    manager = make(policy, compact)
+    for until in (20, 45, 70):
+        manager.run(until=until)
+        manager.checkpoint(path)
+        manager.checkpointer.rebase_ratio = float("inf")  # Giữ các khung sau ở dạng DELTA
+        copy = restored(path)
+        assert state_of(copy) == state_of(manager)
+    assert [frame[0] for frame in read_checkpoint(path)] == [CHECKPOINT_BASE, CHECKPOINT_DELTA, CHECKPOINT_DELTA]
+    # Chạy tiếp từ bản khôi phục cho kết quả giống hệt
+    manager.run()
+    copy.run()
+    assert finished(copy) == finished(manager)
+    assert copy.get_metrics() == manager.get_metrics()
+
+
+def test_rebase_after_large_deltas(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    manager = make("MLFQ")
+    manager.run(until=5)
+    manager.checkpoint(path)
+    manager.checkpointer.rebase_ratio = 0
+    manager.run(until=10)
+    manager.checkpoint(path)
+    manager.run(until=15)
+    manager.checkpoint(path)
+    assert [frame[0] for frame in read_checkpoint(path)] == [CHECKPOINT_BASE]
+    assert state_of(restored(path)) == state_of(manager)
+
+
+@pytest.mark.parametrize("policy", ["MLFQ", "Fair-share", "SRTF"])
+def test_changes_during_unlocked_read_are_captured(tmp_path, monkeypatch, policy):
+    path = str(tmp_path / "run.ckpt")
+    manager = make(policy)
+    manager.set_retention(keep_last=5)
+    read_rows = ProcessManager._process_rows
+    calls = []
+
+    def process_rows(self, items):
+        rows = read_rows(self, items)
+        calls.append(len(items))
+        if len(calls) % 2:
+            # Lần đọc đầu của mỗi checkpoint chạy ngoài khóa: mô phỏng luồng scheduler chạy tiếp
+            self.run(until=self.engine.now + 6)
+            self.create_random_processes(5)
+        return rows
+
+    monkeypatch.setattr(ProcessManager, "_process_rows", process_rows)
+    for until in (15, 30, 45):
+        manager.run(until=until)
+        manager.checkpoint(path)
+    monkeypatch.undo()
+    assert len(calls) == 6 and manager.archived
+    copy = restored(path)
+    assert state_of(copy) == state_of(manager)
+    manager.run()
+    copy.run()
+    assert finished(copy) == finished(manager)
+    assert copy.get_metrics() == manager.get_metrics()
+
+
+def test_pid_counter_belongs_to_the_manager(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    manager = make("RR")
+    manager.run(until=10)
+    manager.checkpoint(path)
+    # Manager khác tạo tiến trình và khôi phục checkpoint xen giữa không làm lệch pid của manager này
+    other = ProcessManager(seed=3)
+    other.create_random_processes(50)
+    copy = restored(path)
+    assert [p.pid for p in other.processes.values()] == list(range(1, 51))
+    for target in (manager, copy, other):
+        target.create_process("extra", ProcessPriority.LOW, 2)
+    assert manager.processes.keys() == copy.processes.keys()
+    assert max(other.processes) == 51
+
+
+def test_checkpoint_in_background(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    manager = make("Fair-share", compact=True)
+    manager.run(until=30)
+    future = manager.checkpoint_in_background(path)
+    assert future.result(timeout=30) > 0
+    assert state_of(restored(path)) == state_of(manager)
+
+
+def test_delta_records_evicted_processes(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    manager = ProcessManager(seed=6, num_cpus=2)
+    manager.create_random_processes(150)
+    manager.run(until=40)
+    manager.checkpoint(path)
+    manager.set_retention(keep_last=10)
+    manager.run(until=120)
+    manager.checkpoint(path)
+    assert [frame[0] for frame in read_checkpoint(path)] == [CHECKPOINT_BASE, CHECKPOINT_DELTA]
+    copy = restored(path)
+    assert sorted(copy.processes) == sorted(manager.processes)
+    assert state_of(copy) == state_of(manager)
+
+
+def test_memory_archive_round_trip(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    manager = ProcessManager(seed=8, num_cpus=2)
+    manager.create_random_processes(200)
+    manager.set_retention(keep_last=10, archive=":memory:")
+    manager.run(until=300)
+    manager.checkpoint(path)
+    archived = manager.archived
+    manager.checkpointer.rebase_ratio = float("inf")
+    manager.run()
+    manager.checkpoint(path)
+    assert [frame[0] for frame in read_checkpoint(path)] == [CHECKPOINT_BASE, CHECKPOINT_DELTA]
+    # Kho trong bộ nhớ không có tệp riêng: các tiến trình đã lưu trữ phải nằm trong checkpoint
+    copy = restored(path)
+    assert 0 < archived < manager.archived and len(copy.archive) == len(manager.archive) == manager.archived
+    for pid in range(1, 201):
+        original, restored_process = manager.get_process_by_pid(pid), copy.get_process_by_pid(pid)
+        assert (original is None) == (restored_process is None)
+        if original is not None:
+            assert vars(restored_process) == vars(original)
@@ -0,0 +1,60 @@
+from process_manager import EventType, SimulationEngine
+
+
+def test_order_cancel_and_until():
+    seen = []
+    engine = SimulationEngine(lambda event_type, payload: seen.append(payload), start_time=0.0)
+    engine.schedule(2, EventType.DISPATCH, "b")
+    engine.schedule(1, EventType.DISPATCH, "a")
+    engine.schedule(2, EventType.DISPATCH, "c")
+    cancelled = engine.schedule(1.5, EventType.DISPATCH, "cancelled")
+    engine.cancel(cancelled)
+    assert engine.next_time() == 1
+    assert engine.run(until=1.5) == 1
+    assert engine.now == 1.5
+    assert engine.run(max_events=1) == 1
+    assert seen == ["a", "b"]
+    assert engine.run() == 1
+    assert seen[-1] == "c" and engine.now == 2
+    assert engine.next_time() is None and not engine.step()
+
+
+def test_events_scheduled_by_handler():
+    times = []
+
+    def handler(event_type, payload):
+        times.append(engine.now)
+        if payload:
+            engine.schedule(0.5, EventType.SLICE_END, payload - 1)
+
+    engine = SimulationEngine(handler, start_time=10.0)
+    engine.schedule(0, EventType.DISPATCH, 3)
+    assert engine.run() == 4
+    assert times == [10.0, 10.5, 11.0, 11.5]
+
+
+def test_urgent_events_run_first_at_same_time():
+    seen = []
+    engine = SimulationEngine(lambda event_type, payload: seen.append(payload), start_time=0.0)
+    engine.schedule(1, EventType.DISPATCH, "normal")
+    engine.schedule(1, EventType.IO_COMPLETE, "urgent", urgent=True)
+    engine.schedule(0.5, EventType.DISPATCH, "early")
+    engine.run()
+    assert seen == ["early", "urgent", "normal"]
+
+
+def test_snapshot_round_trip():
+    seen = []
+    engine = SimulationEngine(lambda event_type, payload: seen.append((engine.now, event_type, payload)))
+    for i in range(20):
+        engine.schedule(i % 7, list(EventType)[i % len(EventType)], i, urgent=i % 5 == 0)
+    engine.run(until=2)
+    state, arrays = engine.snapshot(lambda payload: payload)
+    copy_seen = []
+    copy = SimulationEngine(lambda event_type, payload: copy_seen.append((copy.now, event_type, payload)))
+    copy.restore(state, arrays, lambda payload: payload)
+    assert copy.now == engine.now
+    expected = seen[:]
+    engine.run()
+    copy.run()
+    assert expected + copy_seen == seen
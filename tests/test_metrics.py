@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from process_manager import ProcessManager, ProcessPriority, QuantileSketch, RunningStats
+
+
+def test_quantile_sketch_relative_accuracy():
+    rng = random.Random(2)
+    values = [rng.lognormvariate(2, 1.2) for _ in range(20000)] + [0.0] * 500
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    values.sort()
+    for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.0101, abs=1e-9)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_quantile_sketch_merge_and_collapse():
+    rng = random.Random(3)
+    values = [rng.expovariate(0.1) for _ in range(5000)]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+    assert left.count == whole.count and left.buckets == whole.buckets
+    small = QuantileSketch(max_buckets=64)
+    for value in values:
+        small.add(value)
+    assert len(small.buckets) <= 64
+    # Chỉ đuôi thấp bị gộp, phân vị cao vẫn đúng sai số tương đối
+    assert small.quantile(0.99) == pytest.approx(whole.quantile(0.99))
+
+
+def test_running_stats_merge():
+    rng = random.Random(4)
+    values = [rng.gauss(10, 3) for _ in range(1000)]
+    whole, left, right = RunningStats(), RunningStats(), RunningStats()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i < 300 else right).add(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.stdev == pytest.approx(whole.stdev)
+    assert (left.min, left.max) == (min(values), max(values))
+
+
+def test_manager_metrics_match_processes():
+    manager = ProcessManager(seed=6, num_cpus=2)
+    manager.io_probability = 0.3
+    rng = random.Random(6)
+    for i in range(400):
+        manager.create_process(f"p{i}", rng.choice(list(ProcessPriority)), rng.randint(1, 10))
+    manager.run()
+    metrics = manager.get_metrics()
+    processes = list(manager.processes.values())
+    assert metrics["completed"] == 400
+    assert metrics["utilization"] == pytest.approx(sum(p.burst_time for p in processes) / (2 * manager.engine.now))
+    turnaround = [p.end_time - p.creation_time for p in processes]
+    response = [p.start_time - p.creation_time for p in processes]
+    assert metrics["turnaround"]["mean"] == pytest.approx(sum(turnaround) / 400)
+    assert metrics["response"]["mean"] == pytest.approx(sum(response) / 400)
+    assert metrics["turnaround"]["max"] == pytest.approx(max(turnaround))
+    assert metrics["turnaround"]["p50"] == pytest.approx(sorted(turnaround)[199], rel=0.0101)
@@ -0,0 +1,68 @@
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from monte_carlo import BATCH_POLICIES, BatchSimulator  # noqa: E402
+from process_manager import (  # noqa: E402
+    SCHEDULING_POLICIES, FixedDistribution, ProcessManager, ProcessPriority, WorkloadModel,
+)
+
+INTERARRIVAL = 2
+
+
+def make_workload(count, seed):
+    rng = random.Random(seed)
+    return [(rng.choice(list(ProcessPriority)), rng.randint(1, 10)) for _ in range(count)]
+
+
+def scalar_run(workload, policy, time_slice, io_probability, seed):
+    """Chạy workload trên ProcessManager, tiến trình thứ i đến tại (i + 1) * INTERARRIVAL"""
+    manager = ProcessManager(seed=seed, policy=SCHEDULING_POLICIES[policy],
+                             model=WorkloadModel(arrival=FixedDistribution(INTERARRIVAL)))
+    manager.set_time_slice(time_slice)
+    manager.io_probability = io_probability
+    manager.schedule_arrivals([(f"p{i}", priority, burst) for i, (priority, burst) in enumerate(workload)])
+    manager.run()
+    processes = sorted(manager.processes.values(), key=lambda p: int(p.name[1:]))
+    return ([p.end_time - p.creation_time for p in processes], [p.start_time - p.creation_time for p in processes])
+
+
+def batch_workload(workload):
+    return [(priority, burst, (i + 1) * INTERARRIVAL) for i, (priority, burst) in enumerate(workload)]
+
+
+@pytest.mark.parametrize("time_slice", [1, 3])
+@pytest.mark.parametrize("policy", sorted(BATCH_POLICIES))
+def test_matches_engine_without_io(policy, time_slice):
+    # Không có I/O thì cả hai đều tất định: từng tiến trình phải kết thúc đúng cùng thời điểm
+    workload = make_workload(80, seed=5)
+    turnaround, response = scalar_run(workload, policy, time_slice, 0.0, seed=1)
+    result = BatchSimulator(batch_workload(workload), replicas=2, policy=policy, time_slice=time_slice,
+                            io_probability=0.0, seed=1).run()
+    for replica in range(2):
+        assert result.turnaround[replica].tolist() == turnaround
+        assert result.response[replica].tolist() == response
+
+
+@pytest.mark.parametrize("policy", ["Priority RR", "SJF"])
+def test_matches_engine_statistically(policy):
+    workload = make_workload(40, seed=7)
+    runs = [scalar_run(workload, policy, 2, 0.3, seed) for seed in range(150)]
+    scalar = {"turnaround": [sum(t) / len(t) for t, _ in runs], "response": [sum(r) / len(r) for _, r in runs]}
+    result = BatchSimulator(batch_workload(workload), replicas=600, policy=policy, time_slice=2,
+                            io_probability=0.3, seed=3).run()
+    batch = {"turnaround": result.mean_turnaround(), "response": result.mean_response()}
+    for metric in ("turnaround", "response"):
+        a, b = np.asarray(scalar[metric]), np.asarray(batch[metric])
+        # Trung bình của hai mẫu độc lập lệch nhau không quá 4 sai số chuẩn
+        error = math.sqrt(a.var(ddof=1) / len(a) + b.var(ddof=1) / len(b))
+        assert abs(a.mean() - b.mean()) <= 4 * error, metric
+
+
+def test_rejects_unsupported_policies():
+    for policy in set(SCHEDULING_POLICIES) - set(BATCH_POLICIES):
+        with pytest.raises(ValueError):
+            BatchSimulator([(ProcessPriority.HIGH, 3)], policy=policy)
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from process_manager import (
+    SCHEDULING_POLICIES, FairSharePolicy, FCFSPolicy, MLFQPolicy, PriorityRoundRobinPolicy, Process,
+    ProcessManager, ProcessPriority, ProcessState, RoundRobinPolicy, SJFPolicy, SRTFPolicy,
+)
+
+
+def process(name, priority=ProcessPriority.MEDIUM, burst_time=5):
+    return Process(name, priority, burst_time=burst_time)
+
+
+def drain(policy):
+    return [policy.pop().name for _ in range(len(policy))]
+
+
+def test_priority_round_robin_and_round_robin():
+    specs = (("low", ProcessPriority.LOW), ("high", ProcessPriority.HIGH), ("mid", ProcessPriority.MEDIUM))
+    priority_rr, rr = PriorityRoundRobinPolicy(), RoundRobinPolicy()
+    for name, priority in specs:
+        priority_rr.add(process(name, priority))
+        rr.add(process(name, priority))
+    assert drain(priority_rr) == ["high", "mid", "low"]
+    assert drain(rr) == ["low", "high", "mid"]
+
+
+def test_sjf_and_srtf():
+    policy = SJFPolicy()
+    for name, burst in (("long", 9), ("short", 2), ("mid", 5)):
+        policy.add(process(name, burst_time=burst))
+    assert policy.quantum(policy.peek(), 1) is None
+    assert drain(policy) == ["short", "mid", "long"]
+
+    srtf = SRTFPolicy()
+    running, candidate = process("running", burst_time=8), process("candidate", burst_time=3)
+    running.remaining_time = 2
+    assert not srtf.should_preempt(running, candidate)
+    running.remaining_time = 4
+    assert srtf.should_preempt(running, candidate)
+
+
+def test_fcfs_keeps_arrival_order():
+    policy = FCFSPolicy()
+    for name, priority in (("a", ProcessPriority.LOW), ("b", ProcessPriority.HIGH), ("c", ProcessPriority.MEDIUM)):
+        policy.add(process(name, priority))
+    assert policy.quantum(policy.peek(), 1) is None
+    assert drain(policy) == ["a", "b", "c"]
+
+
+def test_mlfq_demotes_on_expiry_and_boosts():
+    policy = MLFQPolicy(quanta=(1, 2, 4), boost_interval=10)
+    hog, interactive = process("hog"), process("interactive")
+    policy.add(hog)
+    policy.add(interactive)
+    assert policy.pop() is hog
+    policy.requeue(hog, expired=True)
+    assert policy.level(hog) == 1 and policy.quantum(hog, 2) == 4
+    assert policy.should_preempt(hog, interactive)
+    assert policy.pop() is interactive
+    policy.requeue(interactive, expired=False)
+    assert policy.level(interactive) == 0
+    assert drain(policy) == ["interactive", "hog"]
+    policy.add(hog)
+    policy.requeue(policy.pop(), expired=True)
+    assert policy.level(hog) == 2
+    policy.account(hog, 10)  # Đủ boost_interval: mọi tiến trình trở về mức cao nhất
+    assert policy.level(hog) == 0 and hog in policy
+
+
+def test_fair_share_weights_vruntime_by_priority():
+    policy = FairSharePolicy(granularity=1)
+    high, low = process("high", ProcessPriority.HIGH), process("low", ProcessPriority.LOW)
+    policy.add(high)
+    policy.add(low)
+    policy.account(high, 4)
+    policy.account(low, 4)
+    assert policy.vruntime[high.pid] == 1 and policy.vruntime[low.pid] == 4
+    policy.remove(high)
+    policy.remove(low)
+    policy.add(high)
+    policy.add(low)
+    assert drain(policy) == ["high", "low"]
+    assert policy.should_preempt(low, high)
+    assert not policy.should_preempt(high, low)
+
+
+@pytest.mark.parametrize("policy", sorted(SCHEDULING_POLICIES))
+def test_every_policy_finishes_workload(policy):
+    manager = ProcessManager(seed=1, policy=SCHEDULING_POLICIES[policy])
+    manager.io_probability = 0.2
+    rng = random.Random(1)
+    priorities = list(ProcessPriority)
+    for i in range(200):
+        manager.create_process(f"p{i}", rng.choice(priorities), rng.randint(1, 10))
+    manager.run()
+    processes = list(manager.processes.values())
+    assert all(p.state is ProcessState.TERMINATED and p.remaining_time == 0 for p in processes)
+    assert all(p.end_time >= p.start_time >= p.creation_time for p in processes)
+
+
+@pytest.mark.parametrize("policy", sorted(SCHEDULING_POLICIES))
+def test_batch_creation_matches_one_by_one(policy):
+    rng = random.Random(4)
+    specs = [(f"p{i}", rng.choice(list(ProcessPriority)), rng.randint(1, 10)) for i in range(300)]
+    results = []
+    for batched in (False, True):
+        manager = ProcessManager(seed=2, num_cpus=3, policy=SCHEDULING_POLICIES[policy])
+        manager.create_processes(specs[:100])
+        manager.run(until=20)
+        # Lô mới đến khi các lõi đang bận: chiếm quyền và chọn lõi như khi thêm từng tiến trình
+        if batched:
+            manager.create_processes(specs[100:])
+        else:
+            for spec in specs[100:]:
+                manager.create_process(*spec)
+        manager.run()
+        results.append(sorted((p.pid, p.start_time, p.end_time, p.cpu_id) for p in manager.processes.values()))
+    assert results[0] == results[1]
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from process_manager import SCHEDULING_POLICIES, ProcessManager, ProcessPriority, ProcessState, ProcessTable
+
+
+def test_views_read_and_write_columns():
+    table = ProcessTable()
+    views = [table.add(f"p{i}", ProcessPriority.HIGH, burst_time=3, creation_time=0.0) for i in range(5)]
+    assert [view.pid for view in views] == [1, 2, 3, 4, 5]
+    assert table[3] is views[2] and 3 in table and 6 not in table and table.get(0) is None
+    with pytest.raises(KeyError):
+        table[6]
+    view = views[1]
+    assert view.name == "p1" and view.priority is ProcessPriority.HIGH and view.get_priority_value() == 1
+    assert view.start_time is None and view.cpu_id is None and view.waiting_reason is None
+    assert view.start(now=2.0) and view.state is ProcessState.RUNNING and view.start_time == 2.0
+    assert view.wait("Đĩa") and view.waiting_reason == "Đĩa" and view.state is ProcessState.WAITING
+    assert view.resume() and view.waiting_reason is None
+    view.start(now=6.0)
+    view.cpu_id = 2
+    assert view.execute(10, now=9.0) == 3 and view.state is ProcessState.TERMINATED
+    assert (view.start_time, view.end_time, view.cpu_id, view.remaining_time) == (2.0, 9.0, 2, 0)
+    assert list(table) == [1, 2, 3, 4, 5] and list(table.values()) == views
+
+
+def run(policy, compact):
+    manager = ProcessManager(seed=5, policy=SCHEDULING_POLICIES[policy], num_cpus=2, compact=compact)
+    manager.io_probability = 0.3
+    rng = random.Random(5)
+    priorities = list(ProcessPriority)
+    for i in range(300):
+        manager.create_process(f"p{i}", rng.choice(priorities), rng.randint(1, 10))
+    manager.run()
+    return sorted((p.name, p.state, p.start_time, p.end_time, p.cpu_id) for p in manager.processes.values())
+
+
+@pytest.mark.parametrize("policy", sorted(SCHEDULING_POLICIES))
+def test_compact_table_schedules_like_dict(policy):
+    assert run(policy, compact=True) == run(policy, compact=False)
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from process_manager import ProcessArchive, ProcessManager, ProcessPriority, ProcessState
+
+
+def create_workload(manager, count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        manager.create_process(f"p{i}", rng.choice(list(ProcessPriority)), rng.randint(1, 10))
+
+
+def test_retention_keeps_last_and_archives(tmp_path):
+    manager = ProcessManager(seed=2, num_cpus=2)
+    create_workload(manager, 200, 2)
+    manager.set_retention(keep_last=25, archive=str(tmp_path / "archive.db"))
+    manager.watch_changes()
+    manager.run()
+    terminated = manager.state_index[ProcessState.TERMINATED]
+    assert len(manager.processes) == len(terminated) == 25
+    assert manager.archived == 175 and len(manager.archive) == 175
+    evicted = manager.drain_evicted()
+    assert len(evicted) == 175 and not set(evicted) & set(manager.processes)
+    # Tiến trình bị loại vẫn tra được qua kho lưu trữ
+    process = manager.get_process_by_pid(evicted[0])
+    assert process.state is ProcessState.TERMINATED and process.remaining_time == 0
+    # Các tiến trình còn giữ là những tiến trình kết thúc muộn nhất
+    last_evicted = max(manager.get_process_by_pid(pid).end_time for pid in evicted)
+    assert all(p.end_time >= last_evicted for p in manager.processes.values())
+
+
+def test_archive_counts_each_pid_once(tmp_path):
+    manager = ProcessManager(seed=3)
+    create_workload(manager, 30, 3)
+    manager.run()
+    processes = list(manager.processes.values())
+    archive = ProcessArchive(str(tmp_path / "archive.db"), batch_size=8)
+    archive.add_many(processes)
+    # Lưu trữ lại cùng pid (trong bộ đệm và đã ghi xuống đĩa) không làm tăng số tiến trình
+    archive.add_many(processes[:5])
+    archive.add_many(processes[20:])
+    assert len(archive) == 30
+    archive.flush()
+    archive.add_many(processes[:12])
+    assert len(archive) == 30
+    archive.close()
+    assert len(ProcessArchive(str(tmp_path / "archive.db"))) == 30
+
+
+def test_retention_by_age():
+    manager = ProcessManager(seed=4)
+    create_workload(manager, 100, 4)
+    manager.set_retention(keep_for=20)
+    manager.run()
+    cutoff = manager.engine.now - 20
+    assert manager.archived
+    assert all(p.end_time >= cutoff for p in manager.processes.values())
+
+
+def test_retention_is_not_supported_by_compact_table():
+    with pytest.raises(ValueError):
+        ProcessManager(compact=True).set_retention(keep_last=10)
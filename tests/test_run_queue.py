@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from process_manager import Process, ProcessPriority, RunQueue
+
+
+def make_processes(count):
+    priorities = list(ProcessPriority)
+    return [Process(f"p{i}", priorities[i % 3], burst_time=1 + i % 7) for i in range(count)]
+
+
+def scheduling_order(processes):
+    """Thứ tự được lập lịch: theo độ ưu tiên, cùng mức thì theo thứ tự thêm vào (sắp xếp ổn định)"""
+    return sorted(processes, key=Process.get_priority_value)
+
+
+def test_orders_by_priority_then_fifo():
+    processes = make_processes(30)
+    queue = RunQueue()
+    for process in processes:
+        queue.push(process)
+    expected = scheduling_order(processes)
+    assert list(queue) == expected
+    assert queue.peek() is expected[0]
+    assert [queue.pop() for _ in range(len(processes))] == expected
+    assert not queue and queue.peek() is None
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_lazy_remove():
+    processes = make_processes(200)
+    queue = RunQueue()
+    for process in processes:
+        queue.push(process)
+    removed = set(random.Random(1).sample(range(200), 150))
+    for index in removed:
+        assert queue.remove(processes[index].pid)
+    assert not queue.remove(processes[min(removed)].pid)
+    # Các mục đã xóa được dọn khi heap phình quá gấp đôi số mục còn lại
+    assert len(queue._heap) <= 2 * len(queue) + 32
+    kept = [p for i, p in enumerate(processes) if i not in removed]
+    assert len(queue) == len(kept)
+    assert all(p in queue for p in kept) and processes[min(removed)] not in queue
+    assert [queue.pop() for _ in range(len(kept))] == scheduling_order(kept)
+
+
+def test_extend_matches_push():
+    processes = make_processes(300)
+    pushed, extended = RunQueue(), RunQueue()
+    for process in processes[:100]:
+        pushed.push(process)
+    extended.extend(processes[:100])
+    # Lô nhỏ so với heap thì heappush từng mục, lô lớn thì heapify: cả hai giữ thứ tự của push
+    for batch in (processes[100:105], processes[105:], processes[:3]):
+        for process in batch:
+            pushed.push(process)
+        extended.extend(batch)
+    assert len(extended) == len(pushed) == 300
+    assert [extended.pop() for _ in range(300)] == [pushed.pop() for _ in range(300)]
+
+
+def test_push_again_moves_to_back():
+    a, b, c = (Process(name, ProcessPriority.MEDIUM, burst_time=1) for name in "abc")
+    queue = RunQueue()
+    for process in (a, b, c):
+        queue.push(process)
+    queue.push(a)
+    assert len(queue) == 3
+    assert [queue.pop() for _ in range(3)] == [b, c, a]
+
+
+def test_snapshot_round_trip():
+    processes = make_processes(50)
+    queue = RunQueue()
+    for process in processes:
+        queue.push(process)
+    for process in processes[::3]:
+        queue.remove(process.pid)
+    next_seq, arrays = queue.snapshot()
+    arrays = {name: values() if callable(values) else values for name, values in arrays.items()}
+    by_pid = {p.pid: p for p in processes}
+    copy = RunQueue()
+    copy.restore(next_seq, arrays, by_pid.__getitem__)
+    late = Process("late", ProcessPriority.HIGH, burst_time=1)
+    queue.push(late)
+    copy.push(late)
+    assert [copy.pop() for _ in range(len(copy))] == [queue.pop() for _ in range(len(queue))]
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from process_manager import (
+    SCHEDULING_POLICIES, FairSharePolicy, MLFQPolicy, Process, ProcessManager, ProcessPriority, ProcessState,
+)
+
+
+def create_workload(manager, count, seed=1):
+    rng = random.Random(seed)
+    priorities = list(ProcessPriority)
+    for i in range(count):
+        manager.create_process(f"p{i}", rng.choice(priorities), rng.randint(1, 10))
+
+
+def finished(manager):
+    return all(p.state is ProcessState.TERMINATED and p.remaining_time == 0 for p in manager.processes.values())
+
+
+@pytest.mark.parametrize("policy", sorted(SCHEDULING_POLICIES))
+def test_every_policy_finishes_on_several_cores(policy):
+    manager = ProcessManager(seed=2, policy=SCHEDULING_POLICIES[policy], num_cpus=3)
+    manager.io_probability = 0.3
+    create_workload(manager, 300)
+    manager.run()
+    assert finished(manager)
+    assert {p.cpu_id for p in manager.processes.values()} == {0, 1, 2}
+    # Mỗi tiến trình chạy trên một lõi tại một thời điểm: tổng thời gian CPU không vượt quá số lõi
+    assert sum(p.burst_time for p in manager.processes.values()) <= 3 * manager.engine.now
+
+
+def test_set_cpu_count_redistributes_queued_processes():
+    manager = ProcessManager(seed=3, num_cpus=4)
+    manager.io_probability = 0.3
+    create_workload(manager, 400)
+    manager.run(until=20)
+    assert manager.set_cpu_count(2)
+    assert len(manager.cpus) == 2
+    manager.run(until=60)
+    assert manager.set_cpu_count(5)
+    assert not manager.set_cpu_count(0)
+    manager.run()
+    assert finished(manager)
+    assert {p.cpu_id for p in manager.processes.values()} <= set(range(5))
+
+
+@pytest.mark.parametrize("policy_class", [MLFQPolicy, FairSharePolicy])
+def test_export_import_moves_state(policy_class):
+    source, target = policy_class(), policy_class()
+    moved = Process("moved", ProcessPriority.MEDIUM, burst_time=5)
+    source.add(moved)
+    source.pop()
+    source.requeue(moved, expired=True)
+    source.account(moved, 3)
+    source.remove(moved)
+    state = source.export_state(moved)
+    assert state is not None
+    assert moved.pid not in getattr(source, "levels", getattr(source, "vruntime", {}))
+    target.import_state(moved, state)
+    target.add(moved)
+    if policy_class is MLFQPolicy:
+        assert target.level(moved) == 1
+    else:
+        assert target.vruntime[moved.pid] - target.min_vruntime == pytest.approx(state)
+    assert target.pop() is moved
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["dict", "compact"])
+@pytest.mark.parametrize("policy", ["MLFQ", "Fair-share"])
+def test_policy_state_lives_on_one_core(policy, compact):
+    manager = ProcessManager(seed=3, num_cpus=4, policy=SCHEDULING_POLICIES[policy], compact=compact)
+    manager.io_probability = 0.3
+    create_workload(manager, 1500)
+    attr = "levels" if policy == "MLFQ" else "vruntime"
+    for step in range(1, 120):
+        manager.run(until=step * 5)
+        owners = {}
+        for cpu in manager.cpus:
+            for pid in getattr(cpu.policy, attr):
+                assert pid not in owners, f"pid {pid} có trạng thái trên lõi {owners[pid]} và {cpu.cpu_id}"
+                owners[pid] = cpu.cpu_id
+        if step == 30:
+            manager.set_cpu_count(2)
+        elif step == 60:
+            manager.set_cpu_count(5)
+    manager.run()
+    assert manager.migrations and finished(manager)
+    assert sum(len(getattr(cpu.policy, attr)) for cpu in manager.cpus) == 0
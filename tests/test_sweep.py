@@ -0,0 +1,44 @@
+import random
+
+from process_manager import PRIORITY_CODES
+from sweep import build_grid, read_workload, run_case, share_workload, sweep
+
+
+def make_workload(count, seed):
+    rng = random.Random(seed)
+    return [(f"p{i}", rng.choice(PRIORITY_CODES), rng.choice([None, rng.randint(1, 10)])) for i in range(count)]
+
+
+def test_shared_workload_round_trip():
+    workload = make_workload(500, seed=1)
+    shm = share_workload(workload)
+    try:
+        assert read_workload(shm.name) == [(priority, burst_time) for _, priority, burst_time in workload]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_empty_workload_round_trip():
+    shm = share_workload([])
+    try:
+        assert read_workload(shm.name) == []
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_run_case_is_deterministic():
+    workload = [(priority, burst_time) for _, priority, burst_time in make_workload(200, seed=2)]
+    for params in build_grid(["MLFQ", "Fair-share"], [2], ["workload", "high-heavy"], [0.3], [2], 2):
+        first = run_case(params, workload)
+        second = run_case(params, workload)
+        assert first[1].summary(first[2], 2) == second[1].summary(second[2], 2)
+        assert first[2] == second[2]
+
+
+def test_sweep_does_not_depend_on_worker_count():
+    workload = make_workload(100, seed=3)
+    grid = build_grid(["RR", "SRTF"], [1, 3], ["workload"], [0.2], [1], 2)
+    # Kết quả gộp qua các seed không phụ thuộc số worker hay thứ tự các worker hoàn thành
+    assert sweep(workload, grid, workers=1) == sweep(workload, grid, workers=2)
@@ -0,0 +1,61 @@
+import builtins
+import os
+
+from process_manager import SystemMonitor
+
+
+def write_stat(proc, pid, name="worker", state="S", ticks=0, starttime=100):
+    os.makedirs(proc / str(pid), exist_ok=True)
+    # Các trường sau ")": trạng thái là trường 0, utime/stime 11-12, starttime 19, rss 21
+    fields = [state] + ["0"] * 10 + [str(ticks), "0"] + ["0"] * 6 + [str(starttime), "0", "25"]
+    (proc / str(pid) / "stat").write_text(f"{pid} ({name}) {' '.join(fields)}\n")
+    (proc / str(pid) / "cmdline").write_bytes(name.encode() + b"\0--flag\0")
+
+
+def count_stat_opens(monkeypatch):
+    opened = []
+    os_open, open_ = os.open, builtins.open
+
+    def counting_os_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return os_open(path, *args, **kwargs)
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return open_(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "open", counting_os_open)
+    monkeypatch.setattr(builtins, "open", counting_open)
+    return lambda: [path for path in opened if path.endswith("/stat")]
+
+
+def test_new_process_opens_stat_once(tmp_path, monkeypatch):
+    for pid in (10, 11, 12):
+        write_stat(tmp_path, pid)
+    monitor = SystemMonitor(proc=str(tmp_path), max_fds=8)
+    stat_opens = count_stat_opens(monkeypatch)
+    assert monitor.sample() == 3
+    # fd mở để đọc lượt đầu được giữ lại: các lượt sau chỉ pread, không mở lại
+    assert len(stat_opens()) == 3 and monitor._open_fds == 3
+    write_stat(tmp_path, 11, state="R", ticks=50)
+    assert monitor.sample() == 1
+    assert len(stat_opens()) == 3
+    assert monitor._entries[11][3].state == "R" and monitor._entries[11][3].cmdline == "worker --flag"
+    monitor.close()
+    assert monitor._open_fds == 0
+
+
+def test_fd_budget_falls_back_to_reading_by_path(tmp_path, monkeypatch):
+    for pid in (10, 11, 12):
+        write_stat(tmp_path, pid)
+    monitor = SystemMonitor(proc=str(tmp_path), max_fds=1)
+    stat_opens = count_stat_opens(monkeypatch)
+    assert monitor.sample() == 3
+    assert len(stat_opens()) == 3 and monitor._open_fds == 1
+    # Tiến trình biến mất: fd của nó được đóng
+    for pid in (10, 11, 12):
+        os.remove(tmp_path / str(pid) / "stat")
+        os.remove(tmp_path / str(pid) / "cmdline")
+        os.rmdir(tmp_path / str(pid))
+    assert monitor.sample() == 3
+    assert monitor._open_fds == 0 and not monitor._entries
@@ -0,0 +1,57 @@
+import math
+import random
+
+import pytest
+
+from process_manager import TimerWheel
+
+
+@pytest.mark.parametrize("resolution", [1, 0.25])
+def test_matches_reference(resolution):
+    rng = random.Random(5)
+    wheel = TimerWheel(resolution)
+    pending = {}  # Tham chiếu: {khóa: tick}
+    now = 0.0
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.55:
+            key = rng.randrange(400)
+            # Cả hạn gần, hạn rơi vào tầng cao và hạn đã qua
+            deadline = now + rng.choice([rng.uniform(-2, 3), rng.uniform(0, 100), rng.uniform(0, 20000)])
+            wheel.add(key, deadline, key)
+            pending[key] = wheel.tick_of(deadline)
+        elif action < 0.7 and pending:
+            key = rng.choice(sorted(pending))
+            assert wheel.discard(key)
+            del pending[key]
+        else:
+            next_time = wheel.next_time()
+            if rng.random() < 0.5 and next_time is not None:
+                now = max(now, next_time)
+            else:
+                now += rng.uniform(0, 50)
+            target = math.floor(now / resolution + 1e-9)
+            due = wheel.advance(now)
+            expected = {key for key, tick in pending.items() if tick <= target}
+            assert sorted(due) == sorted(expected)
+            for key in expected:
+                del pending[key]
+        assert len(wheel) == len(pending)
+        if pending:
+            # Không bỏ qua mục nào: tick kế tiếp không muộn hơn hạn sớm nhất
+            assert wheel.next_tick() <= max(min(pending.values()), wheel.current)
+        else:
+            assert wheel.next_time() is None
+
+
+def test_add_replaces_and_discard():
+    wheel = TimerWheel()
+    wheel.add("a", 5, "first")
+    wheel.add("a", 3, "second")
+    wheel.add("b", 4000, "far")
+    assert len(wheel) == 2 and "a" in wheel
+    assert wheel.advance(2) == []
+    assert wheel.advance(3) == ["second"]
+    assert wheel.advance(10) == []
+    assert wheel.discard("b") and not wheel.discard("b")
+    assert wheel.next_time() is None and wheel.advance(5000) == []
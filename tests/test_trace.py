@@ -0,0 +1,79 @@
+import pytest
+
+from process_manager import (
+    SCHEDULING_POLICIES, ExponentialDistribution, FixedDistribution, LogNormalDistribution, ProcessManager,
+    ProcessPriority, TraceKind, UniformDistribution, WorkloadModel, read_trace, replay_trace,
+)
+
+MODELS = {
+    "default": lambda: None,
+    "exp-io": lambda: WorkloadModel(io_duration=ExponentialDistribution(3)),
+    "lognormal": lambda: WorkloadModel(burst=LogNormalDistribution(4, 0.5), io_duration=UniformDistribution(1, 5),
+                                       batch_size=16),
+    "arrivals": lambda: WorkloadModel(io_duration=ExponentialDistribution(2), arrival=ExponentialDistribution(0.5)),
+}
+
+
+def completions(manager):
+    """(tên, thời điểm kết thúc) của mọi tiến trình; pid khác nhau giữa các lần chạy nên so theo tên"""
+    return sorted((p.name, p.end_time) for p in manager.processes.values())
+
+
+def record(path, policy, model, change=None):
+    manager = ProcessManager(seed=7, policy=SCHEDULING_POLICIES[policy], num_cpus=2, model=model)
+    manager.io_probability = 0.3
+    manager.start_trace(path)
+    if manager.model.arrival is not None:
+        manager.schedule_arrivals([(f"a{i}", ProcessPriority.LOW, 3) for i in range(150)])
+    else:
+        manager.create_random_processes(150)
+    manager.run(until=30)
+    if change is not None:
+        change(manager)
+    manager.run()
+    manager.stop_trace()
+    return manager
+
+
+@pytest.mark.parametrize("policy", ["Priority RR", "MLFQ", "Fair-share"])
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_replay_matches_custom_model(tmp_path, policy, model):
+    path = tmp_path / "run.trace"
+    original = record(str(path), policy, MODELS[model]())
+    replayed = replay_trace(str(path))
+    replayed.run()
+    assert completions(replayed) == completions(original)
+    assert len(original.terminated_processes) == 150
+
+
+@pytest.mark.parametrize("change", [
+    lambda manager: setattr(manager, "io_duration", FixedDistribution(2)),
+    lambda manager: manager.set_model(WorkloadModel(io_duration=ExponentialDistribution(1.5))),
+], ids=["io_duration", "set_model"])
+def test_replay_follows_model_change(tmp_path, change):
+    path = tmp_path / "run.trace"
+    original = record(str(path), "Fair-share", None, change)
+    kinds = [r.kind for r in read_trace(str(path))]
+    assert kinds.count(TraceKind.MODEL) == 2
+    replayed = replay_trace(str(path))
+    replayed.run()
+    assert completions(replayed) == completions(original)
+
+
+def test_replay_can_record_again(tmp_path):
+    first, second = tmp_path / "a.trace", tmp_path / "b.trace"
+    original = record(str(first), "MLFQ", MODELS["exp-io"]())
+    replayed = replay_trace(str(first), str(second))
+    again = replay_trace(str(second))
+    assert completions(original) == completions(replayed) == completions(again)
+
+
+def test_model_snapshot_round_trip():
+    model = WorkloadModel(burst=LogNormalDistribution(5, 0.5), io_duration=ExponentialDistribution(2),
+                          batch_size=8).bind(3)
+    for _ in range(13):
+        model.burst_time()
+        model.io_time(0.3, 1)
+    copy = WorkloadModel.from_snapshot(model.snapshot())
+    assert [copy.burst_time() for _ in range(20)] == [model.burst_time() for _ in range(20)]
+    assert [copy.io_time(0.3, 1) for _ in range(20)] == [model.io_time(0.3, 1) for _ in range(20)]